@@ -10,6 +10,7 @@ from .viewsets import (
     SeasonViewSet,
     DemographicViewSet,
 )
+from .views import StudioExportView
 
 
 router_v1 = DefaultRouter()
@@ -19,4 +20,11 @@ router_v1.register(r"studios", StudioViewSet, basename="studio")
 router_v1.register(r"seasons", SeasonViewSet, basename="season")
 router_v1.register(r"demographics", DemographicViewSet, basename="demographic")
 
-urlpatterns = [path("api/v1/", include(router_v1.urls))]
+urlpatterns = [
+    path("api/v1/", include(router_v1.urls)),
+    path(
+        "api/v1/export/studios.ndjson",
+        StudioExportView.as_view(),
+        name="studio-export",
+    ),
+]
@@ -2,11 +2,14 @@
 
 from drf_spectacular.utils import extend_schema
 
+from apps.utils.schemas import sparse_fields_parameters
+
 
 studio_schemas = {
     "list": extend_schema(
         summary="Get Several Studios",
         description="Retrieve a list of all studio entries.",
+        parameters=sparse_fields_parameters,
     ),
     "create": extend_schema(
         summary="Create Studio",
@@ -15,6 +18,7 @@ studio_schemas = {
     "retrieve": extend_schema(
         summary="Get Studio",
         description="Get detailed information about a specific studio entry.",
+        parameters=sparse_fields_parameters,
     ),
     "update": extend_schema(
         summary="Change Studio",
@@ -35,6 +39,7 @@ genre_schemas = {
     "list": extend_schema(
         summary="Get Several Genres",
         description="Retrieve a list of all genre entries.",
+        parameters=sparse_fields_parameters,
     ),
     "create": extend_schema(
         summary="Create Genre",
@@ -43,6 +48,7 @@ genre_schemas = {
     "retrieve": extend_schema(
         summary="Get Genre",
         description="Get detailed information about a specific genre entry.",
+        parameters=sparse_fields_parameters,
     ),
     "update": extend_schema(
         summary="Change Genre",
@@ -63,6 +69,7 @@ theme_schemas = {
     "list": extend_schema(
         summary="Get Several Themes",
         description="Retrieve a list of all theme entries.",
+        parameters=sparse_fields_parameters,
     ),
     "create": extend_schema(
         summary="Create Theme",
@@ -71,6 +78,7 @@ theme_schemas = {
     "retrieve": extend_schema(
         summary="Get Theme",
         description="Get detailed information about a specific theme entry.",
+        parameters=sparse_fields_parameters,
     ),
     "update": extend_schema(
         summary="Change Theme",
@@ -91,6 +99,7 @@ season_schemas = {
     "list": extend_schema(
         summary="Get Several Seasons",
         description="Retrieve a list of all season entries.",
+        parameters=sparse_fields_parameters,
     ),
     "create": extend_schema(
         summary="Create Season",
@@ -99,6 +108,7 @@ season_schemas = {
     "retrieve": extend_schema(
         summary="Get Season",
         description="Get detailed information about a specific season entry.",
+        parameters=sparse_fields_parameters,
     ),
     "update": extend_schema(
         summary="Change Season",
@@ -119,6 +129,7 @@ demographic_schemas = {
     "list": extend_schema(
         summary="Get Several Demographics",
         description="Retrieve a list of all demographic entries.",
+        parameters=sparse_fields_parameters,
     ),
     "create": extend_schema(
         summary="Create Demographic",
@@ -127,6 +138,7 @@ demographic_schemas = {
     "retrieve": extend_schema(
         summary="Get Demographic",
         description="Get detailed info about a specific demographic entry.",
+        parameters=sparse_fields_parameters,
     ),
     "update": extend_schema(
         summary="Change Demographic",
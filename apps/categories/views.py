@@ -0,0 +1,17 @@
+"""Views for Categories App."""
+
+from apps.utils.views import NDJSONExportView
+from .models import Studio
+from .serializers import StudioSerializer
+
+
+class StudioExportView(NDJSONExportView):
+    """
+    View exporting every studio as NDJSON.
+
+    Endpoints:
+    - GET /api/v1/export/studios.ndjson
+    """
+
+    model = Studio
+    serializer_class = StudioSerializer
@@ -1,8 +1,5 @@
 """Viewsets for Contents App."""
 
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-from django.views.decorators.vary import vary_on_cookie
 from django.utils.translation import gettext as _
 from rest_framework.viewsets import ModelViewSet
 from rest_framework import status
@@ -10,10 +7,22 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema_view, extend_schema
 
-from apps.utils.mixins import LogicalDeleteMixin
+from apps.utils.mixins import (
+    CompiledListMixin,
+    LogicalDeleteMixin,
+    QueryPlannerMixin,
+    SparseFieldsMixin,
+)
 from apps.utils.permissions import IsStaffOrReadOnly
-from apps.utils.pagination import LargeSetPagination, MediumSetPagination
+from apps.utils.caching import cache_response
+from apps.utils.versions import conditional
+from apps.utils.pagination import (
+    LargeSetPagination,
+    LargeSetKeysetPagination,
+    MediumSetKeysetPagination,
+)
 from apps.contents.models import Anime, Manga
+from apps.contents.overlays import ContentOverlay
 from apps.contents.serializers import AnimeListSerializer, MangaListSerializer
 from .models import Studio, Genre, Theme, Season, Demographic
 from .serializers import (
@@ -33,7 +42,13 @@ from .schemas import (
 
 
 @extend_schema_view(**studio_schemas)
-class StudioViewSet(LogicalDeleteMixin, ModelViewSet):
+class StudioViewSet(
+    SparseFieldsMixin,
+    CompiledListMixin,
+    QueryPlannerMixin,
+    LogicalDeleteMixin,
+    ModelViewSet,
+):
     """
     ViewSet for managing Studio instances.
 
@@ -48,6 +63,7 @@ class StudioViewSet(LogicalDeleteMixin, ModelViewSet):
 
     serializer_class = StudioSerializer
     permission_classes = [IsStaffOrReadOnly]
+    overlay_class = ContentOverlay
     search_fields = ["name"]
     ordering_fields = ["name"]
     ordering = ["id"]
@@ -57,17 +73,28 @@ class StudioViewSet(LogicalDeleteMixin, ModelViewSet):
             "available", "created_at", "updated_at"
         )
 
-    @method_decorator(cache_page(60 * 60 * 2))
-    @method_decorator(vary_on_cookie)
+    @conditional
+    @cache_response(60 * 60 * 2)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @conditional
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @extend_schema(
         summary="Get Animes for Studio",
         description="Retrieve a list of animes for studio.",
     )
-    @action(detail=True, methods=["get"], url_path="animes")
-    @method_decorator(cache_page(60 * 60 * 2))
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="animes",
+        serializer_class=AnimeListSerializer,
+        pagination_class=LargeSetKeysetPagination,
+    )
+    @conditional
+    @cache_response(60 * 60 * 2)
     def anime_list(self, request, pk=None):
         """
         Retrieve a list of animes for the specified studio.
@@ -76,12 +103,11 @@ class StudioViewSet(LogicalDeleteMixin, ModelViewSet):
         - GET /api/v1/studios/{id}/animes/
         """
         studio = self.get_object()
-        anime_list = Anime.objects.filter(studio=studio)
+        anime_list = self.plan_queryset(
+            Anime.objects.filter(studio=studio), AnimeListSerializer
+        )
         if anime_list.exists():
-            paginator = LargeSetPagination()
-            result_page = paginator.paginate_queryset(anime_list, request)
-            serializer = AnimeListSerializer(result_page, many=True)
-            return paginator.get_paginated_response(serializer.data)
+            return self.get_paginated_list(anime_list, AnimeListSerializer)
         return Response(
             {"detail": _("There are no animes for this studio.")},
             status=status.HTTP_404_NOT_FOUND,
@@ -89,7 +115,13 @@ class StudioViewSet(LogicalDeleteMixin, ModelViewSet):
 
 
 @extend_schema_view(**genre_schemas)
-class GenreViewSet(LogicalDeleteMixin, ModelViewSet):
+class GenreViewSet(
+    SparseFieldsMixin,
+    CompiledListMixin,
+    QueryPlannerMixin,
+    LogicalDeleteMixin,
+    ModelViewSet,
+):
     """
     ViewSet for managing Genre instances.
 
@@ -104,6 +136,7 @@ class GenreViewSet(LogicalDeleteMixin, ModelViewSet):
 
     serializer_class = GenreSerializer
     permission_classes = [IsStaffOrReadOnly]
+    overlay_class = ContentOverlay
     pagination_class = LargeSetPagination
     search_fields = ["name"]
     ordering_fields = ["name"]
@@ -112,17 +145,28 @@ class GenreViewSet(LogicalDeleteMixin, ModelViewSet):
     def get_queryset(self):
         return Genre.objects.get_available().only("id", "name", "slug")
 
-    @method_decorator(cache_page(60 * 60 * 2))
-    @method_decorator(vary_on_cookie)
+    @conditional
+    @cache_response(60 * 60 * 2)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @conditional
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @extend_schema(
         summary="Get Animes for Genre",
         description="Retrieve a list of animes for genre.",
     )
-    @action(detail=True, methods=["get"], url_path="animes")
-    @method_decorator(cache_page(60 * 60 * 2))
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="animes",
+        serializer_class=AnimeListSerializer,
+        pagination_class=MediumSetKeysetPagination,
+    )
+    @conditional
+    @cache_response(60 * 60 * 2)
     def anime_list(self, request, pk=None):
         """
         Retrieve a list of animes for the specified genre.
@@ -131,12 +175,11 @@ class GenreViewSet(LogicalDeleteMixin, ModelViewSet):
         - GET /api/v1/genres/{id}/animes/
         """
         genre = self.get_object()
-        anime_list = Anime.objects.filter(genres=genre)
+        anime_list = self.plan_queryset(
+            Anime.objects.filter(genres=genre), AnimeListSerializer
+        )
         if anime_list.exists():
-            paginator = MediumSetPagination()
-            result_page = paginator.paginate_queryset(anime_list, request)
-            serializer = AnimeListSerializer(result_page, many=True)
-            return paginator.get_paginated_response(serializer.data)
+            return self.get_paginated_list(anime_list, AnimeListSerializer)
         return Response(
             {"detail": _("There are no animes for this genre.")},
             status=status.HTTP_404_NOT_FOUND,
@@ -145,8 +188,15 @@ class GenreViewSet(LogicalDeleteMixin, ModelViewSet):
     @extend_schema(
         summary="Get Mangas for Genre", description="Retrieve a manga list for genre."
     )
-    @action(detail=True, methods=["get"], url_path="mangas")
-    @method_decorator(cache_page(60 * 60 * 2))
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="mangas",
+        serializer_class=MangaListSerializer,
+        pagination_class=MediumSetKeysetPagination,
+    )
+    @conditional
+    @cache_response(60 * 60 * 2)
     def manga_list(self, request, pk=None):
         """
         Retrieve a manga list for the specified genre.
@@ -155,12 +205,11 @@ class GenreViewSet(LogicalDeleteMixin, ModelViewSet):
         - GET /api/v1/studios/{id}/mangas/
         """
         genre = self.get_object()
-        manga_list = Manga.objects.filter(genres=genre)
+        manga_list = self.plan_queryset(
+            Manga.objects.filter(genres=genre), MangaListSerializer
+        )
         if manga_list.exists():
-            paginator = MediumSetPagination()
-            result_page = paginator.paginate_queryset(manga_list, request)
-            serializer = MangaListSerializer(result_page, many=True)
-            return paginator.get_paginated_response(serializer.data)
+            return self.get_paginated_list(manga_list, MangaListSerializer)
         return Response(
             {"detail": _("There are no mangas for this genre.")},
             status=status.HTTP_404_NOT_FOUND,
@@ -168,7 +217,9 @@ class GenreViewSet(LogicalDeleteMixin, ModelViewSet):
 
 
 @extend_schema_view(**theme_schemas)
-class ThemeViewSet(LogicalDeleteMixin, ModelViewSet):
+class ThemeViewSet(
+    SparseFieldsMixin, QueryPlannerMixin, LogicalDeleteMixin, ModelViewSet
+):
     """
     ViewSet for managing Theme instances.
 
@@ -190,14 +241,24 @@ class ThemeViewSet(LogicalDeleteMixin, ModelViewSet):
     def get_queryset(self):
         return Theme.objects.get_available().only("id", "name", "slug")
 
-    @method_decorator(cache_page(60 * 60 * 2))
-    @method_decorator(vary_on_cookie)
+    @conditional
+    @cache_response(60 * 60 * 2)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @conditional
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
 
 @extend_schema_view(**season_schemas)
-class SeasonViewSet(LogicalDeleteMixin, ModelViewSet):
+class SeasonViewSet(
+    SparseFieldsMixin,
+    CompiledListMixin,
+    QueryPlannerMixin,
+    LogicalDeleteMixin,
+    ModelViewSet,
+):
     """
     ViewSet for managing Season instances.
 
@@ -212,6 +273,7 @@ class SeasonViewSet(LogicalDeleteMixin, ModelViewSet):
 
     serializer_class = SeasonSerializer
     permission_classes = [IsStaffOrReadOnly]
+    overlay_class = ContentOverlay
     search_fields = ["name"]
     ordering_fields = ["name"]
     ordering = ["id"]
@@ -219,13 +281,24 @@ class SeasonViewSet(LogicalDeleteMixin, ModelViewSet):
     def get_queryset(self):
         return Season.objects.get_available().only("id", "season", "year", "fullname")
 
-    @method_decorator(cache_page(60 * 60 * 2))
-    @method_decorator(vary_on_cookie)
+    @conditional
+    @cache_response(60 * 60 * 2)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-    @action(detail=True, methods=["get"], url_path="animes")
-    @method_decorator(cache_page(60 * 60 * 2))
+    @conditional
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="animes",
+        serializer_class=AnimeListSerializer,
+        pagination_class=MediumSetKeysetPagination,
+    )
+    @conditional
+    @cache_response(60 * 60 * 2)
     def anime_list(self, request, pk=None):
         """
         Retrieve a list of animes for the specified season.
@@ -234,12 +307,11 @@ class SeasonViewSet(LogicalDeleteMixin, ModelViewSet):
         - GET /api/v1/seasons/{id}/animes/
         """
         season = self.get_object()
-        anime_list = Anime.objects.filter(season=season)
+        anime_list = self.plan_queryset(
+            Anime.objects.filter(season=season), AnimeListSerializer
+        )
         if anime_list.exists():
-            paginator = MediumSetPagination()
-            result_page = paginator.paginate_queryset(anime_list, request)
-            serializer = AnimeListSerializer(result_page, many=True)
-            return paginator.get_paginated_response(serializer.data)
+            return self.get_paginated_list(anime_list, AnimeListSerializer)
         return Response(
             {"detail": _("There are no animes for this season.")},
             status=status.HTTP_404_NOT_FOUND,
@@ -247,7 +319,9 @@ class SeasonViewSet(LogicalDeleteMixin, ModelViewSet):
 
 
 @extend_schema_view(**demographic_schemas)
-class DemographicViewSet(LogicalDeleteMixin, ModelViewSet):
+class DemographicViewSet(
+    SparseFieldsMixin, QueryPlannerMixin, LogicalDeleteMixin, ModelViewSet
+):
     """
     ViewSet for managing Demographic instances.
 
@@ -269,7 +343,11 @@ class DemographicViewSet(LogicalDeleteMixin, ModelViewSet):
     def get_queryset(self):
         return Demographic.objects.get_available().values("id", "name")
 
-    @method_decorator(cache_page(60 * 60 * 2))
-    @method_decorator(vary_on_cookie)
+    @conditional
+    @cache_response(60 * 60 * 2)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
+
+    @conditional
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
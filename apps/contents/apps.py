@@ -6,3 +6,7 @@ from django.apps import AppConfig
 class ContentsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.contents"
+
+    def ready(self):
+        # Connects the receivers keeping overlay validators per user.
+        import apps.contents.overlays
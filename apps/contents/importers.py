@@ -0,0 +1,310 @@
+"""Importers for Contents App."""
+
+import csv
+import gzip
+import json
+from itertools import islice
+
+from django.db import transaction
+from django.utils.text import slugify
+
+from apps.categories.models import Studio, Genre, Theme, Season, Demographic
+from apps.persons.models import Author
+from apps.utils.versions import bump
+
+LIST_SEPARATOR = "|"
+SKIPPED_FIELDS = {"id", "available", "created_at", "updated_at", "slug"}
+
+
+def read_records(path, skip=0):
+    """Yield the records of a JSONL or CSV dump (optionally gzipped)."""
+    opener = gzip.open if path.endswith(".gz") else open
+    is_csv = path.removesuffix(".gz").endswith(".csv")
+    with opener(path, "rt", encoding="utf-8", newline="") as file:
+        if is_csv:
+            yield from islice(csv.DictReader(file), skip, None)
+            return
+        for line in islice(file, skip, None):
+            yield json.loads(line) if line.strip() else None
+
+
+def get_names(value):
+    """Return the list of names of a JSON list or a "|" separated cell."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(LIST_SEPARATOR)
+    return [name.strip() for name in value if name and name.strip()]
+
+
+def get_season(value):
+    """Return (season, year) of "spring 2004" or {"season", "year"}."""
+    if isinstance(value, dict):
+        return value["season"].lower(), int(value["year"])
+    season, year = value.split()
+    return season.lower(), int(year)
+
+
+class LookupMap:
+    """
+    In-memory natural key to pk map of a related model.
+
+    Keys missing from the database are created in one ``bulk_create`` per
+    batch instead of one ``get_or_create`` per record.
+    """
+
+    def __init__(self, model, key="name"):
+        self.model = model
+        self.key = key
+        self.pks = dict(model.objects.values_list(key, "pk"))
+
+    def get_defaults(self, value):
+        """Return (key, field values) for a raw dump value."""
+        if self.model is Season:
+            season, year = get_season(value)
+            fullname = f"{season.capitalize()} {year}"
+            return fullname, {"season": season, "year": year, "fullname": fullname}
+        if isinstance(value, dict):
+            name = value["name"]
+            defaults = dict(value)
+        else:
+            name = str(value).strip()
+            defaults = {"name": name}
+        if self.model is Studio:
+            defaults.setdefault("name_jpn", name)
+        if self.model in (Studio, Genre, Theme):
+            defaults["slug"] = slugify(name)
+        return name, defaults
+
+    def resolve(self, values):
+        """Create the missing keys of values, return their keys."""
+        keys, missing = [], {}
+        for value in values:
+            key, defaults = self.get_defaults(value)
+            keys.append(key)
+            if key not in self.pks:
+                missing[key] = defaults
+        if missing:
+            self.model.objects.bulk_create(
+                [self.model(**defaults) for defaults in missing.values()],
+                ignore_conflicts=True,
+            )
+            created = self.model.objects.filter(**{f"{self.key}__in": missing})
+            self.pks.update(created.values_list(self.key, "pk"))
+            bump(self.model)
+        return keys
+
+    def __getitem__(self, key):
+        return self.pks[key]
+
+
+class CatalogImporter:
+    """
+    Upsert Anime or Manga records from a catalog dump.
+
+    Records are read one batch at a time, foreign keys are resolved through
+    LookupMap instances, titles are upserted on ``name`` with
+    ``bulk_create(update_conflicts=True)`` and the genres/themes through
+    rows of the batch are replaced with one delete and one insert each.
+    ``save()`` and signals do not run: ``name_rom``, season fullnames and
+    the slugs of studios, genres and themes are filled here the same way
+    the models fill them (titles get no slug, as in ``save()``).
+
+    The upsert only resolves conflicts on ``name``, so records missing
+    another unique value (``name_jpn``) or sharing one with a different
+    title are skipped and listed in ``skipped`` as (name, reason).
+    """
+
+    lookups = {
+        Studio: "name",
+        Genre: "name",
+        Theme: "name",
+        Season: "fullname",
+        Demographic: "name",
+        Author: "name",
+    }
+
+    def __init__(self, model, batch_size=1000):
+        self.model = model
+        self.batch_size = batch_size
+        self.fields = {}
+        self.relations = {}
+        self.many_to_many = {}
+        for field in model._meta.get_fields():
+            if field.name in SKIPPED_FIELDS or field.auto_created:
+                continue
+            if field.many_to_many:
+                self.many_to_many[field.name] = field
+            elif field.many_to_one:
+                self.relations[field.name] = field
+            elif field.concrete:
+                self.fields[field.name] = field
+        self.unique_fields = [
+            name for name, field in self.fields.items() if field.unique and name != "name"
+        ]
+        self.maps = {}
+        self.skipped = []
+
+    def get_map(self, model):
+        if model not in self.maps:
+            self.maps[model] = LookupMap(model, self.lookups[model])
+        return self.maps[model]
+
+    def clean(self, field, value):
+        """Return value converted to the python type of field."""
+        if value is None or value == "":
+            if field.null:
+                return None
+            return field.get_default() if field.has_default() else ""
+        return field.to_python(value)
+
+    def skip(self, record, reason):
+        self.skipped.append((record.get("name"), reason))
+
+    def fill_unique(self, records):
+        """
+        Fill the unique fields of records, return the ones to write.
+
+        Missing values keep the stored ones, ``name_rom`` defaults to the
+        name. Records still missing one, or using a value another title has
+        in the database or earlier in the batch, are skipped.
+        """
+        stored = {
+            row["name"]: row
+            for row in self.model.objects.filter(
+                name__in=[record["name"] for record in records]
+            ).values("name", *self.unique_fields)
+        }
+        filled = []
+        for record in records:
+            row = stored.get(record["name"], {})
+            values = {name: record.get(name) or row.get(name) for name in self.unique_fields}
+            if "name_rom" in values and not values["name_rom"]:
+                values["name_rom"] = record["name"]
+            missing = [name for name, value in values.items() if not value]
+            if missing:
+                self.skip(record, f"missing {missing[0]}")
+                continue
+            record.update(values)
+            filled.append(record)
+
+        owners = {
+            name: dict(
+                self.model.objects.filter(
+                    **{f"{name}__in": [record[name] for record in filled]}
+                ).values_list(name, "name")
+            )
+            for name in self.unique_fields
+        }
+        valid = []
+        for record in filled:
+            for name in self.unique_fields:
+                owner = owners[name].get(record[name], record["name"])
+                if owner != record["name"]:
+                    self.skip(record, f"{name} {record[name]!r} belongs to {owner!r}")
+                    break
+            else:
+                for name in self.unique_fields:
+                    owners[name][record[name]] = record["name"]
+                valid.append(record)
+        return valid
+
+    def build(self, records):
+        """Return the unsaved instances and update fields of a batch."""
+        for record in records:
+            if not record.get("name"):
+                self.skip(record, "missing name")
+        # Later duplicates win, upserts cannot touch the same row twice.
+        records = list(
+            {record["name"]: record for record in records if record.get("name")}.values()
+        )
+        records = self.fill_unique(records)
+        columns = set().union(*records)
+
+        for name in self.relations.keys() & columns:
+            lookup = self.get_map(self.relations[name].related_model)
+            present = [record for record in records if record.get(name)]
+            keys = lookup.resolve([record[name] for record in present])
+            for record, key in zip(present, keys):
+                record[name] = lookup[key]
+
+        instances = []
+        for record in records:
+            instance = self.model(
+                **{
+                    name: self.clean(field, record.get(name))
+                    for name, field in self.fields.items()
+                    if name in record
+                }
+            )
+            for name in self.relations.keys() & columns:
+                setattr(instance, f"{name}_id", record.get(name) or None)
+            instances.append(instance)
+
+        update_fields = [
+            name
+            for name in [*self.fields, *self.relations]
+            if name in columns and name != "name"
+        ]
+        return records, instances, update_fields + ["updated_at"]
+
+    def set_many_to_many(self, records, pks):
+        """Replace the through rows of the m2m columns present in records."""
+        for name, field in self.many_to_many.items():
+            rows = [record for record in records if name in record]
+            if not rows:
+                continue
+            through = field.remote_field.through
+            source = field.m2m_field_name()
+            target = field.m2m_reverse_field_name()
+            lookup = self.get_map(field.related_model)
+            names = [get_names(record[name]) for record in rows]
+            keys = iter(lookup.resolve([key for group in names for key in group]))
+
+            links = []
+            for record, group in zip(rows, names):
+                pk = pks[record["name"]]
+                links.extend(
+                    through(**{f"{source}_id": pk, f"{target}_id": lookup[next(keys)]})
+                    for _ in group
+                )
+            ids = [pks[record["name"]] for record in rows]
+            through.objects.filter(**{f"{source}_id__in": ids}).delete()
+            through.objects.bulk_create(links, ignore_conflicts=True)
+
+    def import_batch(self, records):
+        """Upsert one batch of records, return the number of titles."""
+        records, instances, update_fields = self.build(records)
+        if not instances:
+            return 0
+        with transaction.atomic():
+            self.model.objects.bulk_create(
+                instances,
+                update_conflicts=True,
+                unique_fields=["name"],
+                update_fields=update_fields,
+            )
+            # Conflicting rows keep their pk, read the real ones back.
+            pks = dict(
+                self.model.objects.filter(
+                    name__in=[instance.name for instance in instances]
+                ).values_list("name", "pk")
+            )
+            self.set_many_to_many(records, pks)
+        # bulk_create() sends no signals.
+        bump(self.model, pks.values())
+        return len(instances)
+
+    def run(self, records, callback=None):
+        """Import every record, calling callback(read) after each batch."""
+        read = total = 0
+        while True:
+            batch = list(islice(records, self.batch_size))
+            if not batch:
+                return total
+            read += len(batch)
+            batch = [record for record in batch if record]
+            if batch:
+                total += self.import_batch(batch)
+            if callback is not None:
+                callback(read)
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.contents.models import Anime, Manga
+from apps.contents.rankings import RankingEngine
+
+
+class Command(BaseCommand):
+    help = "Recompute mean, rank and popularity for the whole catalog"
+
+    models = {"anime": Anime, "manga": Manga}
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            choices=self.models.keys(),
+            action="append",
+            help="Model to recompute (default: all).",
+        )
+        parser.add_argument(
+            "--min-votes",
+            type=int,
+            default=10,
+            help="Votes needed before a title's own mean outweighs the global one.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        for name in options["model"] or self.models.keys():
+            engine = RankingEngine(
+                self.models[name],
+                min_votes=options["min_votes"],
+                batch_size=options["batch_size"],
+            )
+            self.stdout.write(f"Computing {name} rankings...")
+            with transaction.atomic():
+                updated = engine.run()
+            self.stdout.write(self.style.SUCCESS(f"Updated {updated} {name} rows."))
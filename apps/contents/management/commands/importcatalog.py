@@ -0,0 +1,70 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.contents.importers import CatalogImporter, read_records
+from apps.contents.models import Anime, Manga
+
+
+class Command(BaseCommand):
+    help = "Stream a JSONL or CSV catalog dump into Anime or Manga"
+
+    models = {"anime": Anime, "manga": Manga}
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Dump file (.jsonl, .csv, optionally .gz).")
+        parser.add_argument("--model", choices=self.models.keys(), required=True)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--checkpoint",
+            help="Checkpoint file (default: <path>.checkpoint).",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore the checkpoint and import from the first record.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.exists(path):
+            raise CommandError(f"{path} does not exist.")
+        checkpoint = options["checkpoint"] or f"{path}.checkpoint"
+
+        skip = 0 if options["restart"] else self.read_checkpoint(checkpoint, options)
+        if skip:
+            self.stdout.write(f"Resuming after record {skip}...")
+
+        importer = CatalogImporter(
+            self.models[options["model"]], batch_size=options["batch_size"]
+        )
+
+        def progress(read):
+            self.write_checkpoint(checkpoint, options, skip + read)
+            self.stdout.write(f"{skip + read} records processed.")
+
+        total = importer.run(read_records(path, skip=skip), callback=progress)
+        for name, reason in importer.skipped:
+            self.stderr.write(self.style.WARNING(f"Skipped {name!r}: {reason}."))
+        self.stdout.write(
+            self.style.SUCCESS(f"Imported {total} {options['model']} records.")
+        )
+
+    def read_checkpoint(self, checkpoint, options):
+        if not os.path.exists(checkpoint):
+            return 0
+        with open(checkpoint, encoding="utf-8") as file:
+            state = json.load(file)
+        if state.get("model") != options["model"]:
+            raise CommandError(
+                f"{checkpoint} belongs to a {state.get('model')} import, use --restart."
+            )
+        return state["records"]
+
+    def write_checkpoint(self, checkpoint, options, records):
+        # Written after each committed batch, replaced atomically.
+        temporary = f"{checkpoint}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump({"model": options["model"], "records": records}, file)
+        os.replace(temporary, checkpoint)
@@ -1,6 +1,6 @@
 """Managers for Contents App."""
 
-from django.db.models import Manager
+from django.db.models import F, Manager
 
 
 class AnimeManager(Manager):
@@ -13,7 +13,7 @@ class AnimeManager(Manager):
         return self.filter(available=False)
 
     def get_popular(self):
-        return self.get_available().order_by("-popularity")
+        return self.get_available().order_by(F("popularity").asc(nulls_last=True))
 
 
 class MangaManager(Manager):
@@ -26,4 +26,4 @@ class MangaManager(Manager):
         return self.filter(available=False)
 
     def get_popular(self):
-        return self.get_available().order_by("-popularity")
+        return self.get_available().order_by(F("popularity").asc(nulls_last=True))
@@ -11,6 +11,7 @@ from apps.utils.mixins import SlugMixin
 from apps.utils.validators import FileSizeValidator, ImageSizeValidator
 from apps.categories.models import Studio, Genre, Theme, Season, Demographic
 from apps.persons.models import Author
+from apps.search.indexes import get_search_indexes
 from .managers import AnimeManager, MangaManager
 from .choices import StatusChoices, CategoryChoices, RatingChoices, MediaTypeChoices
 
@@ -82,6 +83,10 @@ class Anime(BaseModel, SlugMixin):
         ordering = ["pk"]
         verbose_name = _("anime")
         verbose_name_plural = _("animes")
+        indexes = [
+            models.Index(fields=["popularity", "id"], name="anime_popularity_idx"),
+            *get_search_indexes("anime"),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.name_rom:
@@ -155,6 +160,10 @@ class Manga(BaseModel, SlugMixin):
         ordering = ["pk"]
         verbose_name = _("manga")
         verbose_name_plural = _("mangas")
+        indexes = [
+            models.Index(fields=["popularity", "id"], name="manga_popularity_idx"),
+            *get_search_indexes("manga"),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.name_rom:
@@ -0,0 +1,65 @@
+"""Overlays for Contents App."""
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.playlists.models import PlaylistItem
+from apps.reviews.models import Review
+from apps.utils.versions import bump_rows
+from .models import Anime, Manga
+
+
+class ContentOverlay:
+    """
+    State of the current user for the animes or mangas of a page.
+
+    Items get a ``me`` object with the status and favorite flag of the
+    title in the user's playlists and the rating of the user's review,
+    read with one query per source for the whole page. Changes to the
+    sources bump the row version of their user only (see conditional).
+    """
+
+    models = [Anime, Manga]
+    field = "me"
+    default = {"in_playlist": False, "status": None, "is_favorite": False, "rating": None}
+
+    def __init__(self, model, user):
+        self.model = model
+        self.user = user
+
+    def get_states(self, ids):
+        """Return {id: state} of the ids of a page."""
+        content_type = ContentType.objects.get_for_model(self.model)
+        states = {pk: dict(self.default) for pk in ids}
+
+        items = PlaylistItem.objects.filter(
+            playlist__user=self.user, content_type=content_type, object_id__in=ids
+        ).values_list("object_id", "status", "is_favorite")
+        for object_id, status, is_favorite in items:
+            state = states[str(object_id)]
+            state["in_playlist"] = True
+            state["status"] = status
+            state["is_favorite"] = state["is_favorite"] or is_favorite
+
+        reviews = Review.objects.filter(
+            user=self.user, content_type=content_type, object_id__in=ids
+        ).values_list("object_id", "rating")
+        for object_id, rating in reviews:
+            states[str(object_id)]["rating"] = rating
+        return states
+
+
+@receiver(post_save, sender=PlaylistItem)
+@receiver(post_delete, sender=PlaylistItem)
+def bump_playlist_user(sender, instance, **kwargs):
+    """Signal marks the overlay state of the playlist owner as changed."""
+    bump_rows(get_user_model(), [instance.playlist.user_id])
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def bump_review_user(sender, instance, **kwargs):
+    """Signal marks the overlay state of the reviewer as changed."""
+    bump_rows(get_user_model(), [instance.user_id])
@@ -0,0 +1,117 @@
+"""Rankings for Contents App."""
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Q, Sum
+
+from apps.playlists.models import PlaylistItem
+from apps.reviews.models import Review
+from apps.utils.versions import bump
+
+
+class RankingEngine:
+    """
+    Recompute mean, rank, popularity, favorites and num_list_users.
+
+    Review ratings and playlist membership are aggregated in two grouped
+    queries, the Bayesian score and dense ranks are computed in memory and
+    only the rows whose values changed are written back with chunked
+    ``bulk_update``.
+    """
+
+    fields = ["mean", "rank", "popularity", "favorites", "num_list_users"]
+
+    def __init__(self, model, min_votes=10, batch_size=1000):
+        self.model = model
+        self.min_votes = min_votes
+        self.batch_size = batch_size
+        self.content_type = ContentType.objects.get_for_model(model)
+
+    def get_review_stats(self):
+        """Return {object_id: (votes, rating sum)} for available reviews."""
+        queryset = (
+            Review.objects.get_available()
+            .filter(content_type=self.content_type)
+            .values("object_id")
+            .annotate(votes=Count("id"), total=Sum("rating"))
+            .values_list("object_id", "votes", "total")
+            .order_by()
+        )
+        return {object_id: (votes, total) for object_id, votes, total in queryset}
+
+    def get_playlist_stats(self):
+        """Return {object_id: (list users, favorites)} for playlist items."""
+        queryset = (
+            PlaylistItem.objects.filter(content_type=self.content_type, available=True)
+            .values("object_id")
+            .annotate(
+                users=Count("playlist__user", distinct=True),
+                favorites=Count("id", filter=Q(is_favorite=True)),
+            )
+            .values_list("object_id", "users", "favorites")
+            .order_by()
+        )
+        return {object_id: (users, favorites) for object_id, users, favorites in queryset}
+
+    @staticmethod
+    def dense_rank(values):
+        """Return {key: rank} ranking values (key, score) by score desc."""
+        ranks = {}
+        rank, previous = 0, None
+        for key, score in sorted(values, key=lambda item: item[1], reverse=True):
+            if score != previous:
+                rank, previous = rank + 1, score
+            ranks[key] = rank
+        return ranks
+
+    def compute(self, ids, reviews, playlists):
+        """Return {pk: (mean, rank, popularity, favorites, num_list_users)}."""
+        # Reviews of unavailable rows would shift the mean and take ranks.
+        reviews = {pk: stats for pk, stats in reviews.items() if pk in ids}
+        votes = sum(count for count, _ in reviews.values())
+        total = sum(rating for _, rating in reviews.values())
+        global_mean = total / votes if votes else 0.0
+        m = self.min_votes
+
+        means, scores = {}, []
+        for pk, (count, rating) in reviews.items():
+            mean = rating / count
+            means[pk] = round(mean, 2)
+            scores.append((pk, (count * mean + m * global_mean) / (count + m)))
+        ranks = self.dense_rank(scores)
+
+        members = [(pk, playlists.get(pk, (0, 0))[0]) for pk in ids]
+        popularity = self.dense_rank(members)
+
+        return {
+            pk: (
+                means.get(pk),
+                ranks.get(pk),
+                popularity[pk],
+                playlists.get(pk, (0, 0))[1],
+                playlists.get(pk, (0, 0))[0],
+            )
+            for pk in ids
+        }
+
+    def run(self):
+        """Recompute every available row and return the number updated."""
+        current = {
+            row[0]: row[1:]
+            for row in self.model.objects.get_available()
+            .values_list("pk", *self.fields)
+            .order_by()
+        }
+        results = self.compute(
+            current.keys(), self.get_review_stats(), self.get_playlist_stats()
+        )
+
+        changed = [
+            self.model(pk=pk, **dict(zip(self.fields, values)))
+            for pk, values in results.items()
+            if values != current[pk]
+        ]
+        self.model.objects.bulk_update(changed, self.fields, batch_size=self.batch_size)
+        if changed:
+            # bulk_update() sends no signals.
+            bump(self.model, [instance.pk for instance in changed])
+        return len(changed)
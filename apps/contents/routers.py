@@ -4,10 +4,23 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
 from .viewsets import AnimeViewSet, MangaViewSet
+from .views import AnimeExportView, MangaExportView
 
 
 router = DefaultRouter()
 router.register(r"animes", AnimeViewSet, basename="anime")
 router.register(r"mangas", MangaViewSet, basename="manga")
 
-urlpatterns = [path("api/v1/", include(router.urls))]
+urlpatterns = [
+    path("api/v1/", include(router.urls)),
+    path(
+        "api/v1/export/animes.ndjson",
+        AnimeExportView.as_view(),
+        name="anime-export",
+    ),
+    path(
+        "api/v1/export/mangas.ndjson",
+        MangaExportView.as_view(),
+        name="manga-export",
+    ),
+]
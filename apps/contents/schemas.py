@@ -1,12 +1,45 @@
 """Schemas for Contents App."""
 
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+
+from apps.utils.schemas import sparse_fields_parameters
+
+
+def get_batch_schema(name):
+    return extend_schema(
+        summary=f"Get Several {name.title()}s by Id",
+        description=(
+            f"Retrieve {name} entries by id in request order, ids that do not "
+            'exist get {"id": ..., "detail": "Not found."}.'
+        ),
+        parameters=[
+            OpenApiParameter(
+                "ids",
+                OpenApiTypes.STR,
+                required=True,
+                description="Comma separated ids, 100 at most.",
+            ),
+        ],
+    )
+
+
+def get_expand_parameter(names):
+    return OpenApiParameter(
+        "expand",
+        OpenApiTypes.STR,
+        description=(
+            f"Comma separated related resources to embed: {', '.join(names)}. "
+            "To-many ones take a limit, e.g. reviews:5."
+        ),
+    )
 
 
 anime_schemas = {
     "list": extend_schema(
         summary="Get Several Animes",
         description="Retrieve a list of all anime entries.",
+        parameters=sparse_fields_parameters,
     ),
     "create": extend_schema(
         summary="Create Anime",
@@ -15,6 +48,10 @@ anime_schemas = {
     "retrieve": extend_schema(
         summary="Get Anime",
         description="Get detailed information about a specific anime entry.",
+        parameters=[
+            *sparse_fields_parameters,
+            get_expand_parameter(["studio", "season", "genres", "themes", "reviews"]),
+        ],
     ),
     "update": extend_schema(
         summary="Change Anime",
@@ -28,6 +65,7 @@ anime_schemas = {
         summary="Remove Anime",
         description="Remove a specific anime entry.",
     ),
+    "batch": get_batch_schema("anime"),
 }
 
 
@@ -35,6 +73,7 @@ manga_schemas = {
     "list": extend_schema(
         summary="Get Several Mangas",
         description="Retrieve a list of all manga entries.",
+        parameters=sparse_fields_parameters,
     ),
     "create": extend_schema(
         summary="Create Manga",
@@ -43,6 +82,10 @@ manga_schemas = {
     "retrieve": extend_schema(
         summary="Get Manga",
         description="Get detailed information about a specific manga entry.",
+        parameters=[
+            *sparse_fields_parameters,
+            get_expand_parameter(["author", "demographic", "genres", "themes", "reviews"]),
+        ],
     ),
     "update": extend_schema(
         summary="Change Manga",
@@ -56,4 +99,5 @@ manga_schemas = {
         summary="Remove Manga",
         description="Remove a specific manga entry.",
     ),
+    "batch": get_batch_schema("manga"),
 }
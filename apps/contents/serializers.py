@@ -61,10 +61,11 @@ class AnimeListSerializer(serializers.ModelSerializer):
             "popularity",
             "num_list_users",
         ]
+        query_sources = ["season.year"]
 
     @extend_schema_field(int)
     def get_year(self, obj):
-        return int(obj.season.year if obj.season else None)
+        return int(obj.season.year) if obj.season else None
 
 
 class AnimeMinimumSerializer(serializers.ModelSerializer):
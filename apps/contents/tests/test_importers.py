@@ -0,0 +1,129 @@
+"""Tests for Importers in Contents App."""
+
+import json
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.categories.models import Genre, Season, Studio
+from apps.contents.models import Anime, Manga
+from apps.persons.models import Author
+
+
+class ImportCatalogTestCase(TestCase):
+    """Test cases for the importcatalog command."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        return path
+
+    def write_jsonl(self, records):
+        return self.write("animes.jsonl", "\n".join(json.dumps(r) for r in records))
+
+    def call(self, path, model="anime", **options):
+        call_command("importcatalog", path, model=model, stdout=StringIO(), **options)
+
+    def test_import_jsonl(self):
+        """Test titles are created with their relations."""
+        Genre.objects.create(name="Drama")
+        path = self.write_jsonl(
+            [
+                {
+                    "name": "Monster",
+                    "name_jpn": "モンスター",
+                    "episodes": 74,
+                    "release": "2004-04-07",
+                    "studio": "Madhouse",
+                    "season": "spring 2004",
+                    "genres": ["Drama", "Mystery"],
+                },
+                {"name": "Akira", "name_jpn": "アキラ", "studio": "TMS"},
+            ]
+        )
+        self.call(path, batch_size=1)
+
+        monster = Anime.objects.get(name="Monster")
+        self.assertEqual(monster.name_rom, "Monster")
+        self.assertEqual(monster.episodes, 74)
+        self.assertEqual(monster.studio.slug, "madhouse")
+        self.assertEqual(monster.season, Season.objects.get(fullname="Spring 2004"))
+        self.assertCountEqual(
+            monster.genres.values_list("name", flat=True), ["Drama", "Mystery"]
+        )
+        self.assertEqual(Studio.objects.count(), 2)
+        self.assertEqual(Genre.objects.count(), 2)
+
+    def test_upsert(self):
+        """Test existing titles are updated in place."""
+        anime = Anime.objects.create(name="Monster", name_jpn="モンスター", episodes=1)
+        path = self.write_jsonl(
+            [{"name": "Monster", "name_jpn": "モンスター", "episodes": 74, "genres": ["Drama"]}]
+        )
+        self.call(path)
+        self.call(path, restart=True)
+
+        anime.refresh_from_db()
+        self.assertEqual(Anime.objects.count(), 1)
+        self.assertEqual(anime.episodes, 74)
+        self.assertEqual(anime.genres.count(), 1)
+
+    def test_import_csv(self):
+        """Test CSV dumps with "|" separated lists."""
+        path = self.write(
+            "mangas.csv",
+            "name,name_jpn,chapters,author,genres\n"
+            "Berserk,ベルセルク,364,Kentaro Miura,Action|Drama\n"
+            "Pluto,プルートウ,65,Naoki Urasawa,\n",
+        )
+        self.call(path, model="manga")
+
+        berserk = Manga.objects.get(name="Berserk")
+        self.assertEqual(berserk.chapters, 364)
+        self.assertEqual(berserk.author, Author.objects.get(name="Kentaro Miura"))
+        self.assertEqual(berserk.genres.count(), 2)
+        self.assertEqual(Manga.objects.get(name="Pluto").genres.count(), 0)
+
+    def test_resume_from_checkpoint(self):
+        """Test records before the checkpoint are skipped."""
+        path = self.write_jsonl(
+            [{"name": f"Anime {i}", "name_jpn": f"アニメ {i}"} for i in range(3)]
+        )
+        self.write("animes.jsonl.checkpoint", json.dumps({"model": "anime", "records": 2}))
+        self.call(path)
+
+        self.assertEqual(list(Anime.objects.values_list("name", flat=True)), ["Anime 2"])
+        with open(f"{path}.checkpoint", encoding="utf-8") as file:
+            self.assertEqual(json.load(file)["records"], 3)
+
+    def test_unique_conflicts(self):
+        """Test records clashing on other unique fields are skipped, not fatal."""
+        Anime.objects.create(name="Monster", name_jpn="モンスター", episodes=1)
+        path = self.write_jsonl(
+            [
+                {"name": "Monster", "episodes": 74},
+                {"name": "Monster 2", "name_jpn": "モンスター"},
+                {"name": "Akira"},
+                {"name": "Perfect Blue"},
+                {"name": "Pluto", "name_jpn": "プルートウ"},
+                {"name": "Pluto 2", "name_jpn": "プルートウ"},
+                {"name": "Paprika", "name_jpn": "パプリカ", "name_rom": "Pluto"},
+            ]
+        )
+        stderr = StringIO()
+        call_command("importcatalog", path, model="anime", stdout=StringIO(), stderr=stderr)
+
+        self.assertCountEqual(
+            Anime.objects.values_list("name", "name_jpn"),
+            [("Monster", "モンスター"), ("Pluto", "プルートウ")],
+        )
+        self.assertEqual(Anime.objects.get(name="Monster").episodes, 74)
+        self.assertEqual(stderr.getvalue().count("Skipped"), 5)
+        self.assertIn("'Akira': missing name_jpn", stderr.getvalue())
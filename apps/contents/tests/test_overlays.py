@@ -0,0 +1,119 @@
+"""Tests for Overlays in Contents App."""
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.contents.models import Anime
+from apps.contents.overlays import ContentOverlay
+from apps.playlists.models import Playlist, PlaylistItem
+from apps.reviews.models import Review
+from apps.utils.overlays import apply_overlay
+
+User = get_user_model()
+
+
+class ContentOverlayTestCase(TestCase):
+    """Test cases for ContentOverlay."""
+
+    url = "/api/v1/animes/"
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.anime = Anime.objects.create(name="Monster", name_jpn="モンスター")
+        self.user = User.objects.create_user(
+            email="fan@fandomhub.com", username="fan", password="password"
+        )
+        content_type = ContentType.objects.get_for_model(Anime)
+        playlist = Playlist.objects.create(user=self.user, name="Favorites")
+        PlaylistItem.objects.create(
+            playlist=playlist,
+            content_type=content_type,
+            object_id=self.anime.pk,
+            status="watching",
+            is_favorite=True,
+        )
+        Review.objects.create(
+            user=self.user,
+            content_type=content_type,
+            object_id=self.anime.pk,
+            rating=9,
+            comment="...",
+        )
+
+    def authenticate(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f"JWT {AccessToken.for_user(user)}")
+
+    def test_anonymous_page_has_no_overlay(self):
+        """Test anonymous pages stay public and without user state."""
+        response = self.client.get(self.url)
+        self.assertNotIn("me", response.json()["results"][0])
+        self.assertNotIn("private", response.get("Cache-Control", ""))
+
+    def test_overlay_on_cached_page(self):
+        """Test users read the shared page and only query their own state."""
+        self.client.get(self.url)
+        self.authenticate(self.user)
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(
+            response.json()["results"][0]["me"],
+            {"in_playlist": True, "status": "watching", "is_favorite": True, "rating": 9},
+        )
+        self.assertIn("private", response["Cache-Control"])
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+
+    def test_apply_overlay_content_length(self):
+        """Test apply_overlay keeps Content-Length in line with the new body."""
+        response = HttpResponse(
+            f'[{{"id": "{self.anime.pk}"}}]', content_type="application/json"
+        )
+        response["Content-Length"] = len(response.content)
+        response = apply_overlay(ContentOverlay(Anime, self.user), response)
+        self.assertIn(b'"me"', response.content)
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+
+    def test_overlay_does_not_leak(self):
+        """Test the overlay of a user is not stored in the shared entry."""
+        self.authenticate(self.user)
+        self.client.get(self.url)
+        self.client.credentials()
+        response = self.client.get(self.url)
+        self.assertNotIn("me", response.json()["results"][0])
+
+    def test_default_state(self):
+        """Test titles the user has not touched get the default state."""
+        other = User.objects.create_user(
+            email="other@fandomhub.com", username="other", password="password"
+        )
+        self.authenticate(other)
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()["results"][0]["me"]["in_playlist"], False)
+
+    def test_validators_are_per_user(self):
+        """Test writes of other users keep the ETag, own writes change it."""
+        self.authenticate(self.user)
+        etag = self.client.get(self.url)["ETag"]
+        other = User.objects.create_user(
+            email="other@fandomhub.com", username="other", password="password"
+        )
+        Review.objects.create(
+            user=other,
+            content_type=ContentType.objects.get_for_model(Anime),
+            object_id=self.anime.pk,
+            rating=5,
+            comment="...",
+        )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        review = Review.objects.get(user=self.user)
+        review.rating = 10
+        review.save()
+        self.assertNotEqual(self.client.get(self.url)["ETag"], etag)
@@ -0,0 +1,103 @@
+"""Tests for Rankings in Contents App."""
+
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.contents.models import Anime
+from apps.contents.rankings import RankingEngine
+from apps.playlists.models import Playlist, PlaylistItem
+from apps.reviews.models import Review
+
+User = get_user_model()
+
+
+class RankingEngineTestCase(TestCase):
+    """Test cases for RankingEngine."""
+
+    def setUp(self):
+        self.content_type = ContentType.objects.get_for_model(Anime)
+        self.animes = [
+            Anime.objects.create(name=f"Anime {i}", name_jpn=f"アニメ {i}")
+            for i in range(3)
+        ]
+        self.users = [
+            User.objects.create(email=f"user{i}@mail.com", username=f"user{i}")
+            for i in range(3)
+        ]
+
+    def review(self, user, anime, rating):
+        Review.objects.create(
+            user=user,
+            content_type=self.content_type,
+            object_id=anime.pk,
+            rating=rating,
+            comment="...",
+        )
+
+    def add_to_playlist(self, user, anime, is_favorite=False):
+        playlist, _ = Playlist.objects.get_or_create(user=user, name=user.username)
+        PlaylistItem.objects.create(
+            playlist=playlist,
+            content_type=self.content_type,
+            object_id=anime.pk,
+            is_favorite=is_favorite,
+        )
+
+    def test_dense_rank(self):
+        """Test ties share a rank and the next rank is not skipped."""
+        ranks = RankingEngine.dense_rank([("a", 5), ("b", 9), ("c", 5), ("d", 1)])
+        self.assertEqual(ranks, {"b": 1, "a": 2, "c": 2, "d": 3})
+
+    def test_recompute(self):
+        """Test mean, rank, popularity and counters are written back."""
+        first, second, third = self.animes
+        for user in self.users:
+            self.review(user, first, 9)
+            self.add_to_playlist(user, first, is_favorite=user == self.users[0])
+        self.review(self.users[0], second, 10)
+        self.review(self.users[0], third, 2)
+        self.add_to_playlist(self.users[0], second)
+
+        call_command("computeranks", "--min-votes=5", stdout=StringIO())
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        third.refresh_from_db()
+        self.assertEqual(first.mean, 9.0)
+        self.assertEqual(second.mean, 10.0)
+        self.assertEqual(third.mean, 2.0)
+        # 3 votes at 9 outweigh a single vote at 10
+        self.assertEqual((first.rank, second.rank, third.rank), (1, 2, 3))
+        self.assertEqual(
+            (first.popularity, second.popularity, third.popularity), (1, 2, 3)
+        )
+        self.assertEqual((first.num_list_users, first.favorites), (3, 1))
+        self.assertEqual(list(Anime.objects.get_popular()), [first, second, third])
+
+    def test_unavailable_rows_are_left_out(self):
+        """Test reviews of unavailable rows take no rank and skew no score."""
+        first, second, third = self.animes
+        hidden = Anime.objects.create(name="Hidden", name_jpn="ヒドゥン", available=False)
+        for user in self.users:
+            self.review(user, hidden, 10)
+        self.review(self.users[0], first, 8)
+        self.review(self.users[0], second, 6)
+
+        results = RankingEngine(Anime, min_votes=1).compute(
+            {anime.pk for anime in self.animes},
+            RankingEngine(Anime).get_review_stats(),
+            {},
+        )
+        self.assertNotIn(hidden.pk, results)
+        self.assertEqual(results[first.pk][:2], (8.0, 1))
+        self.assertEqual(results[second.pk][:2], (6.0, 2))
+        self.assertIsNone(results[third.pk][1])
+
+    def test_unchanged_rows_are_skipped(self):
+        """Test a second run does not rewrite anything."""
+        engine = RankingEngine(Anime)
+        self.assertEqual(engine.run(), 3)
+        self.assertEqual(engine.run(), 0)
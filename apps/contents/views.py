@@ -0,0 +1,29 @@
+"""Views for Contents App."""
+
+from apps.utils.views import NDJSONExportView
+from .models import Anime, Manga
+from .serializers import AnimeSerializer, MangaSerializer
+
+
+class AnimeExportView(NDJSONExportView):
+    """
+    View exporting every anime as NDJSON.
+
+    Endpoints:
+    - GET /api/v1/export/animes.ndjson
+    """
+
+    model = Anime
+    serializer_class = AnimeSerializer
+
+
+class MangaExportView(NDJSONExportView):
+    """
+    View exporting every manga as NDJSON.
+
+    Endpoints:
+    - GET /api/v1/export/mangas.ndjson
+    """
+
+    model = Manga
+    serializer_class = MangaSerializer
@@ -1,9 +1,6 @@
 """ViewSets for Contents App."""
 
 from django.contrib.contenttypes.models import ContentType
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-from django.views.decorators.vary import vary_on_cookie
 
 # from django.shortcuts import get_object_or_404
 from django.utils.translation import gettext as _
@@ -16,12 +13,31 @@ from drf_spectacular.utils import extend_schema_view, extend_schema
 
 # from drf_spectacular.utils import OpenApiParameter
 
-from apps.utils.mixins import LogicalDeleteMixin
+from apps.utils.expansions import Expansion, GenericExpansion
+from apps.utils.mixins import (
+    BatchRetrieveMixin,
+    CompiledListMixin,
+    ExpandMixin,
+    LogicalDeleteMixin,
+    QueryPlannerMixin,
+    SparseFieldsMixin,
+)
 from apps.utils.permissions import IsStaffOrReadOnly
-from apps.utils.pagination import MediumSetPagination
+from apps.utils.caching import cache_response
+from apps.utils.versions import conditional
+from apps.utils.pagination import MediumSetPagination, LargeSetKeysetPagination
+from apps.categories.serializers import (
+    DemographicSerializer,
+    GenreSerializer,
+    SeasonSerializer,
+    StudioSerializer,
+    ThemeSerializer,
+)
+from apps.persons.serializers import AuthorSerializer
 from apps.reviews.models import Review
 from apps.reviews.serializers import ReviewReadSerializer, ReviewWriteSerializer
 from .models import Anime, Manga
+from .overlays import ContentOverlay
 from .serializers import (
     AnimeSerializer,
     MangaSerializer,
@@ -32,7 +48,15 @@ from .schemas import anime_schemas, manga_schemas
 
 
 @extend_schema_view(**anime_schemas)
-class AnimeViewSet(LogicalDeleteMixin, ModelViewSet):
+class AnimeViewSet(
+    ExpandMixin,
+    SparseFieldsMixin,
+    BatchRetrieveMixin,
+    CompiledListMixin,
+    QueryPlannerMixin,
+    LogicalDeleteMixin,
+    ModelViewSet,
+):
     """
     ViewSet for managing Anime instances.
 
@@ -40,6 +64,7 @@ class AnimeViewSet(LogicalDeleteMixin, ModelViewSet):
     - GET /api/v1/animes/
     - POST /api/v1/animes/
     - GET /api/v1/animes/{id}/
+    - GET /api/v1/animes/batch/?ids={id},{id}
     - PUT /api/v1/animes/{id}/
     - PATCH /api/v1/animes/{id}/
     - DELETE /api/v1/animes/{id}/
@@ -47,6 +72,15 @@ class AnimeViewSet(LogicalDeleteMixin, ModelViewSet):
 
     serializer_class = AnimeSerializer
     permission_classes = [IsStaffOrReadOnly]
+    overlay_class = ContentOverlay
+    expansions = {
+        "studio": Expansion(StudioSerializer),
+        "season": Expansion(SeasonSerializer),
+        "genres": Expansion(GenreSerializer, many=True),
+        "themes": Expansion(ThemeSerializer, many=True),
+        "reviews": GenericExpansion(ReviewReadSerializer),
+    }
+    pagination_class = LargeSetKeysetPagination
     search_fields = ["name", "studio__name"]
     ordering_fields = ["name"]
     ordering = ["id"]
@@ -59,17 +93,27 @@ class AnimeViewSet(LogicalDeleteMixin, ModelViewSet):
             return AnimeListSerializer
         return super().get_serializer_class()
 
-    @method_decorator(cache_page(60 * 60 * 2))
-    @method_decorator(vary_on_cookie)
+    @conditional
+    @cache_response(60 * 60 * 2)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @conditional
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @extend_schema(
         summary="Get Popular Animes",
         description="Retrieve a list of the 50 most popular anime.",
     )
-    @action(detail=False, methods=["get"], url_path="popular")
-    @method_decorator(cache_page(60 * 60 * 2))
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="popular",
+        serializer_class=AnimeListSerializer,
+    )
+    @conditional
+    @cache_response(60 * 60 * 2)
     def popular_list(self, request, pk=None):
         """
         Action return a list of the 50 most popular anime.
@@ -77,10 +121,13 @@ class AnimeViewSet(LogicalDeleteMixin, ModelViewSet):
         Endpoints:
         - GET /api/v1/animes/popular/
         """
-        popular_list = Anime.objects.get_popular()[:50]
+        popular_list = self.plan_queryset(
+            Anime.objects.get_popular(), AnimeListSerializer
+        )[:50]
         if not popular_list:
             return Response(status=status.HTTP_204_NO_CONTENT)
-        serializer = AnimeListSerializer(popular_list, many=True)
+        serializer_class = self.get_sparse_serializer_class(AnimeListSerializer)
+        serializer = serializer_class(popular_list, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @action(
@@ -181,7 +228,15 @@ class AnimeViewSet(LogicalDeleteMixin, ModelViewSet):
 
 
 @extend_schema_view(**manga_schemas)
-class MangaViewSet(LogicalDeleteMixin, ModelViewSet):
+class MangaViewSet(
+    ExpandMixin,
+    SparseFieldsMixin,
+    BatchRetrieveMixin,
+    CompiledListMixin,
+    QueryPlannerMixin,
+    LogicalDeleteMixin,
+    ModelViewSet,
+):
     """
     ViewSet for managing Manga instances.
 
@@ -189,6 +244,7 @@ class MangaViewSet(LogicalDeleteMixin, ModelViewSet):
     - GET /api/v1/mangas/
     - POST /api/v1/mangas/
     - GET /api/v1/mangas/{id}/
+    - GET /api/v1/mangas/batch/?ids={id},{id}
     - PUT /api/v1/mangas/{id}/
     - PATCH /api/v1/mangas/{id}/
     - DELETE /api/v1/mangas/{id}/
@@ -196,6 +252,15 @@ class MangaViewSet(LogicalDeleteMixin, ModelViewSet):
 
     serializer_class = MangaSerializer
     permission_classes = [IsStaffOrReadOnly]
+    overlay_class = ContentOverlay
+    expansions = {
+        "author": Expansion(AuthorSerializer),
+        "demographic": Expansion(DemographicSerializer),
+        "genres": Expansion(GenreSerializer, many=True),
+        "themes": Expansion(ThemeSerializer, many=True),
+        "reviews": GenericExpansion(ReviewReadSerializer),
+    }
+    pagination_class = LargeSetKeysetPagination
     search_fields = [
         "name",
     ]
@@ -210,17 +275,28 @@ class MangaViewSet(LogicalDeleteMixin, ModelViewSet):
             return MangaListSerializer
         return super().get_serializer_class()
 
-    @method_decorator(cache_page(60 * 60 * 2))
-    @method_decorator(vary_on_cookie)
+    @conditional
+    @cache_response(60 * 60 * 2)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @conditional
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @extend_schema(
         summary="Get Popular Mangas",
         description="Retrieve a list of the 50 most popular mangas.",
     )
-    @action(detail=False, methods=["get"], url_path="popular")
-    @method_decorator(cache_page(60 * 60 * 2))
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="popular",
+        serializer_class=MangaListSerializer,
+        pagination_class=MediumSetPagination,
+    )
+    @conditional
+    @cache_response(60 * 60 * 2)
     def popular_list(self, request, pk=None):
         """
         Action return a list of the 50 most popular mangas.
@@ -228,11 +304,14 @@ class MangaViewSet(LogicalDeleteMixin, ModelViewSet):
         Endpoints:
         - GET /api/v1/mangas/popular/
         """
-        popular_list = Manga.objects.get_popular()[:50]
-        paginator = MediumSetPagination()
+        popular_list = self.plan_queryset(
+            Manga.objects.get_popular(), MangaListSerializer
+        )[:50]
+        paginator = self.paginator
         result_page = paginator.paginate_queryset(popular_list, request)
         if result_page is not None:
-            serializer = MangaListSerializer(result_page, many=True).data
+            serializer_class = self.get_sparse_serializer_class(MangaListSerializer)
+            serializer = serializer_class(result_page, many=True).data
             return paginator.get_paginated_response(serializer)
         return Response(
             {"detail": _("There are no popular mangas available.")},
@@ -2,14 +2,18 @@
 
 from drf_spectacular.utils import extend_schema
 
+from apps.utils.schemas import sparse_fields_parameters
+
 
 new_schemas = {
     "list": extend_schema(
         summary="Get Several News",
         description="Retrieve a list of all new entries.",
+        parameters=sparse_fields_parameters,
     ),
     "retrieve": extend_schema(
         summary="Get New",
         description="Get detailed information about a specific new entry.",
+        parameters=sparse_fields_parameters,
     ),
 }
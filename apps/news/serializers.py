@@ -22,6 +22,7 @@ class NewListSerializer(serializers.ModelSerializer):
             "tag",
         ]
         read_only_fields = ["author"]
+        query_sources = ["author.username"]
 
     def get_author(self, obj) -> str:
         return obj.author.username
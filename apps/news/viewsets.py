@@ -1,19 +1,21 @@
 """ViewSets for News App."""
 
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-from django.views.decorators.vary import vary_on_cookie
 from rest_framework.viewsets import ReadOnlyModelViewSet
 from drf_spectacular.utils import extend_schema_view
 
+from apps.utils.mixins import CompiledListMixin, QueryPlannerMixin, SparseFieldsMixin
 from apps.utils.permissions import IsStaffOrReadOnly
+from apps.utils.caching import cache_response
+from apps.utils.versions import conditional
 from .models import New
 from .serializers import NewSerializer, NewListSerializer
 from .schemas import new_schemas
 
 
 @extend_schema_view(**new_schemas)
-class NewViewSet(ReadOnlyModelViewSet):
+class NewViewSet(
+    SparseFieldsMixin, CompiledListMixin, QueryPlannerMixin, ReadOnlyModelViewSet
+):
     """
     ViewSet for managing New instances.
 
@@ -36,7 +38,11 @@ class NewViewSet(ReadOnlyModelViewSet):
             return NewListSerializer
         return super().get_serializer_class()
 
-    @method_decorator(cache_page(60 * 60 * 2))
-    @method_decorator(vary_on_cookie)
+    @conditional
+    @cache_response(60 * 60 * 2)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
+
+    @conditional
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
@@ -4,9 +4,17 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
 from .viewsets import AuthorViewSet
+from .views import AuthorExportView
 
 
 router_v1 = DefaultRouter()
 router_v1.register(r"authors", AuthorViewSet, basename="author")
 
-urlpatterns = [path("api/v1/", include(router_v1.urls))]
+urlpatterns = [
+    path("api/v1/", include(router_v1.urls)),
+    path(
+        "api/v1/export/authors.ndjson",
+        AuthorExportView.as_view(),
+        name="author-export",
+    ),
+]
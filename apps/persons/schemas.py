@@ -2,11 +2,14 @@
 
 from drf_spectacular.utils import extend_schema
 
+from apps.utils.schemas import sparse_fields_parameters
+
 
 author_schemas = {
     "list": extend_schema(
         summary="Get Several Authors",
         description="Retrieve a list of all author entries.",
+        parameters=sparse_fields_parameters,
     ),
     "create": extend_schema(
         summary="Create Author",
@@ -15,6 +18,7 @@ author_schemas = {
     "retrieve": extend_schema(
         summary="Get Author",
         description="Get detailed information about a specific author entry.",
+        parameters=sparse_fields_parameters,
     ),
     "update": extend_schema(
         summary="Change Author",
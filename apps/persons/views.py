@@ -0,0 +1,17 @@
+"""Views for Persons App."""
+
+from apps.utils.views import NDJSONExportView
+from .models import Author
+from .serializers import AuthorSerializer
+
+
+class AuthorExportView(NDJSONExportView):
+    """
+    View exporting every author as NDJSON.
+
+    Endpoints:
+    - GET /api/v1/export/authors.ndjson
+    """
+
+    model = Author
+    serializer_class = AuthorSerializer
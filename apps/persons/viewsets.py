@@ -1,8 +1,5 @@
 """ViewSets for Persons App."""
 
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-from django.views.decorators.vary import vary_on_cookie
 from django.utils.translation import gettext as _
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.decorators import action
@@ -10,10 +7,18 @@ from rest_framework.response import Response
 from rest_framework import status
 from drf_spectacular.utils import extend_schema_view, extend_schema
 
-from apps.utils.mixins import LogicalDeleteMixin
+from apps.utils.mixins import (
+    CompiledListMixin,
+    LogicalDeleteMixin,
+    QueryPlannerMixin,
+    SparseFieldsMixin,
+)
 from apps.utils.permissions import IsStaffOrReadOnly
+from apps.utils.caching import cache_response
+from apps.utils.versions import conditional
 from apps.utils.pagination import MediumSetPagination
 from apps.contents.models import Manga
+from apps.contents.overlays import ContentOverlay
 from apps.contents.serializers import MangaListSerializer
 from .models import Author
 from .serializers import AuthorSerializer
@@ -21,7 +26,13 @@ from .schemas import author_schemas
 
 
 @extend_schema_view(**author_schemas)
-class AuthorViewSet(LogicalDeleteMixin, ModelViewSet):
+class AuthorViewSet(
+    SparseFieldsMixin,
+    CompiledListMixin,
+    QueryPlannerMixin,
+    LogicalDeleteMixin,
+    ModelViewSet,
+):
     """
     ViewSet for managing Author instances.
 
@@ -36,6 +47,7 @@ class AuthorViewSet(LogicalDeleteMixin, ModelViewSet):
 
     serializer_class = AuthorSerializer
     permission_classes = [IsStaffOrReadOnly]
+    overlay_class = ContentOverlay
     search_fields = ["name"]
     ordering_fields = ["name"]
     ordering = ["id"]
@@ -43,27 +55,37 @@ class AuthorViewSet(LogicalDeleteMixin, ModelViewSet):
     def get_queryset(self):
         return Author.objects.get_available().only("id", "name")
 
-    @method_decorator(cache_page(60 * 60 * 2))
-    @method_decorator(vary_on_cookie)
+    @conditional
+    @cache_response(60 * 60 * 2)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @conditional
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @extend_schema(
         summary="Get Mangas for Author",
         description="Retrieve a list of mangas for author.",
     )
-    @action(detail=True, methods=["get"], url_path="mangas")
-    @method_decorator(cache_page(60 * 60 * 2))
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="mangas",
+        serializer_class=MangaListSerializer,
+        pagination_class=MediumSetPagination,
+    )
+    @conditional
+    @cache_response(60 * 60 * 2)
     def manga_list(self, request, pk=None):
         """
         Retrieve a list of mangas for the specified author.
         """
-        manga_list = Manga.objects.filter(author=pk)
+        manga_list = self.plan_queryset(
+            Manga.objects.filter(author=pk), MangaListSerializer
+        )
         if manga_list.exists():
-            paginator = MediumSetPagination()
-            paginated_data = paginator.paginate_queryset(manga_list, request)
-            serializer = MangaListSerializer(paginated_data, many=True)
-            return paginator.get_paginated_response(serializer.data)
+            return self.get_paginated_list(manga_list, MangaListSerializer)
         return Response(
             {"detail": _("There are no mangas for this author.")},
             status=status.HTTP_404_NOT_FOUND,
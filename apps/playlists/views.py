@@ -9,6 +9,7 @@ from rest_framework.views import APIView
 from drf_spectacular.utils import extend_schema_view
 
 from apps.contents.models import Anime, Manga
+from apps.utils.caching import make_key
 from apps.utils.permissions import IsOwner
 from .models import Playlist, PlaylistAnime, PlaylistManga
 from .serializers import (
@@ -19,6 +20,11 @@ from .serializers import (
 from .schemas import playlists_schemas, playlists_anime_schemas, playlists_manga_schemas
 
 
+def get_cache_key(user, model):
+    """Return the key of user's cached playlist, tagged with model."""
+    return make_key(f"playlist_{model._meta.model_name}", user.id, models=[model])
+
+
 @extend_schema_view(**playlists_schemas)
 class PlaylistView(APIView):
     """
@@ -60,7 +66,7 @@ class PlaylistAnimeListView(APIView):
 
     def get(self, request):
         """Return the current user's playlist (anime)."""
-        cache_key = f"playlist_anime_{request.user.id}"
+        cache_key = get_cache_key(request.user, Anime)
         cached_data = cache.get(cache_key)
 
         if cached_data is None:
@@ -101,7 +107,7 @@ class PlaylistAnimeListView(APIView):
         )
 
         # Invalidate cache
-        cache_key = f"playlist_anime_{request.user.id}"
+        cache_key = get_cache_key(request.user, Anime)
         cache.delete(cache_key)
 
         serializer = PlaylistAnimeSerializer(playlist_anime)
@@ -142,7 +148,7 @@ class PlaylistAnimeDetailView(APIView):
             playlist_anime.is_favorite = is_favorite
 
         # Invalidate cache
-        cache_key = f"playlist_anime_{request.user.id}"
+        cache_key = get_cache_key(request.user, Anime)
         cache.delete(cache_key)
 
         playlist_anime.save()
@@ -159,7 +165,7 @@ class PlaylistAnimeDetailView(APIView):
         )
 
         # Invalidate cache
-        cache_key = f"playlist_anime_{request.user.id}"
+        cache_key = get_cache_key(request.user, Anime)
         cache.delete(cache_key)
 
         playlist_anime.delete()
@@ -185,7 +191,7 @@ class PlaylistMangaListView(APIView):
 
     def get(self, request):
         """Return the current user's playlist (manga)."""
-        cache_key = f"playlist_manga_{request.user.id}"
+        cache_key = get_cache_key(request.user, Manga)
         cached_data = cache.get(cache_key)
 
         if cached_data is None:
@@ -226,7 +232,7 @@ class PlaylistMangaListView(APIView):
         )
 
         # Invalidate cache
-        cache_key = f"playlist_manga_{request.user.id}"
+        cache_key = get_cache_key(request.user, Manga)
         cache.delete(cache_key)
 
         serializer = PlaylistMangaSerializer(playlist_manga)
@@ -267,7 +273,7 @@ class PlaylistMangaDetailView(APIView):
             playlist_manga.is_favorite = is_favorite
 
         # Invalidate cache
-        cache_key = f"playlist_anime_{request.user.id}"
+        cache_key = get_cache_key(request.user, Manga)
         cache.delete(cache_key)
 
         playlist_manga.save()
@@ -284,7 +290,7 @@ class PlaylistMangaDetailView(APIView):
         )
 
         # Invalidate cache
-        cache_key = f"playlist_manga_{request.user.id}"
+        cache_key = get_cache_key(request.user, Manga)
         cache.delete(cache_key)
 
         playlist_manga.delete()
@@ -0,0 +1,188 @@
+"""Autocomplete for Search App."""
+
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.db import connection
+
+from apps.categories.models import Studio
+from apps.contents.models import Anime, Manga
+
+AUTOCOMPLETE_FIELDS = {
+    Anime: ["name", "name_rom", "name_jpn"],
+    Manga: ["name", "name_rom", "name_jpn"],
+    Studio: ["name", "name_jpn"],
+}
+
+
+def normalize(text):
+    """Return text casefolded and without accents."""
+    text = unicodedata.normalize("NFKD", (text or "").casefold())
+    return "".join(char for char in text if not unicodedata.combining(char)).strip()
+
+
+class PrefixIndex:
+    """
+    In-memory prefix index over Anime, Manga and Studio names.
+
+    Every word-start suffix of every name is kept in one sorted list, so a
+    prefix lookup is a binary search plus a short scan. Results are ordered
+    by popularity (rank 1 first); the best matches of short prefixes, whose
+    ranges are large, are memoized per set of types until a save touches
+    them. The index is built on first use, patched by model signals and
+    rebuilt in the background every ``AUTOCOMPLETE_REFRESH`` seconds to
+    pick up changes made by other processes.
+    """
+
+    short_prefix = 3
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.loaded_at = None
+        self.refreshing = False
+        self.terms = []
+        self.entries = {}
+        self.top = {}
+
+    @staticmethod
+    def get_key(model, pk):
+        return f"{model._meta.model_name}:{pk}"
+
+    @staticmethod
+    def get_terms(names):
+        terms = set()
+        for name in names:
+            words = normalize(name).split()
+            terms.update(" ".join(words[i:]) for i in range(len(words)))
+        return terms
+
+    @staticmethod
+    def get_rank(entry):
+        popularity = entry["popularity"]
+        return (popularity is None, popularity or 0, entry["name"])
+
+    def build(self):
+        """Return (terms, entries) read from the database."""
+        terms, entries = [], {}
+        for model, fields in AUTOCOMPLETE_FIELDS.items():
+            columns = ["pk", *fields]
+            if model is not Studio:
+                columns.append("popularity")
+            rows = model.objects.get_available().values(*columns).order_by()
+            for row in rows.iterator(chunk_size=2000):
+                key = self.get_key(model, row["pk"])
+                names = [row[field] for field in fields]
+                entries[key] = self.get_entry(model, row["pk"], names, row)
+                terms.extend((term, key) for term in self.get_terms(names))
+        terms.sort()
+        return terms, entries
+
+    def get_entry(self, model, pk, names, values):
+        return {
+            "id": str(pk),
+            "type": model._meta.model_name,
+            "name": names[0],
+            "names": names,
+            "popularity": values.get("popularity"),
+        }
+
+    def load(self):
+        refresh = getattr(settings, "AUTOCOMPLETE_REFRESH", 60 * 15)
+        if self.loaded_at is None:
+            with self.lock:
+                if self.loaded_at is None:
+                    self.rebuild()
+        elif time.monotonic() - self.loaded_at > refresh and not self.refreshing:
+            with self.lock:
+                if self.refreshing:
+                    return
+                self.refreshing = True
+            threading.Thread(target=self.refresh, daemon=True).start()
+
+    def refresh(self):
+        """Rebuild the index in a background thread."""
+        try:
+            self.rebuild()
+        finally:
+            connection.close()
+
+    def rebuild(self):
+        try:
+            terms, entries = self.build()
+            with self.lock:
+                self.terms, self.entries, self.top = terms, entries, {}
+                self.loaded_at = time.monotonic()
+        finally:
+            self.refreshing = False
+
+    def discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for term in self.get_terms(entry["names"]):
+            index = bisect_left(self.terms, (term, key))
+            if index < len(self.terms) and self.terms[index] == (term, key):
+                del self.terms[index]
+            self.invalidate(term)
+
+    def invalidate(self, term):
+        for length in range(1, self.short_prefix + 1):
+            self.top.pop(term[:length], None)
+
+    def update(self, instance):
+        """Patch the index after instance was saved."""
+        if self.loaded_at is None:
+            return
+        model = type(instance)
+        key = self.get_key(model, instance.pk)
+        with self.lock:
+            self.discard(key)
+            if not instance.available:
+                return
+            names = [getattr(instance, field) for field in AUTOCOMPLETE_FIELDS[model]]
+            values = {"popularity": getattr(instance, "popularity", None)}
+            self.entries[key] = self.get_entry(model, instance.pk, names, values)
+            for term in self.get_terms(names):
+                insort(self.terms, (term, key))
+                self.invalidate(term)
+
+    def remove(self, instance):
+        if self.loaded_at is None:
+            return
+        with self.lock:
+            self.discard(self.get_key(type(instance), instance.pk))
+
+    def scan(self, prefix, types=None):
+        """Return the entries of every term starting with prefix, best first."""
+        keys = set()
+        index = bisect_left(self.terms, (prefix,))
+        while index < len(self.terms) and self.terms[index][0].startswith(prefix):
+            keys.add(self.terms[index][1])
+            index += 1
+        entries = (self.entries[key] for key in keys)
+        if types:
+            entries = (entry for entry in entries if entry["type"] in types)
+        return sorted(entries, key=self.get_rank)
+
+    def query(self, text, types=None, limit=10):
+        """Return up to limit entries whose names have a word starting with text."""
+        prefix = normalize(text)
+        if not prefix:
+            return []
+        types = frozenset(types) if types else None
+        self.load()
+        with self.lock:
+            if len(prefix) <= self.short_prefix:
+                top = self.top.setdefault(prefix, {})
+                if types not in top:
+                    top[types] = self.scan(prefix, types)[:100]
+                matches = top[types]
+            else:
+                matches = self.scan(prefix, types)
+        return matches[:limit]
+
+
+prefix_index = PrefixIndex()
@@ -0,0 +1,210 @@
+"""Backends for Search App."""
+
+import math
+import re
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from apps.contents.models import Anime, Manga
+from apps.utils.versions import get_model_key, get_versions
+from .indexes import SEARCH_CONFIG, SEARCH_FIELDS, get_search_vector
+
+WEIGHTS = {"A": 1.0, "B": 0.4}
+SEARCH_MODELS = [Anime, Manga]
+
+TOKEN_RE = re.compile(r"\w+")
+CJK_RE = re.compile(r"[぀-ヿ㐀-鿿가-힯]")
+
+
+def tokenize(text):
+    """Split text into lowercase terms, CJK runs become bigrams."""
+    terms = []
+    for token in TOKEN_RE.findall((text or "").lower()):
+        if CJK_RE.search(token) and len(token) > 2:
+            terms.extend(token[i:i + 2] for i in range(len(token) - 1))
+        else:
+            terms.append(token)
+    return terms
+
+
+class BaseSearchBackend:
+    """Interface shared by the search backends."""
+
+    def search(self, query, models=None, limit=20):
+        """Return a list of (model, pk, score) ordered by relevance."""
+        raise NotImplementedError
+
+    def update(self, instance):
+        """Index instance, or drop it when it is no longer available."""
+
+    def remove(self, instance):
+        """Drop instance from the index."""
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    Search backend based on a weighted tsvector and a GIN index.
+
+    The expression matches the indexes of get_search_indexes(), so
+    PostgreSQL answers from them.
+    """
+
+    config = SEARCH_CONFIG
+
+    @staticmethod
+    def get_vector():
+        return get_search_vector()
+
+    def search(self, query, models=None, limit=20):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        search_query = SearchQuery(query, config=self.config)
+        results = []
+        for model in models or SEARCH_MODELS:
+            queryset = (
+                model.objects.get_available()
+                .annotate(document=self.get_vector())
+                .filter(document=search_query)
+                .annotate(score=SearchRank(self.get_vector(), search_query))
+                .order_by("-score", "pk")
+                .values_list("pk", "score")[:limit]
+            )
+            results.extend((model, pk, score) for pk, score in queryset)
+        results.sort(key=lambda result: -result[2])
+        return results[:limit]
+
+
+class InvertedIndexBackend(BaseSearchBackend):
+    """
+    Search backend keeping an in-memory inverted index per process.
+
+    Used where tsvector is not available (SQLite). The index is built
+    lazily on first search, patched by model signals and rebuilt when the
+    model versions change (see apps.utils.versions), which picks up bulk
+    writes and the writes of other processes. Scores are the sum of
+    idf * field weight over the query terms, and every term must match,
+    like ``plainto_tsquery``.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.loaded = False
+        self.versions = None
+        self.postings = defaultdict(dict)
+        self.documents = {}
+
+    @staticmethod
+    def get_versions():
+        return get_versions([get_model_key(model) for model in SEARCH_MODELS])
+
+    @staticmethod
+    def get_terms(values):
+        """Return {term: weight} of the searched fields in values."""
+        terms = defaultdict(float)
+        for field, weight in SEARCH_FIELDS:
+            for term in set(tokenize(values.get(field))):
+                terms[term] = max(terms[term], WEIGHTS[weight])
+        return terms
+
+    def build(self):
+        """Return (postings, documents) read from the database."""
+        postings, documents = defaultdict(dict), {}
+        fields = [field for field, _ in SEARCH_FIELDS]
+        for model in SEARCH_MODELS:
+            rows = (
+                model.objects.get_available()
+                .values_list("pk", *fields)
+                .iterator(chunk_size=2000)
+            )
+            for pk, *values in rows:
+                terms = self.get_terms(dict(zip(fields, values)))
+                for term, weight in terms.items():
+                    postings[term][(model, pk)] = weight
+                documents[(model, pk)] = list(terms)
+        return postings, documents
+
+    def load(self):
+        versions = self.get_versions()
+        if self.loaded and versions == self.versions:
+            return
+        with self.lock:
+            if self.loaded and versions == self.versions:
+                return
+            self.postings, self.documents = self.build()
+            self.versions = versions
+            self.loaded = True
+
+    def add(self, model, pk, values):
+        key = (model, pk)
+        self.discard(key)
+        terms = self.get_terms(values)
+        for term, weight in terms.items():
+            self.postings[term][key] = weight
+        self.documents[key] = list(terms)
+
+    def discard(self, key):
+        for term in self.documents.pop(key, ()):
+            postings = self.postings[term]
+            postings.pop(key, None)
+            if not postings:
+                del self.postings[term]
+
+    def update(self, instance):
+        if not self.loaded:
+            return
+        with self.lock:
+            if instance.available:
+                values = {field: getattr(instance, field) for field, _ in SEARCH_FIELDS}
+                self.add(type(instance), instance.pk, values)
+            else:
+                self.discard((type(instance), instance.pk))
+
+    def remove(self, instance):
+        if not self.loaded:
+            return
+        with self.lock:
+            self.discard((type(instance), instance.pk))
+
+    def search(self, query, models=None, limit=20):
+        self.load()
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        with self.lock:
+            postings = [self.postings.get(term, {}) for term in terms]
+            if not all(postings):
+                return []
+            total = len(self.documents)
+            postings.sort(key=len)
+            scores = {}
+            for key in postings[0]:
+                if models and key[0] not in models:
+                    continue
+                if all(key in other for other in postings[1:]):
+                    scores[key] = sum(
+                        math.log(1 + total / len(posting)) * posting[key]
+                        for posting in postings
+                    )
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], str(item[0][1])))
+        return [(model, pk, score) for (model, pk), score in ranked[:limit]]
+
+
+_backend = None
+
+
+def get_backend():
+    """Return the search backend for the default database."""
+    global _backend
+    if _backend is None:
+        path = getattr(settings, "SEARCH_BACKEND", None)
+        if path:
+            _backend = import_string(path)()
+        elif connection.vendor == "postgresql":
+            _backend = PostgresSearchBackend()
+        else:
+            _backend = InvertedIndexBackend()
+    return _backend
@@ -0,0 +1,31 @@
+"""Indexes for Search App."""
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import connection
+
+# (field, weight) pairs, weights mirror the tsvector A/B labels
+SEARCH_FIELDS = [("name", "A"), ("name_rom", "B"), ("name_jpn", "B")]
+SEARCH_CONFIG = "simple"
+
+
+def get_search_vector():
+    """Return the weighted tsvector searched by PostgresSearchBackend."""
+    vector = None
+    for field, weight in SEARCH_FIELDS:
+        part = SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def get_search_indexes(prefix):
+    """
+    Return the GIN index over get_search_vector() of a model, if any.
+
+    Only PostgreSQL has tsvector. Other databases search with the in-memory
+    InvertedIndexBackend and get no index, so their migrations have no
+    operation for it and run no statement.
+    """
+    if connection.vendor != "postgresql":
+        return []
+    return [GinIndex(get_search_vector(), name=f"{prefix}_search_idx")]
@@ -0,0 +1,17 @@
+"""Routers for Search App."""
+
+from django.urls import path
+
+from .views import SearchView, AutocompleteView
+
+
+urlpatterns = [
+    path(
+        "api/v1/search/",
+        SearchView.as_view(),
+    ),
+    path(
+        "api/v1/autocomplete/",
+        AutocompleteView.as_view(),
+    ),
+]
@@ -0,0 +1,29 @@
+"""Schemas for Search App."""
+
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+
+
+search_schemas = {
+    "get": extend_schema(
+        summary="Search Animes and Mangas",
+        description="Full-text search over name, name_jpn and name_rom.",
+        parameters=[
+            OpenApiParameter("q", str, description="Search terms."),
+            OpenApiParameter("type", str, enum=["anime", "manga"]),
+            OpenApiParameter("limit", int, description="Max results (50)."),
+        ],
+    ),
+}
+
+
+autocomplete_schemas = {
+    "get": extend_schema(
+        summary="Autocomplete Titles",
+        description="Suggest anime, manga and studio names starting with q.",
+        parameters=[
+            OpenApiParameter("q", str, description="Typed prefix."),
+            OpenApiParameter("type", str, enum=["anime", "manga", "studio"]),
+            OpenApiParameter("limit", int, description="Max results (10)."),
+        ],
+    ),
+}
@@ -0,0 +1,22 @@
+"""Serializers for Search App."""
+
+from rest_framework import serializers
+
+from apps.contents.serializers import AnimeMinimumSerializer, MangaMinimumSerializer
+
+
+class SearchResultSerializer(serializers.Serializer):
+    """Serializer for a search result."""
+
+    type = serializers.CharField()
+    score = serializers.FloatField()
+    item = serializers.SerializerMethodField()
+
+    serializers_by_type = {
+        "anime": AnimeMinimumSerializer,
+        "manga": MangaMinimumSerializer,
+    }
+
+    def get_item(self, obj) -> dict:
+        serializer = self.serializers_by_type[obj["type"]]
+        return serializer(obj["item"], context=self.context).data
@@ -0,0 +1,25 @@
+"""Signals for Search App."""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .autocomplete import AUTOCOMPLETE_FIELDS, prefix_index
+from .backends import SEARCH_MODELS, get_backend
+
+
+@receiver(post_save)
+def update_search_index(sender, instance, **kwargs):
+    """Signal keeps the search indexes in sync on save and soft delete."""
+    if sender in SEARCH_MODELS:
+        get_backend().update(instance)
+    if sender in AUTOCOMPLETE_FIELDS:
+        prefix_index.update(instance)
+
+
+@receiver(post_delete)
+def remove_from_search_index(sender, instance, **kwargs):
+    """Signal removes deleted instances from the search indexes."""
+    if sender in SEARCH_MODELS:
+        get_backend().remove(instance)
+    if sender in AUTOCOMPLETE_FIELDS:
+        prefix_index.remove(instance)
@@ -0,0 +1,64 @@
+"""Tests for Autocomplete in Search App."""
+
+from django.test import TestCase
+
+from apps.categories.models import Studio
+from apps.contents.models import Anime
+from apps.search.autocomplete import PrefixIndex
+
+
+class PrefixIndexTestCase(TestCase):
+    """Test cases for PrefixIndex."""
+
+    def setUp(self):
+        self.index = PrefixIndex()
+        self.naruto = Anime.objects.create(
+            name="Naruto", name_jpn="ナルト", popularity=2
+        )
+        self.shippuden = Anime.objects.create(
+            name="Naruto: Shippuden", name_jpn="ナルト 疾風伝", popularity=1
+        )
+        self.studio = Studio.objects.create(name="Nut", name_jpn="ナット")
+
+    def names(self, query, **kwargs):
+        return [entry["name"] for entry in self.index.query(query, **kwargs)]
+
+    def test_prefix_ordered_by_popularity(self):
+        """Test matches are ordered by popularity, studios last."""
+        self.assertEqual(self.names("n"), ["Naruto: Shippuden", "Naruto", "Nut"])
+        self.assertEqual(self.names("naru", limit=1), ["Naruto: Shippuden"])
+
+    def test_inner_words_and_other_names(self):
+        """Test words inside a name and japanese names are matched."""
+        self.assertEqual(self.names("shipp"), ["Naruto: Shippuden"])
+        self.assertEqual(self.names("ナル"), ["Naruto: Shippuden", "Naruto"])
+
+    def test_type_filter(self):
+        """Test results can be limited by type."""
+        self.assertEqual(self.names("n", types=["studio"]), ["Nut"])
+
+    def test_type_filter_past_the_memoized_matches(self):
+        """Test studios are found when over 100 titles share the prefix."""
+        Anime.objects.bulk_create(
+            Anime(
+                name=f"Nana {index}",
+                name_jpn=f"ナナ {index}",
+                name_rom=f"Nana {index}",
+                popularity=index + 3,
+            )
+            for index in range(120)
+        )
+        self.assertEqual(len(self.names("n", limit=200)), 100)
+        self.assertEqual(self.names("n", types=["studio"]), ["Nut"])
+
+    def test_incremental_update(self):
+        """Test saves patch the loaded index, memoized prefixes included."""
+        self.assertEqual(self.names("b"), [])
+        boruto = Anime.objects.create(name="Boruto", name_jpn="ボルト", popularity=3)
+        self.index.update(boruto)
+        self.assertEqual(self.names("b"), ["Boruto"])
+
+        self.naruto.available = False
+        self.naruto.save()
+        self.index.update(self.naruto)
+        self.assertEqual(self.names("n"), ["Naruto: Shippuden", "Nut"])
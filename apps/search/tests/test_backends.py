@@ -0,0 +1,74 @@
+"""Tests for Backends in Search App."""
+
+from django.test import TestCase
+
+from apps.contents.models import Anime, Manga
+from apps.search.backends import InvertedIndexBackend, tokenize
+from apps.utils.versions import bump
+
+
+class InvertedIndexBackendTestCase(TestCase):
+    """Test cases for InvertedIndexBackend."""
+
+    def setUp(self):
+        self.backend = InvertedIndexBackend()
+        self.berserk = Anime.objects.create(
+            name="Berserk", name_jpn="剣風伝奇ベルセルク", name_rom="Kenpuu Denki Berserk"
+        )
+        self.golden = Anime.objects.create(
+            name="Berserk: The Golden Age Arc",
+            name_jpn="ベルセルク 黄金時代篇",
+            name_rom="Berserk Ougon Jidai-hen",
+        )
+        self.manga = Manga.objects.create(
+            name="Berserk Manga", name_jpn="ベルセルク", chapters=364
+        )
+
+    def keys(self, results):
+        return [(model, pk) for model, pk, _ in results]
+
+    def test_tokenize(self):
+        """Test latin terms are lowercased and CJK runs become bigrams."""
+        self.assertEqual(tokenize("Golden Age-Arc"), ["golden", "age", "arc"])
+        self.assertEqual(tokenize("黄金時代"), ["黄金", "金時", "時代"])
+
+    def test_search_all_terms_must_match(self):
+        """Test results contain every query term."""
+        results = self.backend.search("golden berserk")
+        self.assertEqual(self.keys(results), [(Anime, self.golden.pk)])
+
+    def test_search_name_rom_and_model_filter(self):
+        """Test name_rom is searchable and results can be limited by model."""
+        results = self.backend.search("kenpuu")
+        self.assertEqual(self.keys(results), [(Anime, self.berserk.pk)])
+        results = self.backend.search("berserk", models=[Anime])
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(model is Anime for model, _, _ in results))
+
+    def test_search_japanese_name(self):
+        """Test name_jpn is searchable."""
+        results = self.backend.search("黄金時代")
+        self.assertEqual(self.keys(results), [(Anime, self.golden.pk)])
+
+    def test_index_follows_save_and_soft_delete(self):
+        """Test saves and soft deletes update the loaded index."""
+        self.backend.load()
+        self.golden.name = "Berserk: Silver Age"
+        self.golden.save()
+        self.backend.update(self.golden)
+        self.assertEqual(self.backend.search("golden age"), [])
+        self.assertEqual(len(self.backend.search("silver")), 1)
+
+        self.golden.available = False
+        self.golden.save()
+        self.backend.update(self.golden)
+        self.assertEqual(self.backend.search("silver"), [])
+
+    def test_index_follows_bulk_writes(self):
+        """Test writes without signals show up once the versions change."""
+        self.backend.load()
+        Anime.objects.filter(pk=self.golden.pk).update(name="Berserk: Silver Age")
+        self.assertEqual(len(self.backend.search("golden age")), 1)
+        bump(Anime, [self.golden.pk])
+        self.assertEqual(self.backend.search("golden age"), [])
+        self.assertEqual(self.keys(self.backend.search("silver")), [(Anime, self.golden.pk)])
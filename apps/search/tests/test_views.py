@@ -0,0 +1,37 @@
+"""Tests for Views in Search App."""
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.contents.models import Anime
+from apps.search import backends
+
+
+class SearchViewTestCase(TestCase):
+    """Test cases for SearchView."""
+
+    def setUp(self):
+        backends._backend = backends.InvertedIndexBackend()
+        self.client = APIClient()
+        self.anime = Anime.objects.create(name="Chained Soldier", name_jpn="魔都精兵のスレイブ")
+
+    def test_search(self):
+        """Test matching titles are returned with their type and score."""
+        response = self.client.get("/api/v1/search/", {"q": "soldier"})
+        self.assertEqual(response.status_code, 200)
+        result = response.data["results"][0]
+        self.assertEqual(result["type"], "anime")
+        self.assertEqual(result["item"]["id"], str(self.anime.pk))
+
+    def test_index_stays_in_sync(self):
+        """Test the signal handlers keep the index up to date."""
+        self.client.get("/api/v1/search/", {"q": "soldier"})
+        self.anime.available = False
+        self.anime.save()
+        response = self.client.get("/api/v1/search/", {"q": "soldier"})
+        self.assertEqual(response.data["results"], [])
+
+    def test_missing_query(self):
+        """Test q is required."""
+        response = self.client.get("/api/v1/search/")
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,100 @@
+"""Views for Search App."""
+
+from django.utils.translation import gettext as _
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_spectacular.utils import extend_schema_view
+
+from apps.contents.models import Anime, Manga
+from .autocomplete import prefix_index
+from .backends import get_backend
+from .serializers import SearchResultSerializer
+from .schemas import search_schemas, autocomplete_schemas
+
+
+@extend_schema_view(**search_schemas)
+class SearchView(APIView):
+    """
+    View for searching animes and mangas by title.
+
+    Endpoints:
+    - GET /api/v1/search/?q=
+    """
+
+    models = {"anime": Anime, "manga": Manga}
+    default_limit = 20
+    max_limit = 50
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        return max(1, min(limit, self.max_limit))
+
+    def get(self, request):
+        """Return the titles matching q ordered by relevance."""
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response(
+                {"detail": _("The 'q' parameter is required.")},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        search_type = request.query_params.get("type")
+        models = [self.models[search_type]] if search_type in self.models else None
+        hits = get_backend().search(query, models=models, limit=self.get_limit(request))
+
+        instances = {}
+        for model in {model for model, _, _ in hits}:
+            pks = [pk for hit_model, pk, _ in hits if hit_model is model]
+            instances.update(
+                ((model, obj.pk), obj)
+                for obj in model.objects.filter(pk__in=pks).only("id", "name", "image")
+            )
+
+        results = [
+            {
+                "type": model._meta.model_name,
+                "score": score,
+                "item": instances[(model, pk)],
+            }
+            for model, pk, score in hits
+            if (model, pk) in instances
+        ]
+        serializer = SearchResultSerializer(
+            results, many=True, context={"request": request}
+        )
+        return Response({"results": serializer.data}, status=status.HTTP_200_OK)
+
+
+@extend_schema_view(**autocomplete_schemas)
+class AutocompleteView(APIView):
+    """
+    View for suggesting titles while typing, served from memory.
+
+    Endpoints:
+    - GET /api/v1/autocomplete/?q=
+    """
+
+    types = ["anime", "manga", "studio"]
+    max_limit = 10
+
+    def get(self, request):
+        """Return the most popular names with a word starting with q."""
+        try:
+            limit = int(request.query_params.get("limit", self.max_limit))
+        except ValueError:
+            limit = self.max_limit
+        types = [t for t in request.query_params.getlist("type") if t in self.types]
+        suggestions = prefix_index.query(
+            request.query_params.get("q", ""),
+            types=types,
+            limit=max(1, min(limit, self.max_limit)),
+        )
+        results = [
+            {"id": entry["id"], "type": entry["type"], "name": entry["name"]}
+            for entry in suggestions
+        ]
+        return Response({"results": results}, status=status.HTTP_200_OK)
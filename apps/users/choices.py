@@ -1,7 +1,7 @@
 """Choices for Contents App."""
 
 from django.db.models import TextChoices
-from django.utils.translation import gettext as _
+from django.utils.translation import gettext_lazy as _
 
 
 class RoleChoices(TextChoices):
@@ -0,0 +1,697 @@
+"""Cache backends for Utils App."""
+
+import bisect
+import hashlib
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.dispatch import Signal
+from django_redis.exceptions import ConnectionInterrupted
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+# Errors meaning the cache server is unreachable, not a bad call.
+CONNECTION_ERRORS = (
+    ConnectionInterrupted,
+    RedisConnectionError,
+    RedisTimeoutError,
+    OSError,
+)
+
+# Process-wide state of the backends by (class, LOCATION), with the pid
+# that made it. Django creates backends once per thread, so the LRU,
+# subscriber and breaker of an alias must not live on the instances.
+shared_states = {}
+shared_states_lock = threading.Lock()
+
+# Sent with alias and failures when a ResilientCache breaker opens.
+breaker_tripped = Signal()
+# Sent with alias and downtime (seconds) when it closes again.
+breaker_recovered = Signal()
+
+
+def get_redis(backend):
+    """Return the redis client behind a cache backend, None if not redis."""
+    if hasattr(backend, "get_redis"):
+        return backend.get_redis()
+    client = getattr(backend, "client", None)
+    get_client = getattr(client, "get_client", None)
+    return get_client(write=True) if get_client else None
+
+
+def publish_messages(backend, channel, messages):
+    """
+    Publish messages on channel with the redis client behind a backend.
+
+    Backends with their own publish_messages() (ResilientCache) decide
+    whether and where to send them; without redis nothing is sent.
+    """
+    if hasattr(backend, "publish_messages"):
+        backend.publish_messages(channel, messages)
+        return
+    redis = get_redis(backend)
+    if redis is None:
+        return
+    for message in messages:
+        redis.publish(channel, message)
+
+
+def get_shared_state(key, factory):
+    """
+    Return the state of key in this process, made by factory on first use.
+
+    States are made again in forked children, where the threads they may
+    have started do not exist.
+    """
+    pid = os.getpid()
+    entry = shared_states.get(key)
+    if entry is None or entry[0] != pid:
+        with shared_states_lock:
+            entry = shared_states.get(key)
+            if entry is None or entry[0] != pid:
+                entry = shared_states[key] = (pid, factory())
+    return entry[1]
+
+
+def estimate_size(value):
+    """Return a rough size in bytes of value, without pickling it."""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(key) + estimate_size(item) for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class LocalLRU:
+    """Thread-safe LRU of (expiry, value, size) bounded by entries and bytes."""
+
+    def __init__(self, max_entries, max_size):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.max_item_size = max_size // 8
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, default=MISSING):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return default
+            if entry[0] <= time.monotonic():
+                self.pop(key)
+                return default
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, timeout):
+        size = estimate_size(value)
+        with self.lock:
+            self.pop(key)
+            if timeout <= 0 or size > self.max_item_size:
+                return
+            self.entries[key] = (time.monotonic() + timeout, value, size)
+            self.size += size
+            while len(self.entries) > self.max_entries or self.size > self.max_size:
+                self.size -= self.entries.popitem(last=False)[1][2]
+
+    def delete(self, key):
+        with self.lock:
+            self.pop(key)
+
+    def pop(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+
+class TwoTierState:
+    """LRU, node id and invalidation subscriber of a TwoTierCache alias."""
+
+    def __init__(self, max_entries, max_size):
+        self.local = LocalLRU(max_entries, max_size)
+        self.node = uuid.uuid4().hex
+        self.subscriber = None
+        self.lock = threading.Lock()
+
+
+class TwoTierCache(BaseCache):
+    """
+    Per-process LRU in front of another cache alias (LOCATION).
+
+    Reads are served from process memory for up to LOCAL_TIMEOUT seconds,
+    writes go to both tiers. When the remote cache is django_redis, every
+    write is published on CHANNEL and a subscriber thread drops the key
+    from the other processes, so they stay coherent within the pub/sub
+    latency; LOCAL_TIMEOUT bounds staleness if a message is lost. Behind
+    a ResilientCache, messages go through its breaker, and the subscriber
+    retries with a backoff of up to MAX_RETRY_DELAY seconds. Locks
+    taken with ``add()`` and counters always go to the remote cache.
+    Cached objects are shared between threads and must not be mutated.
+    The LRU and subscriber are shared by the instances of every thread.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self.alias = location
+        self.local_timeout = options.get("LOCAL_TIMEOUT", 60)
+        self.channel = options.get("CHANNEL", "cache:invalidate")
+        self.max_entries = options.get("MAX_ENTRIES", 10000)
+        self.max_size = options.get("MAX_SIZE", 64 * 1024 * 1024)
+        self.max_retry_delay = options.get("MAX_RETRY_DELAY", 60)
+
+    @property
+    def state(self):
+        return get_shared_state(
+            (TwoTierCache, self.alias),
+            lambda: TwoTierState(self.max_entries, self.max_size),
+        )
+
+    @property
+    def local(self):
+        return self.state.local
+
+    @property
+    def node(self):
+        return self.state.node
+
+    @property
+    def remote(self):
+        return caches[self.alias]
+
+    def get_redis(self):
+        return get_redis(self.remote)
+
+    def get_local_timeout(self, timeout):
+        timeout = self.get_backend_timeout(timeout)
+        if timeout is None:
+            return self.local_timeout
+        return min(timeout - time.time(), self.local_timeout)
+
+    def subscribe(self):
+        state = self.state
+        if state.subscriber is not None:
+            return
+        with state.lock:
+            if state.subscriber is None and self.get_redis() is not None:
+                state.subscriber = threading.Thread(
+                    target=self.listen, name="cache-invalidation", daemon=True
+                )
+                state.subscriber.start()
+
+    def listen(self):
+        delay = 1
+        while True:
+            redis = self.get_redis()
+            if redis is None:
+                # The remote cache is down (see ResilientCache).
+                time.sleep(1)
+                continue
+            try:
+                pubsub = redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                delay = 1
+                # Messages may have been missed while disconnected.
+                self.local.clear()
+                for message in pubsub.listen():
+                    self.invalidate(message["data"])
+            except Exception as error:
+                logger.warning(
+                    "Cache invalidation subscriber failed, retrying in %d s: %s",
+                    delay,
+                    error,
+                )
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+
+    def invalidate(self, data):
+        if isinstance(data, bytes):
+            data = data.decode()
+        node, _, key = data.partition(":")
+        if node == self.node:
+            return
+        if key == "*":
+            self.local.clear()
+        else:
+            self.local.delete(key)
+
+    def publish(self, *keys):
+        messages = [f"{self.node}:{key}" for key in keys]
+        try:
+            publish_messages(self.remote, self.channel, messages)
+        except Exception as error:
+            logger.warning("Cache invalidation could not be published: %s", error)
+
+    def get(self, key, default=None, version=None):
+        self.subscribe()
+        local_key = self.make_and_validate_key(key, version=version)
+        value = self.local.get(local_key)
+        if value is not MISSING:
+            return value
+        value = self.remote.get(key, MISSING, version=version)
+        if value is MISSING:
+            return default
+        self.local.set(local_key, value, self.local_timeout)
+        return value
+
+    def get_many(self, keys, version=None):
+        self.subscribe()
+        found, missing = {}, []
+        for key in keys:
+            value = self.local.get(self.make_and_validate_key(key, version=version))
+            if value is MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+        if missing:
+            values = self.remote.get_many(missing, version=version)
+            for key, value in values.items():
+                local_key = self.make_and_validate_key(key, version=version)
+                self.local.set(local_key, value, self.local_timeout)
+            found.update(values)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        self.remote.set(key, value, self.get_remote_timeout(timeout), version=version)
+        self.local.set(local_key, value, self.get_local_timeout(timeout))
+        self.publish(local_key)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.remote.set_many(
+            data, self.get_remote_timeout(timeout), version=version
+        )
+        local_timeout = self.get_local_timeout(timeout)
+        local_keys = []
+        for key, value in data.items():
+            local_key = self.make_and_validate_key(key, version=version)
+            local_keys.append(local_key)
+            if key not in failed:
+                self.local.set(local_key, value, local_timeout)
+        self.publish(*local_keys)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.remote.add(
+            key, value, self.get_remote_timeout(timeout), version=version
+        )
+        if added:
+            local_key = self.make_and_validate_key(key, version=version)
+            self.local.delete(local_key)
+            self.publish(local_key)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.remote.touch(key, self.get_remote_timeout(timeout), version=version)
+
+    def delete(self, key, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        self.local.delete(local_key)
+        deleted = self.remote.delete(key, version=version)
+        self.publish(local_key)
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        local_keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        for local_key in local_keys:
+            self.local.delete(local_key)
+        self.remote.delete_many(keys, version=version)
+        self.publish(*local_keys)
+
+    def has_key(self, key, version=None):
+        return self.get(key, MISSING, version=version) is not MISSING
+
+    def incr(self, key, delta=1, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        value = self.remote.incr(key, delta, version=version)
+        self.local.delete(local_key)
+        self.publish(local_key)
+        return value
+
+    def clear(self):
+        self.local.clear()
+        self.remote.clear()
+        self.publish("*")
+
+    def close(self, **kwargs):
+        self.remote.close(**kwargs)
+
+    def get_remote_timeout(self, timeout):
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+
+class ShardedCache(BaseCache):
+    """
+    Spread keys across the cache aliases listed in LOCATION.
+
+    Keys are placed on a consistent hash ring where each alias owns
+    VIRTUAL_NODES points, so adding or removing an alias only moves the
+    keys of its share of the ring and losing a node only loses its keys.
+    Points are derived from the alias names, not their order. Each node
+    applies its own KEY_PREFIX, VERSION and TIMEOUT.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self.aliases = sorted(
+            location.split(",") if isinstance(location, str) else location
+        )
+        virtual_nodes = params.get("OPTIONS", {}).get("VIRTUAL_NODES", 160)
+        self.ring = sorted(
+            (self.hash(f"{alias}#{index}"), alias)
+            for alias in self.aliases
+            for index in range(virtual_nodes)
+        )
+        self.points = [point for point, _ in self.ring]
+
+    @staticmethod
+    def hash(value):
+        return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], "big")
+
+    def get_alias(self, key, version=None):
+        point = self.hash(self.make_and_validate_key(key, version=version))
+        index = bisect.bisect(self.points, point) % len(self.points)
+        return self.ring[index][1]
+
+    def get_node(self, key, version=None):
+        return caches[self.get_alias(key, version=version)]
+
+    def group(self, keys, version=None):
+        """Return {alias: keys} of keys."""
+        groups = {}
+        for key in keys:
+            groups.setdefault(self.get_alias(key, version=version), []).append(key)
+        return groups
+
+    def get_redis(self):
+        # Invalidation messages only need one node everybody listens to.
+        return get_redis(caches[self.aliases[0]])
+
+    def publish_messages(self, channel, messages):
+        publish_messages(caches[self.aliases[0]], channel, messages)
+
+    def get(self, key, default=None, version=None):
+        return self.get_node(key, version).get(key, default, version=version)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.get_node(key, version).set(key, value, timeout, version=version)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.get_node(key, version).add(key, value, timeout, version=version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.get_node(key, version).touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        return self.get_node(key, version).delete(key, version=version)
+
+    def has_key(self, key, version=None):
+        return self.get_node(key, version).has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        return self.get_node(key, version).incr(key, delta, version=version)
+
+    def get_many(self, keys, version=None):
+        values = {}
+        for alias, group in self.group(keys, version).items():
+            values.update(caches[alias].get_many(group, version=version))
+        return values
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = []
+        for alias, group in self.group(data, version).items():
+            failed += caches[alias].set_many(
+                {key: data[key] for key in group}, timeout, version=version
+            ) or []
+        return failed
+
+    def delete_many(self, keys, version=None):
+        for alias, group in self.group(keys, version).items():
+            caches[alias].delete_many(group, version=version)
+
+    def clear(self):
+        for alias in self.aliases:
+            caches[alias].clear()
+
+    def close(self, **kwargs):
+        for alias in self.aliases:
+            caches[alias].close(**kwargs)
+
+
+class CircuitBreaker:
+    """
+    Closed, open after threshold consecutive failures, half-open after
+    reset_timeout seconds where a single trial call decides.
+    """
+
+    def __init__(self, threshold, reset_timeout):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+        self.lock = threading.Lock()
+
+    @property
+    def closed(self):
+        return self.opened_at is None
+
+    def allow(self):
+        """Return whether a call may go to the protected service."""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.trial or time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.trial = True
+            return True
+
+    def success(self):
+        """Record a success, return the downtime if it closed the breaker."""
+        with self.lock:
+            self.failures = 0
+            if self.opened_at is None:
+                return None
+            downtime = time.monotonic() - self.opened_at
+            self.opened_at, self.trial = None, False
+            return downtime
+
+    def failure(self):
+        """Record a failure, return whether it opened the breaker."""
+        with self.lock:
+            self.failures += 1
+            if self.trial:
+                self.opened_at, self.trial = time.monotonic(), False
+                return False
+            if self.opened_at is None and self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+
+class ResilientState:
+    """Breaker, fallback cache and dirty keys of a ResilientCache alias."""
+
+    def __init__(self, alias, threshold, reset_timeout, max_dirty):
+        self.breaker = CircuitBreaker(threshold, reset_timeout)
+        self.fallback = LocMemCache(
+            f"resilient:{alias}", {"OPTIONS": {"MAX_ENTRIES": max_dirty}}
+        )
+        self.dirty = set()
+        self.stats = {"failures": 0, "fallbacks": 0, "trips": 0, "recoveries": 0}
+        self.lock = threading.Lock()
+
+
+class ResilientCache(BaseCache):
+    """
+    Circuit breaker in front of another cache alias (LOCATION).
+
+    Connection errors and timeouts (set SOCKET_TIMEOUT and
+    SOCKET_CONNECT_TIMEOUT low on the django_redis alias) count as
+    failures; FAILURE_THRESHOLD consecutive ones open the breaker and calls
+    go to a bounded LocMemCache (FALLBACK_MAX_ENTRIES) instead of waiting
+    on the socket. After RESET_TIMEOUT seconds one call tries the remote
+    cache again. Keys written while the remote cache was unreachable are
+    deleted from it on recovery, so stale versions are not served. Trips
+    and recoveries are logged, counted in ``stats`` and sent as the
+    breaker_tripped and breaker_recovered signals. The breaker, fallback
+    and dirty keys are shared by the instances of every thread.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self.alias = location
+        self.threshold = options.get("FAILURE_THRESHOLD", 5)
+        self.reset_timeout = options.get("RESET_TIMEOUT", 30)
+        self.max_dirty = options.get("FALLBACK_MAX_ENTRIES", 1000)
+
+    @property
+    def state(self):
+        return get_shared_state(
+            (ResilientCache, self.alias),
+            lambda: ResilientState(
+                self.alias, self.threshold, self.reset_timeout, self.max_dirty
+            ),
+        )
+
+    @property
+    def breaker(self):
+        return self.state.breaker
+
+    @property
+    def fallback(self):
+        return self.state.fallback
+
+    @property
+    def stats(self):
+        return self.state.stats
+
+    def count(self, name):
+        state = self.state
+        with state.lock:
+            state.stats[name] += 1
+
+    @property
+    def remote(self):
+        return caches[self.alias]
+
+    def get_redis(self):
+        return get_redis(self.remote) if self.breaker.closed else None
+
+    def publish_messages(self, channel, messages):
+        """Publish through the breaker, nothing is sent while it is open."""
+        redis = get_redis(self.remote)
+        if redis is None or not self.breaker.allow():
+            return
+        try:
+            for message in messages:
+                redis.publish(channel, message)
+        except CONNECTION_ERRORS as error:
+            self.on_failure(error)
+        else:
+            self.on_success()
+
+    def call(self, method, keys, *args, **kwargs):
+        """
+        Call method on the remote cache, on the fallback if it is down.
+
+        keys are the (key, version) pairs a write changes.
+        """
+        if self.breaker.allow():
+            try:
+                result = getattr(self.remote, method)(*args, **kwargs)
+            except CONNECTION_ERRORS as error:
+                self.on_failure(error)
+            except Exception:
+                # The server answered, e.g. incr() of a missing key.
+                self.on_success()
+                raise
+            else:
+                self.on_success()
+                return result
+        self.count("fallbacks")
+        if keys:
+            self.mark_dirty(keys)
+        return getattr(self.fallback, method)(*args, **kwargs)
+
+    def mark_dirty(self, keys):
+        state = self.state
+        with state.lock:
+            if len(state.dirty) + len(keys) <= self.max_dirty:
+                state.dirty.update(keys)
+                return
+        logger.warning(
+            "Cache %s: too many writes during the outage, some may be stale.",
+            self.alias,
+        )
+
+    def on_failure(self, error):
+        self.count("failures")
+        if self.breaker.failure():
+            self.count("trips")
+            logger.warning("Cache %s unreachable, breaker open: %s", self.alias, error)
+            breaker_tripped.send(
+                sender=self.__class__, alias=self.alias, failures=self.breaker.failures
+            )
+
+    def on_success(self):
+        downtime = self.breaker.success()
+        if downtime is None:
+            return
+        self.count("recoveries")
+        logger.warning("Cache %s recovered after %.1f s.", self.alias, downtime)
+        state = self.state
+        with state.lock:
+            dirty, state.dirty = state.dirty, set()
+        versions = {}
+        for key, version in dirty:
+            versions.setdefault(version, []).append(key)
+        try:
+            for version, keys in versions.items():
+                self.remote.delete_many(keys, version=version)
+        except CONNECTION_ERRORS:
+            with state.lock:
+                state.dirty |= dirty
+        self.fallback.clear()
+        breaker_recovered.send(sender=self.__class__, alias=self.alias, downtime=downtime)
+
+    def get(self, key, default=None, version=None):
+        return self.call("get", (), key, default, version=version)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.call("set", [(key, version)], key, value, timeout, version=version)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.call("add", [(key, version)], key, value, timeout, version=version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.call("touch", [(key, version)], key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        return self.call("delete", [(key, version)], key, version=version)
+
+    def has_key(self, key, version=None):
+        return self.call("has_key", (), key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        return self.call("incr", [(key, version)], key, delta, version=version)
+
+    def get_many(self, keys, version=None):
+        return self.call("get_many", (), keys, version=version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        keys = [(key, version) for key in data]
+        return self.call("set_many", keys, data, timeout, version=version)
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        dirty = [(key, version) for key in keys]
+        return self.call("delete_many", dirty, keys, version=version)
+
+    def clear(self):
+        self.fallback.clear()
+        return self.call("clear", ())
+
+    def close(self, **kwargs):
+        self.remote.close(**kwargs)
@@ -0,0 +1,458 @@
+"""Caching for Utils App."""
+
+import copy
+import hashlib
+import math
+import random
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.http import HttpResponse, QueryDict
+from django.urls import Resolver404, resolve
+from django.utils.cache import (
+    cc_delim_re,
+    get_cache_key,
+    get_conditional_response,
+    has_vary_header,
+    learn_cache_key,
+    patch_response_headers,
+    patch_vary_headers,
+)
+from django.utils.http import http_date
+from django.utils.text import compress_string
+
+from rest_framework.generics import GenericAPIView
+from rest_framework.settings import api_settings
+
+from .overlays import apply_overlay, get_overlay
+from .versions import (
+    get_etag,
+    get_row_key,
+    get_version,
+    get_version_keys,
+    get_versions,
+    get_view_version,
+    get_view_version_keys,
+)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+KEY_PREFIX = "response"
+# Vary headers left out of keys. Django suffixes keys with the language
+# LocaleMiddleware negotiated, so "en-US,en;q=0.9" and "en" share one.
+KEY_IGNORED_HEADERS = {"accept-language"}
+# Requested page sizes are rounded up to one of these.
+PAGE_SIZE_BUCKETS = (5, 10, 15, 25, 50, 100)
+PAGINATOR_PARAMS = (
+    "page_query_param",
+    "page_size_query_param",
+    "cursor_query_param",
+    "limit_query_param",
+    "offset_query_param",
+    "ordering_param",
+)
+FILTER_PARAMS = ("search_param", "ordering_param")
+# Encoded variants stored with entries, by preference. Shorter bodies are
+# not worth it (same limit as GZipMiddleware).
+ENCODINGS = ("br", "gzip")
+ENCODE_MIN_LENGTH = 200
+# conditional sets these on each request, overlaid ones differ.
+VALIDATOR_HEADERS = ("ETag", "Last-Modified")
+
+
+def make_key(name, *parts, models=(), rows=()):
+    """
+    Return a cache key tagged with models and (model, pk) rows.
+
+    The key embeds the latest version of its tags, so bumping any of them
+    makes the entry unreachable and it simply expires.
+    """
+    version = get_version(models, rows)
+    return ":".join([name, *map(str, parts), repr(version)])
+
+
+def make_row_keys(name, model, pks, *parts, models=()):
+    """
+    Return {pk: key} of make_key(name, *parts, pk) tagged with each row.
+
+    Keys are also tagged with models. The versions of every row are read
+    with a single get_many.
+    """
+    model_keys = get_version_keys(models)
+    row_keys = {pk: get_row_key(model, pk) for pk in pks}
+    versions = get_versions([*model_keys, *row_keys.values()])
+    shared = max((versions[key] for key in model_keys), default=0)
+    return {
+        pk: ":".join(
+            [name, *map(str, parts), str(pk), repr(max(shared, versions[row_keys[pk]]))]
+        )
+        for pk in pks
+    }
+
+
+def get_query_params(view):
+    """
+    Return the query parameters the responses of view depend on.
+
+    They are the parameters of its paginator and filter backends, the
+    format override and the names in ``view.cache_query_params``.
+    """
+    params = {api_settings.URL_FORMAT_OVERRIDE, *getattr(view, "cache_query_params", ())}
+    paginator = view.paginator
+    params.update(getattr(paginator, name, None) for name in PAGINATOR_PARAMS)
+    for backend in view.filter_backends:
+        params.update(getattr(backend, name, None) for name in FILTER_PARAMS)
+    params.discard(None)
+    return params
+
+
+def get_page_size(value, paginator):
+    """Return the bucketed page size of value, None for the default one."""
+    try:
+        size = int(value)
+    except ValueError:
+        return None
+    if size <= 0:
+        return None
+    limit = paginator.max_page_size or max(PAGE_SIZE_BUCKETS)
+    size = min(next((bucket for bucket in PAGE_SIZE_BUCKETS if bucket >= size), size), limit)
+    return None if size == paginator.page_size else size
+
+
+def normalize_query(request, view):
+    """
+    Rewrite the query string of request to its canonical form.
+
+    Parameters the view does not read are dropped, the others are sorted
+    and page sizes bucketed, so equivalent URLs are one cache entry. The
+    view runs on the same query, its links included.
+    """
+    http_request = getattr(request, "_request", request)
+    query = http_request.GET
+    params = get_query_params(view)
+    size_param = getattr(view.paginator, "page_size_query_param", None)
+    items = []
+    for name in sorted(params & query.keys()):
+        values = query.getlist(name)
+        if name == size_param:
+            size = get_page_size(values[-1], view.paginator)
+            values = [] if size is None else [size]
+        items.extend((name, value) for value in values)
+    query_string = urlencode(items)
+    if query_string != http_request.META.get("QUERY_STRING", ""):
+        http_request.META["QUERY_STRING"] = query_string
+        http_request.GET = QueryDict(query_string)
+
+
+def get_key_request(request, cookies):
+    """Return a copy of request keeping only the cookies named in cookies."""
+    key_request = copy.copy(getattr(request, "_request", request))
+    key_request.META = {
+        **key_request.META,
+        "HTTP_COOKIE": "; ".join(
+            f"{name}={request.COOKIES[name]}"
+            for name in sorted(cookies)
+            if name in request.COOKIES
+        ),
+    }
+    return key_request
+
+
+def get_lookup_request(request):
+    """
+    Return the key request of an anonymous GET, with a normalized query.
+
+    Query strings are normalized for the viewset the path resolves to, as
+    cache_response stores them (see normalize_query()), on a copy so the
+    view still reads the original parameters.
+    """
+    key_request = get_key_request(request, ())
+    if not request.META.get("QUERY_STRING"):
+        return key_request
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return key_request
+    view_class = getattr(match.func, "cls", None)
+    if view_class is not None and issubclass(view_class, GenericAPIView):
+        normalize_query(key_request, view_class(**match.func.initkwargs))
+    return key_request
+
+
+def should_refresh(entry, version, beta=1.0, now=None):
+    """
+    Return whether a cached entry must be recomputed.
+
+    Entries of an older version always are. Fresh ones are recomputed
+    early with a probability growing as expiry gets closer and with the
+    time they took to compute (XFetch), so one request refills a hot key
+    before it expires instead of all of them after.
+    """
+    if entry["version"] != version:
+        return True
+    now = time.time() if now is None else now
+    return now - entry["delta"] * beta * math.log(1.0 - random.random()) >= entry["expires"]
+
+
+def is_cacheable(request, response):
+    if response.status_code != 200 or response.streaming:
+        return False
+    if "private" in response.get("Cache-Control", ""):
+        return False
+    # Same rule as cache_page for cookies set on cookie-less requests.
+    return not (
+        not request.COOKIES and response.cookies and has_vary_header(response, "Cookie")
+    )
+
+
+def wait_for_entry(request, lock, timeout):
+    """Return the entry the lock holder is computing, if it comes in time."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        time.sleep(0.05)
+        key = get_cache_key(request, KEY_PREFIX, "GET", cache=cache)
+        entry = cache.get(key) if key else None
+        if entry is not None:
+            return entry
+        if not cache.has_key(lock):
+            # Released without an entry for this variant.
+            return None
+    return None
+
+
+def get_entry(request, version, beta, lock_timeout, wait_timeout):
+    """
+    Return (entry to serve, lock to release once refilled).
+
+    No entry means the caller computes the response, holding the refill
+    lock unless waiting for another request's refill timed out.
+    """
+    key = get_cache_key(request, KEY_PREFIX, "GET", cache=cache)
+    entry = cache.get(key) if key else None
+    if entry is not None and not should_refresh(entry, version, beta):
+        return entry, None
+
+    # Variants (Vary headers) get their own lock once they are known.
+    name = key or request.build_absolute_uri()
+    lock = f"{KEY_PREFIX}.lock.{hashlib.md5(name.encode()).hexdigest()}"
+    if cache.add(lock, True, lock_timeout):
+        return None, lock
+    if entry is None:
+        entry = wait_for_entry(request, lock, wait_timeout)
+    return entry, None
+
+
+def release(lock):
+    if lock is not None:
+        cache.delete(lock)
+
+
+def learn_key(request, response, timeout):
+    """Return learn_cache_key() of response without KEY_IGNORED_HEADERS."""
+    vary = response.get("Vary")
+    if vary is None:
+        return learn_cache_key(request, response, timeout, KEY_PREFIX, cache=cache)
+    response.headers["Vary"] = ", ".join(
+        header
+        for header in cc_delim_re.split(vary)
+        if header.lower() not in KEY_IGNORED_HEADERS
+    )
+    try:
+        return learn_cache_key(request, response, timeout, KEY_PREFIX, cache=cache)
+    finally:
+        # Clients and proxies still need the full Vary header.
+        response.headers["Vary"] = vary
+
+
+def encode(content):
+    """Return {encoding: encoded content} of the variants worth storing."""
+    if len(content) < ENCODE_MIN_LENGTH:
+        return {}
+    encodings = {"gzip": compress_string(content)}
+    if brotli is not None:
+        encodings["br"] = brotli.compress(content)
+    return {name: data for name, data in encodings.items() if len(data) < len(content)}
+
+
+def get_encoding(request, encodings):
+    """Return the preferred of encodings that request accepts, or None."""
+    accepted = set()
+    for item in request.META.get("HTTP_ACCEPT_ENCODING", "").split(","):
+        name, _, params = item.partition(";")
+        try:
+            quality = float(params.strip().removeprefix("q=") or 1)
+        except ValueError:
+            continue
+        if quality > 0:
+            accepted.add(name.strip().lower())
+    return next(
+        (
+            name
+            for name in ENCODINGS
+            if name in encodings and (name in accepted or "*" in accepted)
+        ),
+        None,
+    )
+
+
+def store_entry(request, response, version, started, timeout, stale_timeout, **fields):
+    """
+    Store the rendered response with its version and compute time.
+
+    Encoded variants of the content are made once here, fields are stored
+    along (see get_cached_response()).
+    """
+    patch_response_headers(response, timeout)
+    now = time.time()
+    key = learn_key(request, response, timeout + stale_timeout)
+    entry = {
+        "version": version,
+        "expires": now + timeout,
+        "delta": now - started,
+        "status": response.status_code,
+        "headers": [item for item in response.items() if item[0] not in VALIDATOR_HEADERS],
+        "content": response.content,
+        "encodings": encode(response.content),
+        **fields,
+    }
+    cache.set(key, entry, timeout + stale_timeout)
+    if entry["encodings"]:
+        patch_vary_headers(response, ["Accept-Encoding"])
+
+
+def build_response(entry, request=None):
+    """Return the response of entry, encoded as request accepts if it can."""
+    encodings = entry.get("encodings", {})
+    encoding = get_encoding(request, encodings) if request is not None else None
+    content = encodings[encoding] if encoding else entry["content"]
+    response = HttpResponse(content, status=entry["status"])
+    for header, value in entry["headers"]:
+        response[header] = value
+    if encodings and request is not None:
+        patch_vary_headers(response, ["Accept-Encoding"])
+    if encoding:
+        response["Content-Encoding"] = encoding
+        # Other bytes than the identity body, so not its strong validator.
+        if entry.get("etag"):
+            response["ETag"] = f"W/{entry['etag']}"
+    return response
+
+
+def get_cached_response(request):
+    """
+    Return the cached response of an anonymous GET, or None.
+
+    ResponseCacheMiddleware calls it before URL resolution, so hits skip
+    DRF, authentication and throttling. Only fresh public entries are
+    served: misses, stale or XFetch picked entries and authenticated
+    requests go on to the view, which refills and overlays them.
+    """
+    if request.method != "GET" or "HTTP_AUTHORIZATION" in request.META:
+        return None
+    key = get_cache_key(get_lookup_request(request), KEY_PREFIX, "GET", cache=cache)
+    entry = cache.get(key) if key else None
+    if entry is None or not entry.get("public"):
+        return None
+    version = max(get_versions(entry["version_keys"]).values())
+    if should_refresh(entry, version):
+        return None
+
+    response = build_response(entry, request)
+    response["Content-Length"] = len(response.content)
+    if entry["etag"] is None:
+        return response
+    response.setdefault("ETag", entry["etag"])
+    response["Last-Modified"] = http_date(entry["version"])
+    return get_conditional_response(
+        request, etag=entry["etag"], last_modified=int(entry["version"]), response=response
+    )
+
+
+def cache_response(
+    timeout, stale_timeout=None, lock_timeout=30, wait_timeout=5, beta=1.0, cookies=()
+):
+    """
+    Decorator caching a viewset method, a drop-in for ``cache_page``.
+
+    Entries are stored under the same URL and Vary based keys as
+    ``cache_page`` with the version from get_view_version(), so saves and
+    soft deletes only invalidate the pages reading the changed rows. A
+    stale entry (expired, invalidated or picked by XFetch) is refilled by
+    the single request holding a ``cache.add`` lock (SET NX on Redis)
+    while the others keep getting the stale copy for up to stale_timeout
+    more seconds. Without any copy they wait for the refill for up to
+    wait_timeout seconds.
+
+    Authenticated requests to views with an ``overlay_class`` share the
+    public entry, their per-user overlay is merged at response time.
+
+    Query strings are normalized first (see normalize_query()). Keys only
+    depend on the cookies named in cookies, if the response varies on
+    Cookie at all, so anonymous and signed in visitors share public pages.
+
+    Entries keep gzip (and brotli) variants of the content, and entries
+    without cookies are served by ResponseCacheMiddleware.
+    """
+    stale_timeout = timeout if stale_timeout is None else stale_timeout
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            normalize_query(request, self)
+            key_request = get_key_request(request, cookies)
+            version = get_view_version(self, kwargs)
+            overlay = get_overlay(self, request)
+            entry, lock = get_entry(key_request, version, beta, lock_timeout, wait_timeout)
+            if entry is not None:
+                if overlay:
+                    response = apply_overlay(overlay, build_response(entry))
+                else:
+                    response = build_response(entry, request)
+                # Set once the body is final, overlays rewrite it.
+                response["Content-Length"] = len(response.content)
+                return response
+
+            started = time.time()
+            try:
+                response = method(self, request, *args, **kwargs)
+            except Exception:
+                release(lock)
+                raise
+
+            def store(response):
+                if is_cacheable(request, response):
+                    pk = kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+                    store_entry(
+                        key_request,
+                        response,
+                        version,
+                        started,
+                        timeout,
+                        stale_timeout,
+                        version_keys=get_view_version_keys(self, kwargs),
+                        # The anonymous ETag of conditional, if it applies.
+                        etag=get_etag(request, version, pk, None)
+                        if response.has_header("ETag")
+                        else None,
+                        public=not cookies,
+                    )
+                release(lock)
+                # The entry keeps the public page, the overlay is per request.
+                return apply_overlay(overlay, response) if overlay else response
+
+            # DRF responses are rendered later.
+            if getattr(response, "is_rendered", True):
+                return store(response)
+            response.add_post_render_callback(store)
+            return response
+
+        # Lets warmcache find the cached routes.
+        wrapper.cache_timeout = timeout
+        return wrapper
+
+    return decorator
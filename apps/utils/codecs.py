@@ -0,0 +1,86 @@
+"""Codecs for Utils App."""
+
+import json
+import pickle
+import zlib
+
+from django_redis.serializers.base import BaseSerializer
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK = b"M"
+JSON = b"J"
+PICKLE = b"P"
+# Lowercase headers mark zlib compressed payloads.
+COMPRESSED = {MSGPACK: b"m", JSON: b"j", PICKLE: b"p"}
+FORMATS = {value: key for key, value in COMPRESSED.items()}
+
+
+def dumps_msgpack(value):
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def loads_msgpack(data):
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def dumps_json(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def loads_json(data):
+    return json.loads(data)
+
+
+class CacheSerializer(BaseSerializer):
+    """
+    Compact django_redis serializer (the SERIALIZER option).
+
+    Values are encoded with msgpack (JSON if it is not installed) and fall
+    back to pickle for types neither supports, such as models or datetimes.
+    Payloads of COMPRESS_MIN_LENGTH bytes or more are zlib compressed. A
+    one byte header records the format, so values written by any setting
+    stay readable. Tuples come back as lists and, with JSON, dict keys as
+    strings.
+    """
+
+    def __init__(self, options):
+        super().__init__(options)
+        self.format = options.get("SERIALIZER_FORMAT", "msgpack" if msgpack else "json")
+        if self.format == "msgpack" and msgpack is None:
+            raise ImportError("SERIALIZER_FORMAT msgpack requires the msgpack package.")
+        self.min_length = options.get("COMPRESS_MIN_LENGTH", 1024)
+        self.level = options.get("COMPRESS_LEVEL", 6)
+
+    def encode(self, value):
+        """Return (header, payload) of value before compression."""
+        if self.format == "msgpack":
+            header, dumps = MSGPACK, dumps_msgpack
+        else:
+            header, dumps = JSON, dumps_json
+        try:
+            return header, dumps(value)
+        except (TypeError, ValueError, OverflowError):
+            return PICKLE, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    def dumps(self, value):
+        header, data = self.encode(value)
+        if len(data) >= self.min_length:
+            header, data = COMPRESSED[header], zlib.compress(data, self.level)
+        return header + data
+
+    def loads(self, value):
+        header, data = value[:1], value[1:]
+        if header in FORMATS:
+            header, data = FORMATS[header], zlib.decompress(data)
+        if header == MSGPACK:
+            return loads_msgpack(data)
+        if header == JSON:
+            return loads_json(data)
+        if header == PICKLE:
+            return pickle.loads(data)
+        # Written before this serializer was configured.
+        return pickle.loads(value)
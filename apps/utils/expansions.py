@@ -0,0 +1,53 @@
+"""Expansions for Utils App."""
+
+from django.contrib.contenttypes.models import ContentType
+
+from .planners import plan_queryset
+
+
+class Expansion:
+    """
+    A related resource the ``expand`` param embeds in detail responses.
+
+    Forward relations are rendered with serializer_class in place of the
+    field of the same name and joined into the detail query (see
+    ExpandMixin). To-many relations (``many=True``) are read with one
+    query each, limited to N with ``name:N``, limit by default and
+    max_limit at most.
+    """
+
+    def __init__(self, serializer_class, many=False, limit=10, max_limit=50):
+        self.serializer_class = serializer_class
+        self.many = many
+        self.limit = limit
+        self.max_limit = max_limit
+
+    def get_limit(self, value):
+        """Return the limit asked with ``name:value``, within max_limit."""
+        try:
+            limit = int(value)
+        except ValueError:
+            limit = self.limit
+        return max(0, min(limit, self.max_limit))
+
+    def get_queryset(self, instance, name):
+        return getattr(instance, name).all()
+
+    def get_data(self, instance, name, limit, context):
+        """Return the serialized rows of a to-many expansion."""
+        queryset = plan_queryset(self.get_queryset(instance, name), self.serializer_class)
+        return self.serializer_class(queryset[:limit], many=True, context=context).data
+
+
+class GenericExpansion(Expansion):
+    """Expansion of the rows pointing to the instance with a generic foreign key."""
+
+    def __init__(self, serializer_class, **kwargs):
+        super().__init__(serializer_class, many=True, **kwargs)
+
+    def get_queryset(self, instance, name):
+        model = self.serializer_class.Meta.model
+        content_type = ContentType.objects.get_for_model(instance)
+        return model._default_manager.filter(
+            content_type=content_type, object_id=instance.pk
+        )
@@ -0,0 +1,101 @@
+import time
+from timeit import repeat
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django_redis.serializers.pickle import PickleSerializer
+
+from apps.utils.backends import get_redis
+from apps.utils.codecs import CacheSerializer
+
+
+class Command(BaseCommand):
+    help = "Compare the pickle and compact cache serializers on API pages"
+
+    urls = [
+        "/api/v1/animes/",
+        "/api/v1/mangas/",
+        "/api/v1/news/",
+        "/api/v1/genres/",
+        "/api/v1/animes/popular/",
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument("urls", nargs="*", help="Pages to sample.")
+        parser.add_argument(
+            "--alias",
+            default="default",
+            help="Cache alias used for Redis memory and latency, when it is Redis.",
+        )
+        parser.add_argument("--repeat", type=int, default=200)
+
+    def handle(self, *args, **options):
+        serializers = {
+            "pickle": PickleSerializer({}),
+            "compact": CacheSerializer({}),
+        }
+        redis = get_redis(caches[options["alias"]])
+        if redis is None:
+            self.stdout.write("No Redis client, measuring encoded size and codec time.")
+
+        for name, value in self.get_samples(options["urls"] or self.urls):
+            results = {
+                codec: self.measure(redis, serializer, value, options["repeat"])
+                for codec, serializer in serializers.items()
+            }
+            (size, set_time, get_time), (new_size, new_set, new_get) = results.values()
+            self.stdout.write(
+                f"{name}: pickle {size} B, set {set_time * 1e6:.0f} us, "
+                f"get {get_time * 1e6:.0f} us | compact {new_size} B, "
+                f"set {new_set * 1e6:.0f} us, get {new_get * 1e6:.0f} us "
+                + self.style.SUCCESS(f"x{size / new_size:.2f} smaller")
+            )
+
+    def get_samples(self, urls):
+        """Yield (name, value) of cached entries and serializer data."""
+        host = next(
+            (host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"),
+            "localhost",
+        )
+        client = Client(HTTP_HOST=host)
+        for url in urls:
+            response = client.get(url)
+            if response.status_code != 200:
+                self.stdout.write(f"{url}: status {response.status_code}, skipped.")
+                continue
+            yield f"{url} entry", {
+                "version": time.time(),
+                "expires": time.time(),
+                "delta": 0.01,
+                "status": response.status_code,
+                "headers": list(response.items()),
+                "content": response.content,
+            }
+            if getattr(response, "data", None) is not None:
+                yield f"{url} data", response.data
+
+    def measure(self, redis, serializer, value, number):
+        """Return (bytes, set seconds, get seconds) of value."""
+        key = "benchcache"
+
+        if redis is None:
+            data = serializer.dumps(value)
+            set_time = min(repeat(lambda: serializer.dumps(value), number=number, repeat=3))
+            get_time = min(repeat(lambda: serializer.loads(data), number=number, repeat=3))
+            return len(data), set_time / number, get_time / number
+
+        def write():
+            redis.set(key, serializer.dumps(value))
+
+        def read():
+            serializer.loads(redis.get(key))
+
+        try:
+            set_time = min(repeat(write, number=number, repeat=3))
+            get_time = min(repeat(read, number=number, repeat=3))
+            size = redis.memory_usage(key)
+        finally:
+            redis.delete(key)
+        return size, set_time / number, get_time / number
@@ -0,0 +1,59 @@
+from timeit import repeat
+
+from django.conf import settings
+from django.core.management.base import CommandError
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from apps.utils.caching import brotli
+from apps.utils.middlewares import CompressionMiddleware
+from apps.utils.renderers import ORJSONRenderer
+from apps.utils.serializers import get_compiled_serializer
+from .benchserializers import Command as BenchSerializersCommand
+
+
+class Command(BenchSerializersCommand):
+    help = "Compare the json and orjson renderers and the compressed sizes of list pages"
+
+    def bench(self, rows, number):
+        renderers = {"json": JSONRenderer(), "orjson": ORJSONRenderer()}
+        middleware = CompressionMiddleware(None)
+        encodings = ["gzip", "br"] if brotli is not None else ["gzip"]
+        host = next(
+            (host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"),
+            "localhost",
+        )
+        context = {"request": Request(RequestFactory().get("/", HTTP_HOST=host))}
+
+        for model, serializer_class in self.serializers:
+            compiled = get_compiled_serializer(serializer_class)
+            values = list(compiled.values(model.objects.order_by("pk"))[:rows])
+            if not values:
+                self.stdout.write(f"{serializer_class.__name__}: no rows, skipped.")
+                continue
+            data = {"count": len(values), "results": compiled.to_representation(values, context)}
+
+            contents = {name: renderer.render(data) for name, renderer in renderers.items()}
+            if len(set(contents.values())) > 1:
+                raise CommandError(f"{serializer_class.__name__} renders differ.")
+            json_time, orjson_time = (
+                min(repeat(lambda: renderer.render(data), number=number, repeat=3)) / number
+                for renderer in renderers.values()
+            )
+            content = contents["orjson"]
+            sizes = []
+            for encoding in encodings:
+                size = len(middleware.compress(content, encoding))
+                seconds = min(
+                    repeat(lambda: middleware.compress(content, encoding), number=number, repeat=3)
+                )
+                sizes.append(f"{encoding} {size} B ({seconds / number * 1000:.3f} ms)")
+
+            self.stdout.write(
+                f"{serializer_class.__name__} ({len(values)} rows): "
+                f"json {json_time * 1000:.3f} ms, orjson {orjson_time * 1000:.3f} ms "
+                + self.style.SUCCESS(f"x{json_time / orjson_time:.2f}")
+                + f" | {len(content)} B, "
+                + ", ".join(sizes)
+            )
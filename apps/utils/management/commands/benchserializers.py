@@ -0,0 +1,121 @@
+from timeit import repeat
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from apps.contents.models import Anime, Manga
+from apps.contents.serializers import AnimeListSerializer, MangaListSerializer
+from apps.news.models import New
+from apps.news.serializers import NewListSerializer
+from apps.utils.planners import plan_queryset
+from apps.utils.serializers import get_compiled_serializer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Compare DRF and compiled serializers on list pages"
+
+    serializers = [
+        (Anime, AnimeListSerializer),
+        (Manga, MangaListSerializer),
+        (New, NewListSerializer),
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=25, help="Rows per page.")
+        parser.add_argument("--repeat", type=int, default=200)
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Create this many throwaway rows per model, rolled back at the end.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                if options["seed"]:
+                    self.seed(options["seed"])
+                self.bench(options["rows"], options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, count):
+        user = get_user_model().objects.create(
+            email="bench@bench.local", username="bench"
+        )
+        Anime.objects.bulk_create(
+            Anime(
+                name=f"Bench {i}",
+                name_jpn=f"ベンチ {i}",
+                name_rom=f"Bench {i}",
+                image=f"animes/{i}.jpg",
+            )
+            for i in range(count)
+        )
+        Manga.objects.bulk_create(
+            Manga(name=f"Bench {i}", name_jpn=f"ベンチ {i}", name_rom=f"Bench {i}", chapters=i)
+            for i in range(count)
+        )
+        New.objects.bulk_create(
+            New(
+                author=user,
+                title=f"Bench {i}",
+                description="...",
+                content="...",
+                source="https://example.com",
+                image=f"news/{i}.jpg",
+            )
+            for i in range(count)
+        )
+
+    def bench(self, rows, number):
+        renderer = JSONRenderer()
+        host = next(
+            (host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"),
+            "localhost",
+        )
+        context = {"request": Request(RequestFactory().get("/", HTTP_HOST=host))}
+
+        for model, serializer_class in self.serializers:
+            compiled = get_compiled_serializer(serializer_class)
+            if compiled is None:
+                raise CommandError(f"{serializer_class.__name__} is not compilable.")
+
+            queryset = model.objects.order_by("pk")
+            instances = list(plan_queryset(queryset, serializer_class)[:rows])
+            values = list(compiled.values(queryset)[:rows])
+            if not instances:
+                self.stdout.write(f"{serializer_class.__name__}: no rows, skipped.")
+                continue
+
+            expected = serializer_class(instances, many=True, context=context).data
+            data = compiled.to_representation(values, context)
+            if renderer.render(data) != renderer.render(expected):
+                raise CommandError(f"{serializer_class.__name__} output differs.")
+
+            # Model instantiation is part of the cost being measured.
+            def drf():
+                page = list(plan_queryset(queryset, serializer_class)[:rows])
+                serializer_class(page, many=True, context=context).data
+
+            def fast():
+                page = list(compiled.values(queryset)[:rows])
+                compiled.to_representation(page, context)
+
+            drf_time = min(repeat(drf, number=number, repeat=3)) / number
+            fast_time = min(repeat(fast, number=number, repeat=3)) / number
+            self.stdout.write(
+                f"{serializer_class.__name__} ({len(instances)} rows): "
+                f"drf {drf_time * 1000:.3f} ms, compiled {fast_time * 1000:.3f} ms, "
+                + self.style.SUCCESS(f"x{drf_time / fast_time:.2f}")
+            )
@@ -0,0 +1,155 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Count, F, Value
+from django.test import Client
+from django.urls import URLResolver, get_resolver, reverse
+
+from apps.contents.models import Anime, Manga
+
+
+def get_routes(patterns):
+    """Yield the viewset URL patterns of patterns, recursively."""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from get_routes(pattern.url_patterns)
+        elif getattr(pattern.callback, "actions", None):
+            yield pattern
+
+
+def get_popular(model, top):
+    """Return the pks of the top rows, by popularity or by number of titles."""
+    fields = {field.name for field in model._meta.get_fields()}
+    queryset = model._default_manager.all()
+    if "available" in fields:
+        queryset = queryset.filter(available=True)
+    if "popularity" in fields:
+        queryset = queryset.order_by(F("popularity").asc(nulls_last=True), "pk")
+    else:
+        titles = sum(
+            (
+                Count(relation.name, distinct=True)
+                for relation in model._meta.related_objects
+                if relation.related_model in (Anime, Manga)
+            ),
+            Value(0),
+        )
+        queryset = queryset.annotate(titles=titles).order_by("-titles", "pk")
+    return list(queryset.values_list("pk", flat=True)[:top])
+
+
+class Command(BaseCommand):
+    help = "Fill the response cache with the cached API routes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=20,
+            help="Warm detail routes for the N most popular rows of each model.",
+        )
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument(
+            "--host",
+            help="Public host the cache keys are built for (default: ALLOWED_HOSTS[0]).",
+        )
+        parser.add_argument("--secure", action="store_true", help="Warm https keys.")
+        parser.add_argument(
+            "--target",
+            help="Base URL of a running server, e.g. http://127.0.0.1:8000 "
+            "(default: render through the test client).",
+        )
+        parser.add_argument(
+            "--language",
+            action="append",
+            help="Accept-Language to warm, repeatable (default: none sent).",
+        )
+        parser.add_argument("--timeout", type=float, default=30)
+
+    def handle(self, *args, **options):
+        self.host = options["host"] or next(
+            (host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"),
+            "localhost",
+        )
+        self.secure = options["secure"]
+        self.target = options["target"]
+        self.timeout = options["timeout"]
+
+        jobs = [
+            (url, language)
+            for url in self.get_urls(options["top"])
+            for language in options["language"] or [None]
+        ]
+        started = time.time()
+        warmed = 0
+        with ThreadPoolExecutor(options["workers"]) as executor:
+            for url, status, elapsed in executor.map(lambda job: self.fetch(*job), jobs):
+                warmed += status == 200
+                self.stdout.write(f"{status} {url} ({elapsed * 1000:.0f} ms)")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Warmed {warmed} of {len(jobs)} pages in {time.time() - started:.1f} s."
+            )
+        )
+
+    def get_urls(self, top):
+        """Yield the URLs of the GET routes decorated with cache_response."""
+        seen = set()
+        for pattern in get_routes(get_resolver().url_patterns):
+            view = pattern.callback
+            method = getattr(view.cls, view.actions.get("get", ""), None)
+            kwargs = set(pattern.pattern.regex.groupindex)
+            if (
+                not getattr(method, "cache_timeout", None)
+                or "format" in kwargs
+                or pattern.name in seen
+            ):
+                continue
+            seen.add(pattern.name)
+            if not kwargs:
+                yield reverse(pattern.name)
+                continue
+            lookup = view.cls.lookup_url_kwarg or view.cls.lookup_field
+            if kwargs == {lookup}:
+                model = view.cls.serializer_class.Meta.model
+                for pk in get_popular(model, top):
+                    yield reverse(pattern.name, kwargs={lookup: pk})
+
+    def fetch(self, url, language):
+        """Request url, return (url, status, seconds)."""
+        started = time.time()
+        if self.target:
+            status = self.fetch_target(url, language)
+        else:
+            status = self.fetch_client(url, language)
+        return url, status, time.time() - started
+
+    def fetch_client(self, url, language):
+        headers = {"HTTP_ACCEPT_LANGUAGE": language} if language else {}
+        try:
+            client = Client(HTTP_HOST=self.host, **headers)
+            return client.get(url, secure=self.secure).status_code
+        finally:
+            # Each worker thread opens its own connections.
+            connections.close_all()
+
+    def fetch_target(self, url, language):
+        headers = {"Host": self.host}
+        if language:
+            headers["Accept-Language"] = language
+        if self.secure:
+            headers["X-Forwarded-Proto"] = "https"
+        request = Request(self.target.rstrip("/") + url, headers=headers)
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                response.read()
+                return response.status
+        except HTTPError as error:
+            return error.code
+        except URLError as error:
+            return str(error.reason)
@@ -1,8 +1,14 @@
 """Middlewares for Utils App."""
 
+import gzip
+import zlib
+
+from django.utils.cache import patch_vary_headers
 from rest_framework.response import Response
 from rest_framework import status
 
+from .caching import ENCODE_MIN_LENGTH, ENCODINGS, brotli, get_cached_response, get_encoding
+
 
 class CensorshipMiddleware:
     """Middleware for censoring words in requests."""
@@ -31,3 +37,125 @@ class CensorshipMiddleware:
 
         response = self.get_response(request)
         return response
+
+
+class ResponseCacheMiddleware:
+    """
+    Middleware serving the cached API pages of anonymous GETs.
+
+    Hits are answered before URL resolution, from the bytes (and encoded
+    variants) stored by ``cache_response``. It goes after LocaleMiddleware,
+    as keys depend on the negotiated language.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = get_cached_response(request)
+        if response is None:
+            response = self.get_response(request)
+        return response
+
+
+class CompressionMiddleware:
+    """
+    Middleware compressing responses in the encoding Accept-Encoding
+    prefers (brotli when it is installed, or gzip).
+
+    Only API payloads are compressed: HTML pages (admin, browsable API)
+    carry CSRF tokens next to reflected input, which compression would
+    expose to BREACH. Bodies under min_length bytes, marked no-transform
+    or already encoded (such as the variants ResponseCacheMiddleware
+    serves) are left as is. Streaming responses are flushed chunk by
+    chunk, so clients of NDJSON exports get each chunk as soon as the
+    view yields it. It goes near the top, before the middlewares reading
+    or writing the body.
+    """
+
+    min_length = ENCODE_MIN_LENGTH
+    content_types = ("application/json", "application/x-ndjson")
+    gzip_level = 6
+    # Per response, so much faster than the maximum used for cache entries.
+    brotli_quality = 4
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.encodings = ENCODINGS if brotli is not None else ("gzip",)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.is_compressible(response):
+            return response
+
+        patch_vary_headers(response, ["Accept-Encoding"])
+        encoding = get_encoding(request, self.encodings)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = self.compress_stream(response, encoding)
+            response.headers.pop("Content-Length", None)
+        else:
+            content = self.compress(response.content, encoding)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response["Content-Length"] = str(len(content))
+
+        # The encoded body is not byte equal to the original one.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = f"W/{etag}"
+        response["Content-Encoding"] = encoding
+        return response
+
+    def is_compressible(self, response):
+        if response.has_header("Content-Encoding"):
+            return False
+        if "no-transform" in response.get("Cache-Control", ""):
+            return False
+        if not response.get("Content-Type", "").startswith(self.content_types):
+            return False
+        return response.streaming or len(response.content) >= self.min_length
+
+    def compress(self, content, encoding):
+        if encoding == "br":
+            return brotli.compress(content, quality=self.brotli_quality)
+        return gzip.compress(content, compresslevel=self.gzip_level, mtime=0)
+
+    def get_compressor(self, encoding):
+        """Return (compress, finish) functions of a stream flushed per chunk."""
+        if encoding == "br":
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            return (
+                lambda chunk: compressor.process(chunk) + compressor.flush(),
+                compressor.finish,
+            )
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+        return (
+            lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH),
+            compressor.flush,
+        )
+
+    def compress_stream(self, response, encoding):
+        compress, finish = self.get_compressor(encoding)
+        chunks = response.streaming_content
+
+        if response.is_async:
+
+            async def stream_async():
+                async for chunk in chunks:
+                    if chunk:
+                        yield compress(chunk)
+                yield finish()
+
+            return stream_async()
+
+        def stream():
+            for chunk in chunks:
+                if chunk:
+                    yield compress(chunk)
+            yield finish()
+
+        return stream()
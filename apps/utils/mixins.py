@@ -1,13 +1,25 @@
 """Mixins for Utils App."""
 
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.http import Http404
-from django.core.cache import cache
 from django.utils.text import slugify
-from django.utils.translation import gettext as _
+from django.utils.translation import get_language, gettext as _
+from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework import status
 
+from .caching import make_row_keys
+from .planners import get_query_plan, plan_queryset
+from .serializers import (
+    get_compiled_serializer,
+    get_expanded_serializer,
+    get_field_names,
+    get_sparse_serializer,
+)
+
 
 class SlugMixin(models.Model):
     """Mixin providing slug functionality for models."""
@@ -36,7 +48,6 @@ class LogicalDeleteMixin:
             instance = self.get_object()
             instance.available = False
             instance.save()
-            cache.clear()
             return Response(status=status.HTTP_204_NO_CONTENT)
         except Http404:
             return Response(
@@ -48,3 +59,265 @@ class LogicalDeleteMixin:
                 {"detail": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class QueryPlannerMixin:
+    """
+    Mixin adding the joins, prefetches and columns the serializer needs.
+
+    The plan is derived from the active serializer field tree, so nested
+    serializers cannot bring back N+1 queries. Columns are only narrowed
+    with only() on safe methods, writes always load the full row.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        # Sub-list actions serialize another model than the view queryset.
+        if serializer_class.Meta.model is not queryset.model:
+            return queryset
+        return self.plan_queryset(queryset, serializer_class)
+
+    def plan_queryset(self, queryset, serializer_class):
+        """Return queryset optimized for serializer_class."""
+        columns = self.request.method in SAFE_METHODS
+        return plan_queryset(queryset, serializer_class, columns=columns)
+
+
+class CompiledListMixin:
+    """
+    Mixin rendering read-only list pages straight from values() rows.
+
+    Serializers that CompiledSerializer cannot handle go through the
+    regular DRF path, so the response body is the same either way.
+    """
+
+    def get_compiled_serializer(self, serializer_class):
+        """Return the CompiledSerializer of serializer_class, or None."""
+        return get_compiled_serializer(serializer_class)
+
+    def list(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer(self.get_serializer_class())
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = compiled.values(self.filter_queryset(self.get_queryset()))
+        context = self.get_serializer_context()
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            data = compiled.to_representation(page, context)
+            return self.get_paginated_response(data)
+        return Response(compiled.to_representation(queryset, context))
+
+    def get_paginated_list(self, queryset, serializer_class):
+        """Return the paginated response of a sub-list action."""
+        compiled = self.get_compiled_serializer(serializer_class)
+        if compiled is None:
+            page = self.paginate_queryset(queryset)
+            data = serializer_class(page, many=True).data
+            return self.get_paginated_response(data)
+
+        page = self.paginate_queryset(compiled.values(queryset))
+        return self.get_paginated_response(compiled.to_representation(page))
+
+
+class SparseFieldsMixin:
+    """
+    Mixin pruning read responses to the ``fields`` or ``exclude`` params.
+
+    Both take comma separated top-level field names, unknown names are
+    ignored. The pruned serializer class replaces the view's one in the
+    query planner and CompiledSerializer too, so columns only the dropped
+    fields read are not selected. Goes before QueryPlannerMixin and
+    CompiledListMixin.
+    """
+
+    fields_query_param = "fields"
+    exclude_query_param = "exclude"
+    # Read by cache_response to key the pages.
+    cache_query_params = (fields_query_param, exclude_query_param)
+
+    def get_requested_fields(self, param):
+        values = self.request.query_params.getlist(param)
+        return {name.strip() for value in values for name in value.split(",")}
+
+    def get_sparse_serializer_class(self, serializer_class):
+        """Return serializer_class pruned to the requested fields."""
+        if self.request is None or self.request.method not in SAFE_METHODS:
+            return serializer_class
+        names = get_field_names(serializer_class)
+        fields = names & self.get_requested_fields(self.fields_query_param) or names
+        fields -= self.get_requested_fields(self.exclude_query_param)
+        if fields == names:
+            return serializer_class
+        return get_sparse_serializer(serializer_class, frozenset(fields))
+
+    def get_serializer(self, *args, **kwargs):
+        serializer_class = self.get_sparse_serializer_class(self.get_serializer_class())
+        kwargs.setdefault("context", self.get_serializer_context())
+        return serializer_class(*args, **kwargs)
+
+    def plan_queryset(self, queryset, serializer_class):
+        serializer_class = self.get_sparse_serializer_class(serializer_class)
+        return super().plan_queryset(queryset, serializer_class)
+
+    def get_compiled_serializer(self, serializer_class):
+        serializer_class = self.get_sparse_serializer_class(serializer_class)
+        return super().get_compiled_serializer(serializer_class)
+
+    def get_paginated_list(self, queryset, serializer_class):
+        serializer_class = self.get_sparse_serializer_class(serializer_class)
+        return super().get_paginated_list(queryset, serializer_class)
+
+
+class ExpandMixin:
+    """
+    Mixin embedding related resources in detail responses with ``expand``.
+
+    ``?expand=studio,genres,reviews:5`` names entries of ``expansions``
+    ({name: Expansion}), unknown ones are ignored. Forward relations are
+    nested into the serializer class, so the query planner joins them into
+    the detail query; to-many ones cost one limited query each. Goes
+    before SparseFieldsMixin.
+    """
+
+    expand_query_param = "expand"
+    expansions = {}
+
+    def get_expansions(self):
+        """Return {name: (expansion, limit)} of the requested expansions."""
+        request = self.request
+        if request is None or request.method not in SAFE_METHODS:
+            return {}
+        if self.action != "retrieve":
+            return {}
+        expansions = {}
+        for value in request.query_params.getlist(self.expand_query_param):
+            for item in value.split(","):
+                name, separator, limit = item.strip().partition(":")
+                if name in self.expansions:
+                    expansion = self.expansions[name]
+                    expansions[name] = (expansion, expansion.get_limit(limit))
+        return expansions
+
+    def get_expanded_models(self):
+        """Return the models the requested expansions read, for versions."""
+        models = set()
+        for expansion, limit in self.get_expansions().values():
+            serializer_class = expansion.serializer_class
+            models |= get_query_plan(serializer_class, serializer_class.Meta.model).get_models()
+        return models
+
+    def get_sparse_serializer_class(self, serializer_class):
+        serializer_class = super().get_sparse_serializer_class(serializer_class)
+        expansions = self.get_expansions()
+        if not expansions:
+            return serializer_class
+        nested = tuple(
+            sorted(
+                (name, expansion.serializer_class)
+                for name, (expansion, limit) in expansions.items()
+                if not expansion.many
+            )
+        )
+        # To-many expansions replace the fields of the same name.
+        dropped = frozenset(
+            name for name, (expansion, limit) in expansions.items() if expansion.many
+        )
+        return get_expanded_serializer(serializer_class, nested, dropped)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        data = self.get_serializer(instance).data
+        context = self.get_serializer_context()
+        for name, (expansion, limit) in self.get_expansions().items():
+            if expansion.many:
+                data[name] = expansion.get_data(instance, name, limit, context)
+        return Response(data)
+
+
+class BatchRetrieveMixin:
+    """
+    Mixin adding a ``batch`` action retrieving many rows by id at once.
+
+    ``GET .../batch/?ids=a,b`` returns ``{"results": [...]}`` with the
+    detail representation of each id in request order, ids that do not
+    exist get ``{"id": ..., "detail": "Not found."}``. Rows are cached one
+    by one (see make_row_keys()), so a request costs one get_many and one
+    planned ``pk__in`` query for the misses.
+    """
+
+    batch_max_ids = 100
+    batch_cache_timeout = 60 * 60 * 2
+
+    def get_batch_ids(self):
+        """Return the requested pks, raise ValidationError on bad ones."""
+        pk_field = self.get_queryset().model._meta.pk
+        values = self.request.query_params.getlist("ids")
+        return [
+            pk_field.to_python(item.strip())
+            for value in values
+            for item in value.split(",")
+            if item.strip()
+        ]
+
+    def get_batch_rows(self, pks):
+        """Return {pk: data} of the pks that exist, from cache or database."""
+        serializer_class = self.get_serializer_class()
+        model = self.get_queryset().model
+        plan = get_query_plan(serializer_class, model)
+        keys = make_row_keys(
+            "batch",
+            model,
+            pks,
+            serializer_class.__name__,
+            get_language(),
+            # Image URLs are absolute.
+            self.request.build_absolute_uri("/"),
+            models=plan.get_models() - {model},
+        )
+        cached = cache.get_many(keys.values())
+        rows = {pk: cached[key] for pk, key in keys.items() if key in cached}
+
+        missing = [pk for pk in pks if pk not in rows]
+        if missing:
+            queryset = self.get_queryset().filter(pk__in=missing)
+            instances = list(plan_queryset(queryset, serializer_class))
+            context = self.get_serializer_context()
+            data = serializer_class(instances, many=True, context=context).data
+            found = {instance.pk: row for instance, row in zip(instances, data)}
+            cache.set_many(
+                {keys[pk]: row for pk, row in found.items()}, self.batch_cache_timeout
+            )
+            rows.update(found)
+        return rows
+
+    @action(detail=False, methods=["get"], url_path="batch")
+    def batch(self, request, *args, **kwargs):
+        """
+        Action retrieves many rows by id.
+
+        Endpoints:
+        - GET /api/v1/{resource}/batch/?ids={id},{id}
+        """
+        try:
+            pks = self.get_batch_ids()
+        except ValidationError:
+            return Response(
+                {"detail": _("Invalid ids.")}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if not pks:
+            return Response(
+                {"detail": _("No ids were given.")}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(pks) > self.batch_max_ids:
+            return Response(
+                {"detail": _("At most %(count)d ids are allowed.") % {"count": self.batch_max_ids}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        rows = self.get_batch_rows(list(dict.fromkeys(pks)))
+        results = [
+            rows.get(pk, {"id": str(pk), "detail": _("Not found.")}) for pk in pks
+        ]
+        return Response({"results": results})
@@ -0,0 +1,47 @@
+"""Overlays for Utils App."""
+
+import orjson
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from .renderers import dumps
+
+
+def get_overlay(view, request):
+    """
+    Return the overlay of ``view.overlay_class`` for request, or None.
+
+    Overlays add per-user state to the items of a public page: only
+    authenticated requests for pages of a model the overlay supports
+    get one.
+    """
+    overlay_class = getattr(view, "overlay_class", None)
+    if overlay_class is None or not request.user.is_authenticated:
+        return None
+    model = view.get_serializer_class().Meta.model
+    if model not in overlay_class.models:
+        return None
+    return overlay_class(model, request.user)
+
+
+def apply_overlay(overlay, response):
+    """Merge overlay into the items of a rendered JSON page, in place."""
+    if response.status_code != 200 or not response.get("Content-Type", "").startswith(
+        "application/json"
+    ):
+        return response
+    data = orjson.loads(response.content)
+    items = data.get("results") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return response
+
+    ids = [item["id"] for item in items if isinstance(item, dict) and "id" in item]
+    states = overlay.get_states(ids)
+    for item in items:
+        if isinstance(item, dict) and "id" in item:
+            item[overlay.field] = states.get(item["id"], overlay.default)
+    response.content = dumps(data)
+    if response.has_header("Content-Length"):
+        response["Content-Length"] = len(response.content)
+    patch_cache_control(response, private=True)
+    patch_vary_headers(response, ["Authorization"])
+    return response
@@ -1,6 +1,14 @@
 """Pagination for Utils App."""
 
-from rest_framework.pagination import PageNumberPagination
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class SmallSetPagination(PageNumberPagination):
@@ -28,3 +36,176 @@ class LargeSetPagination(PageNumberPagination):
     page_size = 25
     page_size_query_param = "page_size"
     max_page_size = 25
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Pagination class based on a (sort key, pk) keyset.
+
+    Pages are fetched with a ``WHERE (key, pk) > (last_key, last_pk)``
+    condition instead of ``COUNT(*)`` plus ``OFFSET``, so every page costs
+    the same as the first one. Clients choose the sort key with
+    ``?ordering=`` among ``ordering_fields`` and follow the opaque
+    ``next``/``previous`` cursors.
+    """
+
+    page_size = 25
+    page_size_query_param = "page_size"
+    max_page_size = 25
+    ordering_param = "ordering"
+    ordering_fields = ["popularity", "name", "pk"]
+    ordering = "pk"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.key, self.descending = self.get_ordering(request, queryset, view)
+        self.nullable = self.is_nullable(queryset, self.key)
+
+        # values() rows must carry the sort key to build the cursors.
+        fields = getattr(queryset, "_fields", ())
+        if fields and self.key != "pk" and self.key not in fields:
+            queryset = queryset.values(*fields, self.key)
+
+        self.cursor = self.decode_cursor(request, queryset.model)
+        reverse, position = self.cursor if self.cursor else (False, None)
+
+        queryset = queryset.order_by(*self.get_order_by(reverse))
+        if position is not None:
+            queryset = queryset.filter(self.get_seek_filter(reverse, *position))
+
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        has_more = len(results) > self.page_size
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        """Return the (key, descending) pair requested by the client."""
+        ordering = request.query_params.get(self.ordering_param, self.ordering)
+        if ordering.lstrip("-") not in self.ordering_fields:
+            ordering = self.ordering
+        key = ordering.lstrip("-")
+        if key != "pk" and not self.has_field(queryset, key):
+            key = "pk"
+        return key, ordering.startswith("-")
+
+    def has_field(self, queryset, name):
+        return any(field.name == name for field in queryset.model._meta.fields)
+
+    def is_nullable(self, queryset, name):
+        if name == "pk":
+            return False
+        return queryset.model._meta.get_field(name).null
+
+    def get_order_by(self, reverse):
+        """Return the ORDER BY expressions, NULL keys always go last."""
+        descending = self.descending != reverse
+        pk = "-pk" if descending else "pk"
+        if self.key == "pk":
+            return [pk]
+        if not self.nullable:
+            return [f"-{self.key}" if descending else self.key, pk]
+        nulls = {"nulls_first": True} if reverse else {"nulls_last": True}
+        key = F(self.key).desc(**nulls) if descending else F(self.key).asc(**nulls)
+        return [key, pk]
+
+    def get_seek_filter(self, reverse, value, pk):
+        """Return the condition selecting rows after (or before) a position."""
+        descending = self.descending != reverse
+        lookup = "lt" if descending else "gt"
+
+        if self.key == "pk":
+            return Q(**{f"pk__{lookup}": pk})
+
+        tie = Q(**{self.key: value, f"pk__{lookup}": pk})
+        if value is None:
+            tie = Q(**{f"{self.key}__isnull": True, f"pk__{lookup}": pk})
+            if reverse:
+                return tie | Q(**{f"{self.key}__isnull": False})
+            return tie
+
+        seek = Q(**{f"{self.key}__{lookup}": value}) | tie
+        if self.nullable and not reverse:
+            seek |= Q(**{f"{self.key}__isnull": True})
+        return seek
+
+    def get_position(self, instance):
+        if isinstance(instance, dict):
+            pk = instance.get("pk", instance.get("id"))
+            value = pk if self.key == "pk" else instance[self.key]
+        else:
+            pk = instance.pk
+            value = getattr(instance, self.key)
+        if self.key == "pk":
+            value = None
+        return [value, str(pk)]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor((False, self.get_position(self.page[-1])))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor((True, self.get_position(self.page[0])))
+
+    def encode_cursor(self, cursor):
+        payload = json.dumps(cursor, separators=(",", ":"))
+        encoded = urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request, model):
+        """Return (reverse, (value, pk)) of the cursor, converted for model."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            reverse, (value, pk) = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            pk = model._meta.pk.to_python(pk)
+            if pk is None:
+                raise ValueError("Missing pk.")
+            if self.key == "pk":
+                value = pk
+            elif value is not None:
+                value = model._meta.get_field(self.key).to_python(value)
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return bool(reverse), (value, pk)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+
+class MediumSetKeysetPagination(KeysetPagination):
+    """Keyset pagination class for medium sets of data."""
+
+    page_size = 15
+    max_page_size = 15
+
+
+class LargeSetKeysetPagination(KeysetPagination):
+    """Keyset pagination class for large sets of data."""
+
+    page_size = 25
+    max_page_size = 25
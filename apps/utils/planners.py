@@ -0,0 +1,189 @@
+"""Planners for Utils App."""
+
+import re
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from django.db.models.query import ModelIterable
+from rest_framework import serializers
+
+DISPLAY_RE = re.compile(r"^get_(\w+)_display$")
+
+
+class QueryPlan:
+    """
+    Joins, prefetches and columns a serializer needs from a model.
+
+    The plan is built by walking the serializer field tree: forward
+    relations become ``select_related`` joins, to-many relations become
+    ``Prefetch`` objects with their own plan, and plain fields are
+    collected for ``only()``. A field the planner cannot see through
+    (a property, a method field without ``Meta.query_sources``, ``str()``
+    of a relation) marks its model as complete, all columns are loaded.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.columns = {model._meta.pk.name}
+        self.complete = False
+        self.related = {}
+        self.prefetched = {}
+
+    def get_field(self, name):
+        if name == "pk":
+            return self.model._meta.pk
+        try:
+            return self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+
+    def add_source(self, parts, serializer=None):
+        """Add the dotted source parts read from this model."""
+        plan = self
+        for part in parts:
+            field = plan.get_field(part)
+            if field is None:
+                display = DISPLAY_RE.match(part)
+                if display and plan.get_field(display[1]):
+                    plan.columns.add(display[1])
+                else:
+                    plan.complete = True
+                return
+            if not field.is_relation:
+                plan.columns.add(field.name)
+                return
+            if field.related_model is None:
+                plan.complete = True
+                return
+            plan = plan.get_relation(field)
+        if serializer is None:
+            plan.complete = True
+        else:
+            plan.add_serializer(serializer)
+
+    def get_relation(self, field):
+        if field.many_to_many or field.one_to_many:
+            if field.name not in self.prefetched:
+                plan = QueryPlan(field.related_model)
+                if field.one_to_many:
+                    plan.columns.add(field.field.name)
+                self.prefetched[field.name] = plan
+            return self.prefetched[field.name]
+        self.columns.add(field.name)
+        return self.related.setdefault(field.name, QueryPlan(field.related_model))
+
+    def add_serializer(self, serializer):
+        """Add every readable field of serializer."""
+        if not isinstance(serializer, serializers.ModelSerializer):
+            self.complete = True
+            return
+
+        method_fields = False
+        for field in serializer.fields.values():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.SerializerMethodField):
+                method_fields = True
+            else:
+                self.add_field(field)
+
+        if not method_fields:
+            return
+        sources = getattr(serializer.Meta, "query_sources", None)
+        for source in sources or ():
+            self.add_source(source.split("."))
+        if sources is None:
+            self.complete = True
+
+    def add_field(self, field):
+        if field.source == "*":
+            if isinstance(field, serializers.BaseSerializer):
+                self.add_serializer(field)
+            else:
+                self.complete = True
+            return
+
+        parts = field.source.split(".")
+        if isinstance(field, serializers.ListSerializer):
+            self.add_source(parts, field.child)
+        elif isinstance(field, serializers.BaseSerializer):
+            self.add_source(parts, field)
+        elif isinstance(field, serializers.ManyRelatedField):
+            self.add_related_field(parts, field.child_relation)
+        elif isinstance(field, serializers.RelatedField):
+            self.add_related_field(parts, field)
+        else:
+            self.add_source(parts)
+
+    def add_related_field(self, parts, field):
+        if isinstance(field, serializers.SlugRelatedField):
+            self.add_source(parts + [field.slug_field])
+        elif isinstance(field, serializers.PrimaryKeyRelatedField):
+            self.add_source(parts + ["pk"])
+        else:
+            self.add_source(parts)
+
+    def get_models(self):
+        """Return the set of models this plan reads from."""
+        models = {self.model}
+        for plan in [*self.related.values(), *self.prefetched.values()]:
+            models |= plan.get_models()
+        return models
+
+    def get_select_related(self, prefix=""):
+        paths = []
+        for name, plan in self.related.items():
+            path = f"{prefix}{name}"
+            paths.append(path)
+            paths.extend(plan.get_select_related(f"{path}__"))
+        return paths
+
+    def get_prefetch_related(self, prefix=""):
+        prefetches = []
+        for name, plan in self.prefetched.items():
+            queryset = plan.apply(plan.model._base_manager.all())
+            prefetches.append(Prefetch(f"{prefix}{name}", queryset=queryset))
+        for name, plan in self.related.items():
+            prefetches.extend(plan.get_prefetch_related(f"{prefix}{name}__"))
+        return prefetches
+
+    def get_only(self, prefix=""):
+        """Return the only() paths, or None when every column is needed."""
+        if self.complete:
+            return None
+        paths = [f"{prefix}{column}" for column in self.columns]
+        for name, plan in self.related.items():
+            columns = plan.get_only(f"{prefix}{name}__")
+            if columns is not None:
+                paths.extend(columns)
+        return paths
+
+    def apply(self, queryset, columns=True):
+        """Return queryset with the planned joins, prefetches and columns."""
+        if not issubclass(queryset._iterable_class, ModelIterable):
+            return queryset
+        select_related = self.get_select_related()
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        prefetch_related = self.get_prefetch_related()
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        only = self.get_only() if columns else None
+        if only is not None:
+            queryset = queryset.only(*only)
+        return queryset
+
+
+@lru_cache(maxsize=1024)
+def get_query_plan(serializer_class, model):
+    """Return the cached QueryPlan of serializer_class over model."""
+    plan = QueryPlan(model)
+    plan.add_serializer(serializer_class())
+    return plan
+
+
+def plan_queryset(queryset, serializer_class, columns=True):
+    """Return queryset optimized for serializing with serializer_class."""
+    plan = get_query_plan(serializer_class, queryset.model)
+    return plan.apply(queryset, columns=columns)
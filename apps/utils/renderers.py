@@ -0,0 +1,44 @@
+"""Renderers for Utils App."""
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+# orjson keeps these as is; DRF escapes them to stay a JavaScript subset.
+LINE_SEPARATOR = "\u2028".encode()
+PARAGRAPH_SEPARATOR = "\u2029".encode()
+# Fallback for the types orjson does not encode.
+encode_default = JSONEncoder().default
+
+
+def dumps(data, indent=False):
+    """
+    Return data as compact UTF-8 JSON bytes.
+
+    UUIDs, dates, times and datetimes are encoded by orjson itself; other
+    types (Decimal, lazy strings, querysets...) go through DRF's encoder.
+    """
+    option = OPTIONS | orjson.OPT_INDENT_2 if indent else OPTIONS
+    content = orjson.dumps(data, default=encode_default, option=option)
+    if LINE_SEPARATOR in content or PARAGRAPH_SEPARATOR in content:
+        content = content.replace(LINE_SEPARATOR, b"\\u2028").replace(
+            PARAGRAPH_SEPARATOR, b"\\u2029"
+        )
+    return content
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encoding with orjson.
+
+    The output matches JSONRenderer with the default settings, except that
+    any requested indent is rendered as two spaces and raw datetimes (not
+    already formatted by a serializer field) keep their microseconds.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        return dumps(data, indent=bool(indent))
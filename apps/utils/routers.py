@@ -0,0 +1,13 @@
+"""Routers for Utils App."""
+
+from django.urls import path
+
+from .views import BatchView
+
+
+urlpatterns = [
+    path(
+        "api/v1/batch/",
+        BatchView.as_view(),
+    ),
+]
@@ -0,0 +1,48 @@
+"""Schemas for Utils App."""
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
+
+
+export_schemas = {
+    "get": extend_schema(
+        summary="Export Catalog",
+        description=(
+            "Stream every row as newline-delimited JSON, gzipped when the "
+            "client accepts it. With since, rows deleted after that date are "
+            'sent as {"id": ..., "deleted": true}.'
+        ),
+        parameters=[
+            OpenApiParameter(
+                "since", OpenApiTypes.DATE, description="Rows updated on or after."
+            ),
+        ],
+        responses={200: OpenApiResponse(OpenApiTypes.STR, description="NDJSON.")},
+    ),
+}
+
+
+batch_schemas = {
+    "post": extend_schema(
+        summary="Batch Requests",
+        description=(
+            'Run several GET requests of the API in one call. Send {"paths": '
+            '["/api/v1/animes/popular/", ...]} (20 at most), get {"responses": '
+            '[{"path": ..., "status": ..., "body": ...}]} in the same order.'
+        ),
+        request=OpenApiTypes.OBJECT,
+        responses={200: OpenApiResponse(OpenApiTypes.OBJECT)},
+    ),
+}
+
+
+sparse_fields_parameters = [
+    OpenApiParameter(
+        "fields",
+        OpenApiTypes.STR,
+        description="Comma separated fields to return, e.g. id,name,image.",
+    ),
+    OpenApiParameter(
+        "exclude", OpenApiTypes.STR, description="Comma separated fields to leave out."
+    ),
+]
@@ -0,0 +1,230 @@
+"""Serializers for Utils App."""
+
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.fields.files import FieldFile, FileField
+from rest_framework import serializers
+
+from .planners import DISPLAY_RE
+from .translations import get_choice_labels
+
+
+class NotCompilable(Exception):
+    """Raised when a serializer cannot be rendered from values() rows."""
+
+
+def get_model_field(model, name):
+    if name == "pk":
+        return model._meta.pk
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+class RowProxy:
+    """Attribute access over a values() row, following forward relations."""
+
+    __slots__ = ("_row", "_prefix", "_model")
+
+    def __init__(self, row, model, prefix=""):
+        self._row = row
+        self._model = model
+        self._prefix = prefix
+
+    def __getattr__(self, name):
+        field = get_model_field(self._model, name)
+        if field is None:
+            raise AttributeError(name)
+        key = f"{self._prefix}{field.name}"
+        if field.is_relation:
+            if self._row.get(key) is None:
+                return None
+            return RowProxy(self._row, field.related_model, f"{key}__")
+        return self._row[key]
+
+
+class CompiledSerializer:
+    """
+    Read-only rendering of a ModelSerializer straight from values() rows.
+
+    Columns, accessors and choice label maps are resolved once per
+    serializer class; each call only binds the fields to the request
+    context and walks the rows, so no model instance is created. Values
+    still go through each DRF field's to_representation(), and method
+    fields receive a RowProxy, so the output matches the serializer.
+    Serializers with to-many fields, ``source="*"``, properties or
+    method fields without ``Meta.query_sources`` raise NotCompilable.
+    """
+
+    def __init__(self, serializer_class, model=None):
+        self.serializer_class = serializer_class
+        self.model = model or serializer_class.Meta.model
+        self.columns = {self.model._meta.pk.name}
+        self.accessors = self.compile(serializer_class(), self.model)
+
+    def add_column(self, model, parts, prefix="", strict=True):
+        """Add the values() column of a dotted source, return its key."""
+        for index, part in enumerate(parts):
+            field = get_model_field(model, part)
+            if field is None:
+                raise NotCompilable(part)
+            key = f"{prefix}{field.name}"
+            if field.many_to_many or field.one_to_many:
+                raise NotCompilable(part)
+            if field.is_relation and index < len(parts) - 1:
+                # DRF skips the field when a nullable hop is None.
+                if strict and field.null:
+                    raise NotCompilable(part)
+                self.columns.add(key)
+                model, prefix = field.related_model, f"{key}__"
+                continue
+            if index < len(parts) - 1:
+                raise NotCompilable(part)
+            self.columns.add(key)
+            return key, field
+        raise NotCompilable(".".join(parts))
+
+    def compile(self, serializer, model, prefix=""):
+        if not isinstance(serializer, serializers.ModelSerializer):
+            raise NotCompilable(serializer)
+
+        accessors = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.SerializerMethodField):
+                sources = getattr(serializer.Meta, "query_sources", None)
+                if sources is None or prefix:
+                    raise NotCompilable(name)
+                for source in sources:
+                    self.add_column(model, source.split("."), strict=False)
+                accessors.append((name, "method", field.method_name))
+            elif isinstance(field, (serializers.ListSerializer, serializers.ManyRelatedField)):
+                raise NotCompilable(name)
+            elif isinstance(field, serializers.BaseSerializer):
+                parts = field.source.split(".")
+                key, model_field = self.add_column(model, parts, prefix)
+                if not model_field.is_relation:
+                    raise NotCompilable(name)
+                nested = self.compile(field, model_field.related_model, f"{key}__")
+                accessors.append((name, "nested", (key, nested)))
+            else:
+                accessors.append((name, "field", self.compile_field(field, model, prefix)))
+        return accessors
+
+    def compile_field(self, field, model, prefix):
+        if field.source == "*":
+            raise NotCompilable(field.field_name)
+        parts = field.source.split(".")
+        display = DISPLAY_RE.match(parts[-1])
+        if display:
+            key, model_field = self.add_column(model, parts[:-1] + [display[1]], prefix)
+            return key, model_field, None
+        key, model_field = self.add_column(model, parts, prefix)
+        if isinstance(field, serializers.RelatedField):
+            raise NotCompilable(field.field_name)
+        file_field = model_field if isinstance(model_field, FileField) else None
+        return key, None, file_field
+
+    def values(self, queryset):
+        """Return queryset as the values() rows this serializer reads."""
+        return queryset.prefetch_related(None).values(*self.columns)
+
+    def to_representation(self, rows, context=None):
+        """Return the serialized data of the values() rows."""
+        serializer = self.serializer_class(context=context or {})
+        bound = self.bind(serializer, self.accessors)
+        return [self.render(row, bound) for row in rows]
+
+    def bind(self, serializer, accessors):
+        fields = serializer.fields
+        bound = []
+        for name, kind, spec in accessors:
+            if kind == "method":
+                bound.append((name, kind, getattr(serializer, spec)))
+            elif kind == "nested":
+                key, nested = spec
+                bound.append((name, kind, (key, self.bind(fields[name], nested))))
+            else:
+                key, choices_field, file_field = spec
+                # Labels of the active language, looked up once per page.
+                labels = get_choice_labels(choices_field) if choices_field else None
+                bound.append((name, kind, (fields[name], key, labels, file_field)))
+        return bound
+
+    def render(self, row, bound):
+        data = {}
+        for name, kind, spec in bound:
+            if kind == "method":
+                data[name] = spec(RowProxy(row, self.model))
+            elif kind == "nested":
+                key, nested = spec
+                data[name] = None if row[key] is None else self.render(row, nested)
+            else:
+                field, key, choices, file_field = spec
+                value = row[key]
+                if choices is not None:
+                    value = choices.get(value, value)
+                elif file_field is not None:
+                    value = FieldFile(None, file_field, value)
+                data[name] = None if value is None else field.to_representation(value)
+        return data
+
+
+@lru_cache(maxsize=1024)
+def get_compiled_serializer(serializer_class):
+    """Return the CompiledSerializer of serializer_class, or None."""
+    try:
+        return CompiledSerializer(serializer_class)
+    except NotCompilable:
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_field_names(serializer_class):
+    """Return the names of the fields of serializer_class."""
+    return frozenset(serializer_class().fields)
+
+
+@lru_cache(maxsize=256)
+def get_sparse_serializer(serializer_class, fields):
+    """
+    Return a subclass of serializer_class rendering only the fields names.
+
+    Subclasses are cached per field set, so their query plan and
+    CompiledSerializer are built once too and only select those columns.
+    """
+
+    class SparseSerializer(serializer_class):
+        def get_fields(self):
+            return {
+                name: field
+                for name, field in super().get_fields().items()
+                if name in fields
+            }
+
+    SparseSerializer.__name__ = SparseSerializer.__qualname__ = serializer_class.__name__
+    return SparseSerializer
+
+
+@lru_cache(maxsize=256)
+def get_expanded_serializer(serializer_class, nested, dropped=frozenset()):
+    """
+    Return a subclass of serializer_class with nested and without dropped.
+
+    nested holds (name, serializer class) pairs rendered in place of, or
+    next to, the fields of serializer_class; dropped holds field names.
+    """
+
+    class ExpandedSerializer(serializer_class):
+        def get_fields(self):
+            fields = super().get_fields()
+            for name in dropped:
+                fields.pop(name, None)
+            fields.update((name, nested_class()) for name, nested_class in nested)
+            return fields
+
+    ExpandedSerializer.__name__ = ExpandedSerializer.__qualname__ = serializer_class.__name__
+    return ExpandedSerializer
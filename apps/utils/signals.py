@@ -1 +1,28 @@
 """Signals for Utilities App."""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .versions import bump
+
+
+def is_project_model(model):
+    app_config = model._meta.app_config
+    return app_config is not None and app_config.name.startswith("apps.")
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_version(sender, instance, **kwargs):
+    """Signal marks the saved or deleted row and its model as changed."""
+    if is_project_model(sender):
+        bump(sender, [instance.pk])
+
+
+@receiver(m2m_changed)
+def bump_m2m_versions(sender, instance, action, model, pk_set, **kwargs):
+    """Signal marks both sides of a changed many-to-many relation."""
+    if not action.startswith("post_") or not is_project_model(type(instance)):
+        return
+    bump(type(instance), [instance.pk])
+    bump(model, pk_set or ())
@@ -0,0 +1,338 @@
+"""Tests for Backends in Utils App."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from django_redis.exceptions import ConnectionInterrupted
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from apps.utils.backends import (
+    LocalLRU,
+    ResilientCache,
+    ShardedCache,
+    TwoTierCache,
+    breaker_recovered,
+    breaker_tripped,
+)
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "remote": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "remote",
+    },
+    # The same store, as seen by another process.
+    "remote_copy": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "remote",
+    },
+    "two_tier": {
+        "BACKEND": "apps.utils.backends.TwoTierCache",
+        "LOCATION": "remote",
+    },
+    "resilient": {
+        "BACKEND": "apps.utils.backends.ResilientCache",
+        "LOCATION": "remote",
+    },
+    **{
+        f"node_{index}": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": f"node_{index}",
+        }
+        for index in range(4)
+    },
+}
+
+
+def get_instances(alias, count=3):
+    """Return the backends of alias in count threads."""
+    instances = []
+    threads = [
+        threading.Thread(target=lambda: instances.append(caches[alias])) for _ in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return instances
+
+
+class LocalLRUTestCase(SimpleTestCase):
+    """Test cases for LocalLRU."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest unread entry is evicted past max_entries."""
+        lru = LocalLRU(max_entries=2, max_size=1024 * 1024)
+        lru.set("a", 1, 60)
+        lru.set("b", 2, 60)
+        lru.get("a")
+        lru.set("c", 3, 60)
+        self.assertEqual(lru.get("a"), 1)
+        self.assertEqual(lru.get("b", None), None)
+        self.assertEqual(lru.get("c"), 3)
+
+    def test_evicts_by_size(self):
+        """Test entries are evicted to stay within max_size bytes."""
+        lru = LocalLRU(max_entries=100, max_size=8000)
+        for key in range(10):
+            lru.set(key, "x" * 900, 60)
+        self.assertLessEqual(lru.size, 8000)
+        self.assertEqual(lru.get(0, None), None)
+        self.assertEqual(lru.get(9), "x" * 900)
+
+    def test_expires(self):
+        """Test entries are dropped after their timeout."""
+        lru = LocalLRU(max_entries=10, max_size=1024 * 1024)
+        with patch("apps.utils.backends.time.monotonic", return_value=100):
+            lru.set("a", 1, 5)
+        with patch("apps.utils.backends.time.monotonic", return_value=106):
+            self.assertEqual(lru.get("a", None), None)
+        self.assertEqual(lru.size, 0)
+
+
+@override_settings(CACHES=CACHES)
+class TwoTierCacheTestCase(SimpleTestCase):
+    """Test cases for TwoTierCache."""
+
+    def setUp(self):
+        patcher = patch.dict("apps.utils.backends.shared_states", clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.remote = caches["remote"]
+        self.remote.clear()
+        self.cache = TwoTierCache("remote", {"OPTIONS": {"LOCAL_TIMEOUT": 60}})
+
+    def test_get_served_locally(self):
+        """Test a value read once is served without the remote cache."""
+        self.remote.set("key", {"a": 1})
+        self.assertEqual(self.cache.get("key"), {"a": 1})
+        with patch.object(self.remote, "get") as get:
+            self.assertEqual(self.cache.get("key"), {"a": 1})
+        get.assert_not_called()
+
+    def test_set_and_delete_write_through(self):
+        """Test writes reach both tiers."""
+        self.cache.set("key", 1)
+        self.assertEqual(self.remote.get("key"), 1)
+        self.cache.delete("key")
+        self.assertIsNone(self.remote.get("key"))
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_get_many(self):
+        """Test get_many only asks the remote cache for missing keys."""
+        self.cache.set("a", 1)
+        self.remote.set("b", 2)
+        with patch.object(self.remote, "get_many", wraps=self.remote.get_many) as get:
+            self.assertEqual(self.cache.get_many(["a", "b", "c"]), {"a": 1, "b": 2})
+        get.assert_called_once_with(["b", "c"], version=None)
+
+    def test_add_is_not_served_locally(self):
+        """Test add() always asks the remote cache, as locks rely on it."""
+        self.cache.get("lock")
+        self.assertTrue(self.cache.add("lock", True))
+        self.assertFalse(self.cache.add("lock", True))
+        self.remote.delete("lock")
+        self.assertTrue(self.cache.add("lock", True))
+
+    def test_incr(self):
+        """Test counters are incremented remotely."""
+        self.cache.set("count", 1)
+        self.assertEqual(self.cache.incr("count"), 2)
+        self.assertEqual(self.cache.get("count"), 2)
+
+    def test_publish_and_invalidate(self):
+        """Test writes are published and other nodes drop the key."""
+        redis = MagicMock()
+        other = TwoTierCache("remote_copy", {})
+        other.set("key", 1)
+        with patch.object(self.remote, "get_redis", create=True, return_value=redis):
+            self.cache.set("key", 2)
+        (channel, message), _ = redis.publish.call_args
+        self.assertEqual(channel, "cache:invalidate")
+        self.assertEqual(other.local.get(":1:key"), 1)
+        other.invalidate(message.encode())
+        self.assertEqual(other.get("key"), 2)
+
+    def test_publish_failure_is_a_warning(self):
+        """Test unpublished invalidations log one warning, no traceback."""
+        redis = MagicMock()
+        redis.publish.side_effect = RedisConnectionError("down")
+        with patch.object(
+            self.remote, "get_redis", create=True, return_value=redis
+        ), self.assertLogs("apps.utils.backends", "WARNING") as logs:
+            self.cache.set("key", 1)
+        self.assertEqual(self.remote.get("key"), 1)
+        self.assertEqual(len(logs.records), 1)
+        self.assertIsNone(logs.records[0].exc_info)
+
+    def test_listen_backs_off(self):
+        """Test the subscriber waits longer after each failure."""
+        redis = MagicMock()
+        redis.pubsub.side_effect = [RedisConnectionError("down")] * 4 + [SystemExit]
+        with patch.object(TwoTierCache, "get_redis", return_value=redis), patch(
+            "apps.utils.backends.time.sleep"
+        ) as sleep, self.assertLogs("apps.utils.backends", "WARNING"):
+            with self.assertRaises(SystemExit):
+                TwoTierCache("remote", {"OPTIONS": {"MAX_RETRY_DELAY": 4}}).listen()
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [1, 2, 4, 4])
+
+    def test_own_messages_are_ignored(self):
+        """Test a node does not drop the keys it just wrote."""
+        self.cache.set("key", 1)
+        self.cache.invalidate(f"{self.cache.node}::1:key")
+        self.assertEqual(self.cache.local.get(":1:key"), 1)
+
+    def test_state_is_shared_by_threads(self):
+        """Test the backends of every thread share one LRU and subscriber."""
+        with patch.object(TwoTierCache, "get_redis", return_value=MagicMock()), patch.object(
+            TwoTierCache, "listen"
+        ) as listen:
+            instances = get_instances("two_tier")
+            for instance in instances:
+                instance.get("key")
+            instances[0].state.subscriber.join()
+        self.assertEqual(len({id(instance) for instance in instances}), 3)
+        self.assertEqual(len({id(instance.local) for instance in instances}), 1)
+        listen.assert_called_once()
+
+
+@override_settings(CACHES=CACHES)
+class ShardedCacheTestCase(SimpleTestCase):
+    """Test cases for ShardedCache."""
+
+    aliases = ["node_0", "node_1", "node_2"]
+    keys = [f"key:{index}" for index in range(1000)]
+
+    def setUp(self):
+        for index in range(4):
+            caches[f"node_{index}"].clear()
+        self.cache = ShardedCache(self.aliases, {})
+
+    def test_keys_are_spread(self):
+        """Test every node gets a fair share of the keys."""
+        groups = self.cache.group(self.keys)
+        self.assertEqual(set(groups), set(self.aliases))
+        for keys in groups.values():
+            self.assertGreater(len(keys), 200)
+
+    def test_adding_a_node_moves_few_keys(self):
+        """Test a new node only takes keys, about its share of them."""
+        before = {key: self.cache.get_alias(key) for key in self.keys}
+        cache = ShardedCache([*self.aliases, "node_3"], {})
+        moved = [key for key in self.keys if cache.get_alias(key) != before[key]]
+        self.assertLess(len(moved), 350)
+        self.assertTrue(all(cache.get_alias(key) == "node_3" for key in moved))
+
+    def test_order_does_not_matter(self):
+        """Test the ring only depends on the alias names."""
+        cache = ShardedCache(list(reversed(self.aliases)), {})
+        for key in self.keys[:100]:
+            self.assertEqual(cache.get_alias(key), self.cache.get_alias(key))
+
+    def test_operations(self):
+        """Test values are stored on their node only."""
+        self.cache.set_many({"a": 1, "b": 2, "c": 3})
+        self.assertEqual(self.cache.get_many(["a", "b", "c", "d"]), {"a": 1, "b": 2, "c": 3})
+        node = caches[self.cache.get_alias("a")]
+        self.assertEqual(node.get("a"), 1)
+        self.assertEqual(
+            sum(caches[alias].get("a") is not None for alias in self.aliases), 1
+        )
+        self.assertFalse(self.cache.add("a", 5))
+        self.assertEqual(self.cache.incr("a"), 2)
+        self.cache.delete_many(["a", "b"])
+        self.assertEqual(self.cache.get_many(["a", "b", "c"]), {"c": 3})
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("c"))
+
+
+@override_settings(CACHES=CACHES)
+class ResilientCacheTestCase(SimpleTestCase):
+    """Test cases for ResilientCache."""
+
+    def setUp(self):
+        patcher = patch.dict("apps.utils.backends.shared_states", clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.remote = caches["remote"]
+        self.remote.clear()
+        self.cache = ResilientCache(
+            "remote", {"OPTIONS": {"FAILURE_THRESHOLD": 2, "RESET_TIMEOUT": 30}}
+        )
+        self.down = patch.multiple(
+            self.remote,
+            get=MagicMock(side_effect=ConnectionInterrupted(None)),
+            set=MagicMock(side_effect=ConnectionInterrupted(None)),
+        )
+
+    def test_trips_and_falls_back(self):
+        """Test repeated failures open the breaker and use the fallback."""
+        tripped = MagicMock()
+        breaker_tripped.connect(tripped)
+        self.addCleanup(breaker_tripped.disconnect, tripped)
+        with self.down:
+            self.cache.set("key", 1)
+            self.assertEqual(self.cache.get("key"), 1)
+            calls = self.remote.get.call_count
+            self.assertEqual(self.cache.get("key"), 1)
+            self.assertEqual(self.remote.get.call_count, calls)
+        self.assertFalse(self.cache.breaker.closed)
+        self.assertEqual(self.cache.stats["trips"], 1)
+        tripped.assert_called_once()
+
+    def test_recovers(self):
+        """Test a successful trial closes it and purges stale keys."""
+        recovered = MagicMock()
+        breaker_recovered.connect(recovered)
+        self.addCleanup(breaker_recovered.disconnect, recovered)
+        self.remote.set("key", "stale")
+        with self.down:
+            self.cache.set("key", "new")
+            self.cache.get("other")
+        with patch("apps.utils.backends.time.monotonic", return_value=10**9):
+            self.assertIsNone(self.cache.get("other"))
+        self.assertTrue(self.cache.breaker.closed)
+        self.assertIsNone(self.cache.get("key"))
+        recovered.assert_called_once()
+
+    def test_failed_trial_reopens(self):
+        """Test a failed trial keeps the breaker open."""
+        with self.down:
+            self.cache.get("key")
+            self.cache.get("key")
+            with patch("apps.utils.backends.time.monotonic", return_value=10**9):
+                self.cache.get("key")
+                self.assertFalse(self.cache.breaker.allow())
+        self.assertFalse(self.cache.breaker.closed)
+
+    def test_errors_from_the_server_are_raised(self):
+        """Test errors that are not connection errors pass through."""
+        with self.assertRaises(ValueError):
+            self.cache.incr("missing")
+        self.assertEqual(self.cache.stats["failures"], 0)
+
+    def test_publish_goes_through_the_breaker(self):
+        """Test failed publishes trip the breaker and are then skipped."""
+        redis = MagicMock()
+        redis.publish.side_effect = RedisConnectionError("down")
+        with patch.object(self.remote, "get_redis", create=True, return_value=redis):
+            self.cache.publish_messages("channel", ["a"])
+            self.cache.publish_messages("channel", ["b"])
+            self.assertFalse(self.cache.breaker.closed)
+            self.cache.publish_messages("channel", ["c"])
+        self.assertEqual(redis.publish.call_count, 2)
+        self.assertEqual(self.cache.stats["trips"], 1)
+
+    def test_breaker_is_shared_by_threads(self):
+        """Test a breaker opened in one thread is open in the others."""
+        with self.down:
+            self.cache.get("key")
+            self.cache.get("key")
+        instances = get_instances("resilient")
+        self.assertTrue(all(not instance.breaker.closed for instance in instances))
+        self.assertEqual(instances[0].stats["trips"], 1)
@@ -0,0 +1,263 @@
+"""Tests for Caching in Utils App."""
+
+import gzip
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.handlers.base import BaseHandler
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.categories.models import Genre
+from apps.contents.models import Anime
+from apps.utils.caching import get_encoding, get_page_size, make_key, should_refresh
+from apps.utils.pagination import LargeSetKeysetPagination
+
+User = get_user_model()
+
+
+class CacheResponseTestCase(TestCase):
+    """Test cases for cache_response."""
+
+    url = "/api/v1/animes/"
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.anime = Anime.objects.create(name="Monster", name_jpn="モンスター")
+        self.genre = Genre.objects.create(name="Drama")
+
+    def get_names(self):
+        response = self.client.get(self.url)
+        return [row["name"] for row in response.json()["results"]]
+
+    def test_cached(self):
+        """Test a cached page is served without queries."""
+        self.get_names()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_names(), ["Monster"])
+
+    def test_save_invalidates_dependent_pages(self):
+        """Test saving a row the page reads refreshes the page."""
+        self.get_names()
+        self.anime.name = "Monster (2004)"
+        self.anime.save()
+        self.assertEqual(self.get_names(), ["Monster (2004)"])
+
+    def test_unrelated_save_keeps_pages(self):
+        """Test saving a model the page does not read keeps it cached."""
+        self.get_names()
+        self.genre.name = "Mystery"
+        self.genre.save()
+        with self.assertNumQueries(0):
+            self.get_names()
+
+    def test_soft_delete_is_targeted(self):
+        """Test a soft delete no longer clears the whole cache."""
+        cache.set("unrelated", 1)
+        self.get_names()
+        self.client.force_authenticate(
+            User.objects.create(email="staff@mail.com", username="staff", is_staff=True)
+        )
+        response = self.client.delete(f"/api/v1/animes/{self.anime.pk}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(cache.get("unrelated"), 1)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.get_names(), [])
+
+    def test_stale_while_revalidate(self):
+        """Test the stale page is served while another request refills it."""
+        self.get_names()
+        self.anime.name = "Monster (2004)"
+        self.anime.save()
+        with patch.object(cache, "add", return_value=False):
+            with self.assertNumQueries(0):
+                self.assertEqual(self.get_names(), ["Monster"])
+        self.assertEqual(self.get_names(), ["Monster (2004)"])
+
+
+class KeyNormalizationTestCase(TestCase):
+    """Test cases for the cache key policy of cache_response."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        Anime.objects.create(name="Monster", name_jpn="モンスター")
+
+    def test_query_order_and_unknown_params(self):
+        """Test reordered queries and unused params share an entry."""
+        self.client.get("/api/v1/animes/?page_size=10&ordering=name&utm_source=a")
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/v1/animes/?ordering=name&page_size=10")
+        self.assertEqual(response.status_code, 200)
+
+    def test_page_size_buckets(self):
+        """Test page sizes rounding to the default one share its entry."""
+        self.client.get("/api/v1/animes/")
+        with self.assertNumQueries(0):
+            self.client.get("/api/v1/animes/?page_size=23")
+        with self.assertNumQueries(0):
+            self.client.get("/api/v1/animes/?page_size=1000")
+
+    def test_cookies_are_ignored(self):
+        """Test visitors with unrelated cookies share the anonymous entry."""
+        self.client.get("/api/v1/animes/")
+        self.client.cookies["csrftoken"] = "token"
+        self.client.cookies["_ga"] = "analytics"
+        with self.assertNumQueries(0):
+            self.client.get("/api/v1/animes/")
+
+    def test_get_page_size(self):
+        """Test page sizes are bucketed and capped."""
+        paginator = LargeSetKeysetPagination()
+        self.assertEqual(get_page_size("3", paginator), 5)
+        self.assertEqual(get_page_size("11", paginator), 15)
+        self.assertIsNone(get_page_size("24", paginator))
+        self.assertIsNone(get_page_size("-1", paginator))
+        self.assertIsNone(get_page_size("x", paginator))
+
+
+class ResponseCacheMiddlewareTestCase(TestCase):
+    """Test cases for ResponseCacheMiddleware."""
+
+    url = "/api/v1/animes/"
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.anime = Anime.objects.create(name="Monster", name_jpn="モンスター")
+        Anime.objects.create(name="Pluto", name_jpn="プルートウ")
+        self.content = self.client.get(self.url).content
+
+    def get(self, url=None, **headers):
+        with patch.object(
+            BaseHandler,
+            "resolve_request",
+            autospec=True,
+            side_effect=BaseHandler.resolve_request,
+        ) as resolve:
+            response = self.client.get(url or self.url, **headers)
+        return response, resolve.called
+
+    def test_hit_skips_the_view(self):
+        """Test hits are served before URL resolution."""
+        response, resolved = self.get()
+        self.assertFalse(resolved)
+        self.assertEqual(response.content, self.content)
+        self.assertIn("ETag", response)
+
+    def test_encoded_variants(self):
+        """Test clients accepting gzip get the stored gzip variant."""
+        response, resolved = self.get(HTTP_ACCEPT_ENCODING="br;q=0, gzip, deflate")
+        self.assertFalse(resolved)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(response.content), self.content)
+
+    def test_encoded_variants_have_weak_etags(self):
+        """Test variants do not share the strong ETag of the identity body."""
+        etag = self.client.get(self.url)["ETag"]
+        response, _ = self.get(HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["ETag"], f"W/{etag}")
+        response, _ = self.get(HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=f"W/{etag}")
+        self.assertEqual(response.status_code, 304)
+
+    def test_not_modified(self):
+        """Test conditional requests are answered from the entry."""
+        etag = self.client.get(self.url)["ETag"]
+        response, resolved = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertFalse(resolved)
+        self.assertEqual(response.status_code, 304)
+
+    def test_normalized_query(self):
+        """Test equivalent query strings hit the entry of the canonical one."""
+        response, resolved = self.get(f"{self.url}?page_size=25&unknown=1")
+        self.assertFalse(resolved)
+        self.assertEqual(response.content, self.content)
+
+    def test_stale_entries_go_to_the_view(self):
+        """Test entries of an older version are refilled by the view."""
+        self.anime.name = "Monster (2004)"
+        self.anime.save()
+        response, resolved = self.get()
+        self.assertTrue(resolved)
+        names = [row["name"] for row in response.json()["results"]]
+        self.assertIn("Monster (2004)", names)
+
+    def test_authenticated_requests_go_to_the_view(self):
+        """Test requests with credentials are left to the view."""
+        _, resolved = self.get(HTTP_AUTHORIZATION="JWT token")
+        self.assertTrue(resolved)
+
+    def test_get_encoding(self):
+        """Test encodings are picked by preference among accepted ones."""
+        request = type("Request", (), {"META": {"HTTP_ACCEPT_ENCODING": "gzip, br"}})
+        self.assertEqual(get_encoding(request, {"gzip": b"", "br": b""}), "br")
+        self.assertEqual(get_encoding(request, {"gzip": b""}), "gzip")
+        request.META["HTTP_ACCEPT_ENCODING"] = "gzip;q=0"
+        self.assertIsNone(get_encoding(request, {"gzip": b""}))
+
+
+class WarmCacheTestCase(TestCase):
+    """Test cases for the warmcache command."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.genre = Genre.objects.create(name="Drama")
+        anime = Anime.objects.create(name="Monster", name_jpn="モンスター")
+        anime.genres.add(self.genre)
+
+    def test_warmcache(self):
+        """Test cached routes, with popular detail routes, are warmed."""
+        out = StringIO()
+        command = "apps.utils.management.commands.warmcache"
+        # Worker threads would not see the test transaction.
+        with patch(f"{command}.ThreadPoolExecutor") as executor, patch(
+            f"{command}.connections"
+        ):
+            executor.return_value.__enter__.return_value.map = map
+            call_command("warmcache", "--host=testserver", stdout=out)
+        self.assertIn("200 /api/v1/animes/popular/", out.getvalue())
+        self.assertIn(f"200 /api/v1/genres/{self.genre.pk}/animes/", out.getvalue())
+        with self.assertNumQueries(0):
+            response = self.client.get(f"/api/v1/genres/{self.genre.pk}/animes/")
+        self.assertEqual(response.status_code, 200)
+
+
+class ShouldRefreshTestCase(TestCase):
+    """Test cases for should_refresh."""
+
+    def entry(self, **kwargs):
+        return {"version": 1.0, "expires": 100.0, "delta": 0.0, **kwargs}
+
+    def test_version(self):
+        """Test entries of another version are refreshed."""
+        self.assertFalse(should_refresh(self.entry(), 1.0, now=50.0))
+        self.assertTrue(should_refresh(self.entry(), 2.0, now=50.0))
+
+    def test_expiry(self):
+        """Test expired entries are refreshed."""
+        self.assertTrue(should_refresh(self.entry(), 1.0, now=100.0))
+
+    def test_early_expiry(self):
+        """Test slow entries are refreshed early close to their expiry."""
+        entry = self.entry(delta=10.0)
+        with patch("apps.utils.caching.random.random", return_value=0.9):
+            self.assertTrue(should_refresh(entry, 1.0, now=90.0))
+            self.assertFalse(should_refresh(entry, 1.0, now=50.0))
+
+
+class MakeKeyTestCase(TestCase):
+    """Test cases for make_key."""
+
+    def test_key_changes_with_tags(self):
+        """Test bumping a tag changes the key."""
+        anime = Anime.objects.create(name="Monster", name_jpn="モンスター")
+        key = make_key("page", 1, rows=[(Anime, anime.pk)])
+        self.assertEqual(make_key("page", 1, rows=[(Anime, anime.pk)]), key)
+        anime.save()
+        self.assertNotEqual(make_key("page", 1, rows=[(Anime, anime.pk)]), key)
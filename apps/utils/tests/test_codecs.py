@@ -0,0 +1,59 @@
+"""Tests for Codecs in Utils App."""
+
+import pickle
+from datetime import datetime
+
+from django.test import SimpleTestCase
+from django_redis.serializers.pickle import PickleSerializer
+
+from apps.utils.codecs import CacheSerializer
+
+
+class CacheSerializerTestCase(SimpleTestCase):
+    """Test cases for CacheSerializer."""
+
+    entry = {
+        "version": 1700000000.5,
+        "status": 200,
+        "headers": [["Content-Type", "application/json"]],
+        "content": b'{"results": []}',
+    }
+
+    def test_round_trip(self):
+        """Test values come back equal in every format."""
+        for options in ({}, {"SERIALIZER_FORMAT": "json"}):
+            serializer = CacheSerializer(options)
+            for value in (self.entry, [{"id": "1", "name": "Monster"}], "text", 1.5):
+                self.assertEqual(serializer.loads(serializer.dumps(value)), value)
+
+    def test_pickle_fallback(self):
+        """Test unsupported types are pickled."""
+        serializer = CacheSerializer({})
+        value = {"date": datetime(2024, 1, 1)}
+        data = serializer.dumps(value)
+        self.assertEqual(data[:1], b"P")
+        self.assertEqual(serializer.loads(data), value)
+
+    def test_compression(self):
+        """Test large payloads are compressed and small ones are not."""
+        serializer = CacheSerializer({"COMPRESS_MIN_LENGTH": 100})
+        small = serializer.dumps("x" * 10)
+        large = serializer.dumps("x" * 1000)
+        self.assertEqual(small[:1], b"M")
+        self.assertEqual(large[:1], b"m")
+        self.assertLess(len(large), 100)
+        self.assertEqual(serializer.loads(large), "x" * 1000)
+
+    def test_smaller_than_pickle(self):
+        """Test a list page is smaller than its pickle."""
+        rows = [
+            {"id": str(i), "name": f"Anime {i}", "image": f"/media/animes/{i}.jpg"}
+            for i in range(25)
+        ]
+        size = len(CacheSerializer({}).dumps(rows))
+        self.assertLess(size * 2, len(PickleSerializer({}).dumps(rows)))
+
+    def test_reads_pickled_values(self):
+        """Test values written by the pickle serializer stay readable."""
+        data = pickle.dumps(self.entry, pickle.HIGHEST_PROTOCOL)
+        self.assertEqual(CacheSerializer({}).loads(data), self.entry)
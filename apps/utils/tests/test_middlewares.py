@@ -0,0 +1,70 @@
+"""Tests for Middlewares in Utils App."""
+
+import gzip
+import zlib
+
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase
+from rest_framework.test import APIClient
+
+from apps.contents.models import Anime
+from apps.utils.middlewares import CompressionMiddleware
+
+
+class CompressionMiddlewareTestCase(TestCase):
+    """Test cases for CompressionMiddleware."""
+
+    url = "/api/v1/animes/"
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        for name, name_jpn in [("Monster", "モンスター"), ("Pluto", "プルートウ")]:
+            Anime.objects.create(name=name, name_jpn=name_jpn)
+
+    def compress(self, response, encoding="gzip"):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_negotiated(self):
+        """Test pages are gzipped for clients accepting it, with weak ETags."""
+        content = self.client.get(self.url).content
+        cache.clear()
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="br;q=0, gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), content)
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        self.assertTrue(response["ETag"].startswith("W/"))
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_not_accepted(self):
+        """Test clients not accepting an encoding get the plain body."""
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="identity")
+        self.assertNotIn("Content-Encoding", response)
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_skipped(self):
+        """Test short, HTML, binary and no-transform bodies are left as is."""
+        responses = [
+            HttpResponse(b"{}", content_type="application/json"),
+            HttpResponse(b"<p>csrf</p>" * 100, content_type="text/html; charset=utf-8"),
+            HttpResponse(b"\xff" * 1000, content_type="image/jpeg"),
+            HttpResponse(b"{}" * 500, content_type="application/json"),
+        ]
+        responses[3]["Cache-Control"] = "no-transform"
+        for response in responses:
+            self.assertNotIn("Content-Encoding", self.compress(response))
+
+    def test_streaming(self):
+        """Test streams are flushed per chunk."""
+        lines = [b'{"id": %d}\n' % i for i in range(3)]
+        response = StreamingHttpResponse(iter(lines), content_type="application/x-ndjson")
+        response = self.compress(response)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+        decompressor = zlib.decompressobj(31)
+        chunks = iter(response.streaming_content)
+        self.assertEqual(decompressor.decompress(next(chunks)), lines[0])
+        content = b"".join(decompressor.decompress(chunk) for chunk in chunks)
+        self.assertEqual(content, b"".join(lines[1:]))
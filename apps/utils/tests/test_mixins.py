@@ -0,0 +1,179 @@
+"""Tests for Mixins in Utils App."""
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.categories.models import Genre, Season, Studio, Theme
+from apps.contents.models import Anime
+from apps.reviews.models import Review
+
+User = get_user_model()
+
+
+class SparseFieldsTestCase(TestCase):
+    """Test cases for SparseFieldsMixin."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        studio = Studio.objects.create(name="Madhouse", name_jpn="マッドハウス")
+        self.anime = Anime.objects.create(
+            name="Monster", name_jpn="モンスター", studio=studio, synopsis="..."
+        )
+        self.anime.genres.add(Genre.objects.create(name="Drama"))
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json(), " ".join(query["sql"] for query in queries)
+
+    def test_list_fields(self):
+        """Test list pages only render and select the requested fields."""
+        data, sql = self.get("/api/v1/animes/?fields=id,name,image")
+        self.assertEqual(set(data["results"][0]), {"id", "name", "image"})
+        self.assertNotIn('"episodes"', sql)
+
+    def test_detail_fields(self):
+        """Test detail pages skip the columns and joins of dropped fields."""
+        data, sql = self.get(f"/api/v1/animes/{self.anime.pk}/?fields=id,name")
+        self.assertEqual(data, {"id": str(self.anime.pk), "name": "Monster"})
+        self.assertNotIn('"synopsis"', sql)
+        self.assertNotIn("categories_studio", sql)
+        self.assertNotIn("categories_genre", sql)
+
+    def test_exclude(self):
+        """Test excluded fields are left out of the full payload."""
+        data, sql = self.get(f"/api/v1/animes/{self.anime.pk}/?exclude=synopsis,genres")
+        self.assertNotIn("synopsis", data)
+        self.assertNotIn("genres", data)
+        self.assertIn("studio", data)
+        self.assertNotIn('"synopsis"', sql)
+
+    def test_unknown_fields_are_ignored(self):
+        """Test unknown names fall back to the full payload."""
+        data, _ = self.get("/api/v1/animes/?fields=unknown")
+        self.assertIn("popularity", data["results"][0])
+
+    def test_pages_are_cached_per_field_set(self):
+        """Test pruned and full pages are separate cache entries."""
+        self.get("/api/v1/animes/?fields=id,name")
+        data, _ = self.get("/api/v1/animes/")
+        self.assertIn("popularity", data["results"][0])
+        data, _ = self.get("/api/v1/animes/?fields=id,name")
+        self.assertEqual(set(data["results"][0]), {"id", "name"})
+
+
+class ExpandTestCase(TestCase):
+    """Test cases for ExpandMixin."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        studio = Studio.objects.create(name="Madhouse", name_jpn="マッドハウス")
+        season = Season.objects.create(season="spring", year=2004)
+        self.anime = Anime.objects.create(
+            name="Monster", name_jpn="モンスター", studio=studio, season=season
+        )
+        self.anime.genres.set(
+            [Genre.objects.create(name=name) for name in ["Drama", "Mystery", "Thriller"]]
+        )
+        self.anime.themes.set(
+            [Theme.objects.create(name=name) for name in ["Medical", "Psychological"]]
+        )
+        content_type = ContentType.objects.get_for_model(Anime)
+        for index in range(3):
+            user = User.objects.create_user(
+                email=f"fan{index}@fandomhub.com", username=f"fan{index}", password="password"
+            )
+            Review.objects.create(
+                user=user,
+                content_type=content_type,
+                object_id=self.anime.pk,
+                rating=8,
+                comment="...",
+            )
+        self.url = f"/api/v1/animes/{self.anime.pk}/"
+
+    def test_expand(self):
+        """Test expansions are embedded with their limits in a few queries."""
+        url = f"{self.url}?expand=studio,season,genres:2,themes,reviews:2"
+        with self.assertNumQueries(4):
+            data = self.client.get(url).json()
+        self.assertEqual(data["studio"]["name_jpn"], "マッドハウス")
+        self.assertEqual(data["season"]["year"], 2004)
+        self.assertEqual(len(data["genres"]), 2)
+        self.assertEqual(len(data["themes"]), 2)
+        self.assertEqual(len(data["reviews"]), 2)
+        self.assertIn("user", data["reviews"][0])
+
+    def test_without_expand(self):
+        """Test the detail payload is unchanged without the param."""
+        data = self.client.get(f"{self.url}?expand=unknown").json()
+        self.assertNotIn("name_jpn", data["studio"])
+        self.assertNotIn("reviews", data)
+        self.assertEqual(len(data["genres"]), 3)
+
+    def test_etag_covers_expansions(self):
+        """Test changes to expanded resources change the ETag."""
+        url = f"{self.url}?expand=reviews"
+        etag = self.client.get(url)["ETag"]
+        Review.objects.first().delete()
+        self.assertNotEqual(self.client.get(url)["ETag"], etag)
+
+
+class BatchRetrieveTestCase(TestCase):
+    """Test cases for BatchRetrieveMixin."""
+
+    url = "/api/v1/animes/batch/"
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        studio = Studio.objects.create(name="Madhouse", name_jpn="マッドハウス")
+        self.animes = [
+            Anime.objects.create(name=name, name_jpn=name_jpn, studio=studio)
+            for name, name_jpn in [("Monster", "モンスター"), ("Pluto", "プルートウ")]
+        ]
+        self.hidden = Anime.objects.create(
+            name="Master Keaton", name_jpn="マスターキートン", available=False
+        )
+
+    def get(self, *pks):
+        return self.client.get(self.url, {"ids": ",".join(map(str, pks))})
+
+    def test_request_order_and_not_found(self):
+        """Test results follow the ids, with markers for missing rows."""
+        monster, pluto = self.animes
+        missing = "00000000-0000-0000-0000-000000000000"
+        response = self.get(pluto.pk, missing, monster.pk, self.hidden.pk, pluto.pk)
+        results = response.json()["results"]
+        names = [row["name"] for row in results if "name" in row]
+        self.assertEqual(names, ["Pluto", "Monster", "Pluto"])
+        self.assertEqual(results[1], {"id": missing, "detail": "Not found."})
+        self.assertEqual(results[3]["id"], str(self.hidden.pk))
+        self.assertEqual(results[0]["studio"]["name"], "Madhouse")
+
+    def test_rows_are_cached(self):
+        """Test cached rows cost no query and saved rows are read again."""
+        monster, pluto = self.animes
+        self.get(monster.pk, pluto.pk)
+        with self.assertNumQueries(0):
+            self.get(monster.pk, pluto.pk)
+        monster.name = "Monster (2004)"
+        monster.save()
+        with self.assertNumQueries(2):
+            results = self.get(monster.pk, pluto.pk).json()["results"]
+        self.assertEqual(results[0]["name"], "Monster (2004)")
+
+    def test_invalid_ids(self):
+        """Test malformed, missing and too many ids are rejected."""
+        self.assertEqual(self.get("x").status_code, 400)
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        pks = [self.animes[0].pk] * 101
+        self.assertEqual(self.get(*pks).status_code, 400)
@@ -0,0 +1,85 @@
+"""Tests for Pagination in Utils App."""
+
+import json
+from base64 import urlsafe_b64encode
+
+from django.test import TestCase
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.contents.models import Anime
+from apps.utils.pagination import KeysetPagination
+
+
+class KeysetPaginationTestCase(TestCase):
+    """Test cases for KeysetPagination."""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        popularity = [3, None, 1, 2, None, 2, 5]
+        for index, value in enumerate(popularity):
+            Anime.objects.create(
+                name=f"Anime {index}",
+                name_jpn=f"アニメ {index}",
+                popularity=value,
+            )
+
+    def paginate(self, url, page_size=2):
+        paginator = KeysetPagination()
+        paginator.page_size = page_size
+        request = Request(self.factory.get(url))
+        page = paginator.paginate_queryset(Anime.objects.all(), request)
+        return paginator, page
+
+    def walk(self, url):
+        """Follow the next links from url and return every visited row."""
+        rows = []
+        while url:
+            paginator, page = self.paginate(url)
+            rows.extend(page)
+            url = paginator.get_next_link()
+        return rows
+
+    def test_walk_forward_matches_ordering(self):
+        """Test following next links visits every row once, in order."""
+        rows = self.walk("/animes/?ordering=popularity")
+        expected = sorted(
+            Anime.objects.all(),
+            key=lambda a: (a.popularity is None, a.popularity or 0, a.pk),
+        )
+        self.assertEqual(rows, expected)
+
+    def test_walk_descending(self):
+        """Test descending ordering keeps null keys at the end."""
+        rows = self.walk("/animes/?ordering=-popularity")
+        self.assertEqual(len(rows), 7)
+        values = [row.popularity for row in rows]
+        self.assertEqual(values[:5], [5, 3, 2, 2, 1])
+        self.assertEqual(values[5:], [None, None])
+
+    def test_previous_link_returns_previous_page(self):
+        """Test the previous cursor points back to the prior page."""
+        first, first_page = self.paginate("/animes/?ordering=name")
+        second, second_page = self.paginate(first.get_next_link())
+        previous, previous_page = self.paginate(second.get_previous_link())
+        self.assertEqual(previous_page, first_page)
+        self.assertNotEqual(second_page, first_page)
+
+    def test_invalid_ordering_falls_back_to_pk(self):
+        """Test unknown ordering fields fall back to the default key."""
+        paginator, page = self.paginate("/animes/?ordering=synopsis", 10)
+        self.assertEqual(page, list(Anime.objects.order_by("pk")))
+        self.assertIsNone(paginator.get_next_link())
+        self.assertIsNone(paginator.get_previous_link())
+
+    def test_malformed_cursor_position(self):
+        """Test well-formed cursors with invalid positions are rejected."""
+        for ordering, position in [
+            ("pk", [None, "not-a-uuid"]),
+            ("popularity", ["high", str(Anime.objects.first().pk)]),
+            ("pk", [None, [1]]),
+        ]:
+            cursor = urlsafe_b64encode(json.dumps([False, position]).encode()).decode()
+            with self.assertRaises(NotFound):
+                self.paginate(f"/animes/?ordering={ordering}&cursor={cursor}")
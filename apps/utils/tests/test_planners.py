@@ -0,0 +1,105 @@
+"""Tests for Planners in Utils App."""
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+
+from apps.categories.models import Genre, Season, Studio
+from apps.contents.models import Anime
+from apps.contents.serializers import AnimeListSerializer, AnimeSerializer
+from apps.news.models import New
+from apps.news.serializers import NewListSerializer
+from apps.reviews.models import Review
+from apps.reviews.serializers import ReviewReadSerializer
+from apps.utils.planners import get_query_plan, plan_queryset
+
+User = get_user_model()
+
+
+class QueryPlanTestCase(TestCase):
+    """Test cases for QueryPlan."""
+
+    def setUp(self):
+        studio = Studio.objects.create(name="Madhouse", name_jpn="マッドハウス")
+        genres = [Genre.objects.create(name=name) for name in ["Action", "Drama"]]
+        for index in range(3):
+            season = Season.objects.create(season="spring", year=2000 + index)
+            anime = Anime.objects.create(
+                name=f"Anime {index}",
+                name_jpn=f"アニメ {index}",
+                studio=studio,
+                season=season,
+            )
+            anime.genres.set(genres)
+
+    def test_nested_serializer_plan(self):
+        """Test nested serializers become joins and prefetches."""
+        plan = get_query_plan(AnimeSerializer, Anime)
+        self.assertCountEqual(plan.get_select_related(), ["studio", "season"])
+        self.assertEqual(list(plan.prefetched), ["genres"])
+        self.assertIn("studio__name", plan.get_only())
+        self.assertNotIn("mean", plan.get_only())
+
+    def test_detail_serializer_queries(self):
+        """Test serializing every row costs one query plus one prefetch."""
+        queryset = plan_queryset(Anime.objects.all(), AnimeSerializer)
+        with self.assertNumQueries(2):
+            data = AnimeSerializer(queryset, many=True).data
+        self.assertEqual(len(data[0]["genres"]), 2)
+        self.assertEqual(data[0]["studio"]["name"], "Madhouse")
+
+    def test_query_sources_hint(self):
+        """Test Meta.query_sources covers columns read by method fields."""
+        queryset = plan_queryset(Anime.objects.all(), AnimeListSerializer)
+        with self.assertNumQueries(1):
+            data = AnimeListSerializer(queryset, many=True).data
+        self.assertEqual(sorted(row["year"] for row in data), [2000, 2001, 2002])
+        self.assertIn("synopsis", queryset[0].get_deferred_fields())
+
+    def test_columns_can_be_kept(self):
+        """Test columns=False keeps every column loaded."""
+        queryset = plan_queryset(Anime.objects.all(), AnimeListSerializer, False)
+        self.assertEqual(queryset[0].get_deferred_fields(), set())
+
+    def test_values_queryset_is_left_alone(self):
+        """Test querysets that do not return instances are not changed."""
+        queryset = Anime.objects.values("id", "name")
+        self.assertIs(plan_queryset(queryset, AnimeListSerializer), queryset)
+
+
+class RelatedFieldPlanTestCase(TestCase):
+    """Test cases for QueryPlan over related fields."""
+
+    def setUp(self):
+        user = User.objects.create(email="writer@mail.com", username="writer")
+        anime = Anime.objects.create(name="Monster", name_jpn="モンスター")
+        content_type = ContentType.objects.get_for_model(Anime)
+        for index in range(3):
+            New.objects.create(
+                author=user,
+                title=f"New {index}",
+                description="...",
+                content="...",
+                source="https://example.com",
+            )
+            Review.objects.create(
+                user=User.objects.create(email=f"{index}@mail.com", username=f"u{index}"),
+                content_type=content_type,
+                object_id=anime.pk,
+                rating=8,
+                comment="...",
+            )
+
+    def test_method_field_hint(self):
+        """Test the author join declared in query_sources."""
+        queryset = plan_queryset(New.objects.all(), NewListSerializer)
+        with self.assertNumQueries(1):
+            data = NewListSerializer(queryset, many=True).data
+        self.assertEqual({row["author"] for row in data}, {"writer"})
+
+    def test_string_related_field(self):
+        """Test str() of a relation joins it with every column."""
+        queryset = plan_queryset(Review.objects.all(), ReviewReadSerializer)
+        with self.assertNumQueries(1):
+            data = ReviewReadSerializer(queryset, many=True).data
+        self.assertEqual({row["user"] for row in data}, {"u0", "u1", "u2"})
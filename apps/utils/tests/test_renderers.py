@@ -0,0 +1,55 @@
+"""Tests for Renderers in Utils App."""
+
+import datetime
+import decimal
+import io
+import uuid
+
+from django.test import TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from apps.utils.parsers import ORJSONParser
+from apps.utils.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTestCase(TestCase):
+    """Test cases for ORJSONRenderer and ORJSONParser."""
+
+    data = ReturnDict(
+        {
+            "id": uuid.UUID("6f1c1b5e-3c2a-4d8e-9b1f-0a2b3c4d5e6f"),
+            "name": "モンスター\u2028",
+            "aired": datetime.date(2004, 4, 7),
+            "score": decimal.Decimal("8.87"),
+            "status": gettext_lazy("Finished"),
+            "genres": [{"id": 1, "name": "Drama"}],
+            1: None,
+        },
+        serializer=None,
+    )
+
+    def test_matches_json_renderer(self):
+        """Test the output is byte equal to JSONRenderer's."""
+        self.assertEqual(ORJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_indent(self):
+        """Test an indent param in the media type pretty prints."""
+        content = ORJSONRenderer().render(
+            {"id": 1}, accepted_media_type="application/json; indent=4"
+        )
+        self.assertEqual(content, b'{\n  "id": 1\n}')
+
+    def test_parse(self):
+        """Test bodies are decoded in their charset and invalid ones rejected."""
+        parser = ORJSONParser()
+        content = '{"name": "Pokémon"}'
+        for encoding in ["utf-8", "latin-1"]:
+            data = parser.parse(
+                io.BytesIO(content.encode(encoding)), parser_context={"encoding": encoding}
+            )
+            self.assertEqual(data, {"name": "Pokémon"})
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO(b'{"name": '))
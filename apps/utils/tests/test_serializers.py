@@ -0,0 +1,76 @@
+"""Tests for Serializers in Utils App."""
+
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from apps.categories.models import Season
+from apps.contents.models import Anime, Manga
+from apps.contents.serializers import (
+    AnimeListSerializer,
+    AnimeSerializer,
+    MangaListSerializer,
+)
+from apps.news.models import New
+from apps.news.serializers import NewListSerializer
+from apps.utils.serializers import get_compiled_serializer
+
+User = get_user_model()
+
+
+class CompiledSerializerTestCase(TestCase):
+    """Test cases for CompiledSerializer."""
+
+    def setUp(self):
+        self.request = Request(RequestFactory().get("/"))
+        season = Season.objects.create(season="spring", year=2001)
+        Anime.objects.create(
+            name="Monster", name_jpn="モンスター", season=season, image="animes/monster.jpg"
+        )
+        Anime.objects.create(name="Akira", name_jpn="アキラ", popularity=3)
+        Manga.objects.create(
+            name="Berserk",
+            name_jpn="ベルセルク",
+            chapters=364,
+            release=date(1989, 8, 25),
+            image="mangas/berserk.jpg",
+        )
+        Manga.objects.create(name="Pluto", name_jpn="プルートウ", chapters=65)
+        user = User.objects.create(email="writer@mail.com", username="writer")
+        New.objects.create(
+            author=user,
+            title="New",
+            description="...",
+            content="...",
+            source="https://example.com",
+            image="news/new.jpg",
+        )
+
+    def assertSameOutput(self, serializer_class, queryset):
+        compiled = get_compiled_serializer(serializer_class)
+        self.assertIsNotNone(compiled)
+        context = {"request": self.request}
+        expected = serializer_class(queryset, many=True, context=context).data
+        with self.assertNumQueries(1):
+            data = compiled.to_representation(compiled.values(queryset), context)
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(data), renderer.render(expected))
+
+    def test_anime_list(self):
+        """Test method fields and images render like the serializer."""
+        self.assertSameOutput(AnimeListSerializer, Anime.objects.order_by("pk"))
+
+    def test_manga_list(self):
+        """Test choice fields render like the serializer."""
+        self.assertSameOutput(MangaListSerializer, Manga.objects.order_by("pk"))
+
+    def test_new_list(self):
+        """Test display sources and relations render like the serializer."""
+        self.assertSameOutput(NewListSerializer, New.objects.order_by("pk"))
+
+    def test_to_many_fields_are_not_compiled(self):
+        """Test serializers with to-many fields keep the regular path."""
+        self.assertIsNone(get_compiled_serializer(AnimeSerializer))
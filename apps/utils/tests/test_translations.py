@@ -0,0 +1,66 @@
+"""Tests for Translations in Utils App."""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.contents.models import Anime
+from apps.news.models import New
+from apps.utils.translations import get_choice_labels, preload_translations
+
+User = get_user_model()
+
+
+class ChoiceLabelsTestCase(TestCase):
+    """Test cases for get_choice_labels."""
+
+    def test_labels_per_language(self):
+        """Test labels are translated to the requested language."""
+        field = Anime._meta.get_field("status")
+        self.assertEqual(get_choice_labels(field, "es")["finished"], "Finalizado")
+        self.assertEqual(get_choice_labels(field, "en")["finished"], "Finished")
+
+    def test_preload(self):
+        """Test preloading builds the maps of every language."""
+        preload_translations()
+        field = Anime._meta.get_field("status")
+        self.assertIn("Finalizado", get_choice_labels(field, "es").values())
+
+
+class LanguageCacheTestCase(TestCase):
+    """Test cases for language aware response caching."""
+
+    url = "/api/v1/news/"
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        user = User.objects.create_user(
+            email="writer@fandomhub.com", username="writer", password="password"
+        )
+        New.objects.create(
+            author=user,
+            title="Upcoming news",
+            description="...",
+            content="...",
+            source="https://example.com",
+            image="news/1.jpg",
+            tag="pending",
+        )
+
+    def get_tag(self, language):
+        response = self.client.get(self.url, HTTP_ACCEPT_LANGUAGE=language)
+        return response.json()["results"][0]["tag"]
+
+    def test_pages_per_language(self):
+        """Test each language is cached with its own labels."""
+        self.assertEqual(self.get_tag("es"), "Pendiente")
+        self.assertEqual(self.get_tag("en"), "Pending")
+        self.assertEqual(self.get_tag("es"), "Pendiente")
+
+    def test_variants_share_entry(self):
+        """Test Accept-Language variants negotiating one language share it."""
+        self.get_tag("es")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_tag("es-ES,es;q=0.9,en;q=0.5"), "Pendiente")
@@ -0,0 +1,75 @@
+"""Tests for Versions in Utils App."""
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.categories.models import Studio
+from apps.contents.models import Anime
+from apps.contents.rankings import RankingEngine
+from apps.utils.versions import get_row_key
+
+
+class ConditionalTestCase(TestCase):
+    """Test cases for conditional GETs."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.studio = Studio.objects.create(name="Madhouse", name_jpn="マッドハウス")
+        self.animes = [
+            Anime.objects.create(name=f"Anime {i}", name_jpn=f"アニメ {i}", studio=self.studio)
+            for i in range(2)
+        ]
+
+    def detail_url(self, anime):
+        return f"/api/v1/animes/{anime.pk}/"
+
+    def get_etag(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header("Last-Modified"))
+        return response["ETag"]
+
+    def test_not_modified(self):
+        """Test a matching ETag returns 304 without touching the database."""
+        url = self.detail_url(self.animes[0])
+        etag = self.get_etag(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_row_version(self):
+        """Test saving a row changes its ETag and its model version."""
+        first, second = [self.get_etag(self.detail_url(anime)) for anime in self.animes]
+        list_etag = self.get_etag("/api/v1/animes/")
+
+        self.animes[0].episodes = 12
+        self.animes[0].save()
+
+        self.assertNotEqual(self.get_etag(self.detail_url(self.animes[0])), first)
+        self.assertEqual(self.get_etag(self.detail_url(self.animes[1])), second)
+        self.assertNotEqual(self.get_etag("/api/v1/animes/"), list_etag)
+
+    def test_related_version(self):
+        """Test changing a nested model changes the detail ETag."""
+        url = self.detail_url(self.animes[0])
+        etag = self.get_etag(url)
+        self.studio.established = "1972"
+        self.studio.save()
+        self.assertNotEqual(self.get_etag(url), etag)
+
+    def test_bulk_writes(self):
+        """Test bulk updates made by the ranking engine change ETags."""
+        url = self.detail_url(self.animes[0])
+        etag = self.get_etag(url)
+        Anime.objects.filter(pk=self.animes[0].pk).update(popularity=5)
+        RankingEngine(Anime).run()
+        self.assertNotEqual(self.get_etag(url), etag)
+
+    def test_expired_version(self):
+        """Test an expired version key restarts instead of reusing ETags."""
+        url = self.detail_url(self.animes[0])
+        etag = self.get_etag(url)
+        cache.delete(get_row_key(Anime, self.animes[0].pk))
+        self.assertNotEqual(self.get_etag(url), etag)
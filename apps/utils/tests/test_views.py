@@ -0,0 +1,169 @@
+"""Tests for Views in Utils App."""
+
+import gzip
+import json
+import warnings
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+from rest_framework.test import APIClient
+
+from apps.categories.models import Genre, Studio
+from apps.contents.models import Anime
+from apps.utils.views import BatchView
+
+User = get_user_model()
+
+
+class NDJSONExportViewTestCase(TestCase):
+    """Test cases for NDJSONExportView."""
+
+    url = "/api/v1/export/animes.ndjson"
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create(email="partner@mail.com", username="partner")
+        )
+        studio = Studio.objects.create(name="Madhouse", name_jpn="マッドハウス")
+        genre = Genre.objects.create(name="Drama")
+        self.animes = [
+            Anime.objects.create(name=f"Anime {i}", name_jpn=f"アニメ {i}", studio=studio)
+            for i in range(3)
+        ]
+        for anime in self.animes:
+            anime.genres.add(genre)
+
+    def read(self, response):
+        content = b"".join(response.streaming_content)
+        if response.get("Content-Encoding") == "gzip":
+            content = gzip.decompress(content)
+        return [json.loads(line) for line in content.decode("utf-8").splitlines()]
+
+    def test_export(self):
+        """Test every available row is streamed with its relations."""
+        self.animes[0].available = False
+        self.animes[0].save()
+        response = self.client.get(self.url)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = self.read(response)
+        self.assertCountEqual([row["name"] for row in rows], ["Anime 1", "Anime 2"])
+        self.assertEqual(rows[0]["genres"][0]["name"], "Drama")
+
+    def test_gzip(self):
+        """Test the stream is gzipped when the client accepts it."""
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="br;q=0, gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(len(self.read(response)), 3)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip;q=0")
+        self.assertNotIn("Content-Encoding", response)
+        self.assertEqual(len(self.read(response)), 3)
+
+    def test_since(self):
+        """Test since only returns recent rows and deletions."""
+        self.animes[0].available = False
+        self.animes[0].save()
+        response = self.client.get(self.url, {"since": "2000-01-01"})
+        rows = self.read(response)
+        self.assertEqual(rows[0], {"id": str(self.animes[0].pk), "deleted": True})
+        self.assertEqual(len(rows), 3)
+
+        response = self.client.get(self.url, {"since": "2100-01-01"})
+        self.assertEqual(self.read(response), [])
+
+        response = self.client.get(self.url, {"since": "yesterday"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_since_is_an_aware_datetime(self):
+        """Test since filters without naive datetime warnings."""
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            response = self.client.get(self.url, {"since": "2000-01-01"})
+            self.assertEqual(len(self.read(response)), 3)
+
+    def test_authentication_required(self):
+        """Test anonymous clients cannot export."""
+        self.client.force_authenticate(None)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+
+@patch.object(BatchView, "max_workers", 1)
+class BatchViewTestCase(TestCase):
+    """Test cases for BatchView."""
+
+    url = "/api/v1/batch/"
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        Anime.objects.create(name="Monster", name_jpn="モンスター")
+        Genre.objects.create(name="Drama")
+
+    def post(self, paths):
+        response = self.client.post(self.url, {"paths": paths}, format="json")
+        self.assertEqual(response.status_code, 200)
+        return response.json()["responses"]
+
+    def test_batch(self):
+        """Test sub-responses come back in order with their status."""
+        responses = self.post(
+            ["/api/v1/animes/?page_size=5", "/api/v1/genres/", "/api/v1/unknown/"]
+        )
+        self.assertEqual([row["status"] for row in responses], [200, 200, 404])
+        self.assertEqual(responses[0]["path"], "/api/v1/animes/?page_size=5")
+        self.assertEqual(responses[0]["body"]["results"][0]["name"], "Monster")
+        self.assertEqual(responses[1]["body"]["results"][0]["name"], "Drama")
+        self.assertIsNone(responses[2]["body"])
+
+    def test_batches_are_not_nested(self):
+        """Test the batch endpoint cannot be a sub-request."""
+        self.assertEqual(self.post([self.url])[0]["status"], 400)
+
+    def test_cached_sub_requests(self):
+        """Test sub-requests are served from the response cache."""
+        self.post(["/api/v1/animes/"])
+        with self.assertNumQueries(0):
+            self.post(["/api/v1/animes/"])
+
+    def test_concurrent_sub_requests(self):
+        """Test sub-requests run in worker threads."""
+        paths = ["/api/v1/animes/", "/api/v1/genres/"]
+        expected = self.post(paths)
+        with patch.object(BatchView, "max_workers", 2):
+            self.assertEqual(self.post(paths), expected)
+
+    def test_user_is_reused(self):
+        """Test sub-requests run as the user of the batch request."""
+        self.client.force_authenticate(
+            User.objects.create(email="fan@mail.com", username="fan")
+        )
+        responses = self.post(["/api/v1/animes/"])
+        self.assertIn("me", responses[0]["body"]["results"][0])
+
+    def test_invalid_payloads(self):
+        """Test payloads without relative paths are rejected."""
+        for data in [{}, {"paths": []}, {"paths": ["https://example.com/"]}]:
+            response = self.client.post(self.url, data, format="json")
+            self.assertEqual(response.status_code, 400)
+        response = self.client.post(self.url, {"paths": ["/"] * 21}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class ConcurrentBatchViewTestCase(TransactionTestCase):
+    """Test cases for BatchView sub-requests run in worker threads."""
+
+    def test_cold_cache(self):
+        """Test workers query the database when nothing is cached."""
+        cache.clear()
+        Anime.objects.create(name="Monster", name_jpn="モンスター")
+        Genre.objects.create(name="Drama")
+        paths = ["/api/v1/animes/", "/api/v1/genres/", "/api/v1/unknown/"]
+        with patch.object(BatchView, "max_workers", 2):
+            response = APIClient().post("/api/v1/batch/", {"paths": paths}, format="json")
+        responses = response.json()["responses"]
+        self.assertEqual([row["status"] for row in responses], [200, 200, 404])
+        self.assertEqual(responses[0]["body"]["results"][0]["name"], "Monster")
+        self.assertEqual(responses[1]["body"]["results"][0]["name"], "Drama")
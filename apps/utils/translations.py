@@ -0,0 +1,42 @@
+"""Translations for Utils App."""
+
+from django.apps import apps
+from django.conf import settings
+from django.utils.translation import get_language, override
+
+LABELS = {}
+
+
+def get_choice_labels(field, language=None):
+    """
+    Return {value: label} of the choices of a model field in language.
+
+    Maps are built once per field and language (the active one by
+    default), so rendering a label is a dict lookup, not a catalog one.
+    """
+    language = language or get_language() or settings.LANGUAGE_CODE
+    labels = LABELS.get((field, language))
+    if labels is None:
+        with override(language):
+            labels = {value: str(label) for value, label in field.flatchoices}
+        LABELS[(field, language)] = labels
+    return labels
+
+
+def preload_translations():
+    """
+    Load the catalogs of every language in LANGUAGES and their choice
+    label maps, so the first requests of a worker in each language do not
+    pay for them.
+    """
+    fields = [
+        field
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if field.choices
+    ]
+    for language, _ in settings.LANGUAGES:
+        # Activating a language loads its catalog.
+        with override(language):
+            for field in fields:
+                get_choice_labels(field, language)
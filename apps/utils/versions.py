@@ -0,0 +1,150 @@
+"""Versions for Utils App."""
+
+import hashlib
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import get_language
+from django.views.decorators.http import condition
+
+from .overlays import get_overlay
+from .planners import get_query_plan
+
+VERSION_PREFIX = "version"
+# Version keys outlive every entry and validator built from them (cached
+# pages live up to 4 hours with their stale copies), so keys of rows that
+# stopped changing can expire instead of piling up forever.
+VERSION_TIMEOUT = 60 * 60 * 24
+
+
+def get_model_key(model):
+    return f"{VERSION_PREFIX}:{model._meta.label_lower}"
+
+
+def get_row_key(model, pk):
+    return f"{VERSION_PREFIX}:{model._meta.label_lower}:{pk}"
+
+
+def get_versions(keys):
+    """
+    Return {key: version} for keys, versions are change timestamps.
+
+    Keys the cache lost are restarted at the current time: validators
+    handed out before can no longer match, which is the safe side.
+    """
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        now = time.time()
+        for key in missing:
+            if cache.add(key, now, timeout=VERSION_TIMEOUT):
+                versions[key] = now
+            else:
+                versions[key] = cache.get(key, now)
+    return versions
+
+
+def bump(model, pks=()):
+    """Mark model, and the rows with pks, as changed now."""
+    now = time.time()
+    versions = {get_row_key(model, pk): now for pk in pks}
+    versions[get_model_key(model)] = now
+    cache.set_many(versions, timeout=VERSION_TIMEOUT)
+
+
+def bump_rows(model, pks):
+    """Mark the rows with pks as changed now, but not their model."""
+    now = time.time()
+    cache.set_many({get_row_key(model, pk): now for pk in pks}, timeout=VERSION_TIMEOUT)
+
+
+def get_version_keys(models=(), rows=()):
+    """Return the version keys of models and of the (model, pk) rows."""
+    keys = [get_model_key(model) for model in models]
+    keys += [get_row_key(model, pk) for model, pk in rows]
+    return keys
+
+
+def get_version(models=(), rows=()):
+    """Return the latest version of models and of the (model, pk) rows."""
+    return max(get_versions(get_version_keys(models, rows)).values())
+
+
+def get_etag(request, version, *parts):
+    """Return a strong ETag for the representation of version."""
+    content = ":".join(
+        str(part)
+        for part in (
+            version,
+            *parts,
+            request.META.get("HTTP_ACCEPT", ""),
+            get_language(),
+        )
+    )
+    return f'"{hashlib.md5(content.encode()).hexdigest()}"'
+
+
+def get_view_version_keys(view, kwargs):
+    """
+    Return the version keys of what a viewset method renders.
+
+    They cover the models the view serializer reads (through the query
+    planner) and, on detail routes, the requested row instead of its
+    whole model. The result is kept on the view for the request.
+    """
+    if getattr(view, "_version_keys", None) is None:
+        model = view.get_queryset().model
+        serializer_class = view.get_serializer_class()
+        plan = get_query_plan(serializer_class, serializer_class.Meta.model)
+        models = plan.get_models()
+        # Related resources embedded with ?expand= (see ExpandMixin).
+        if hasattr(view, "get_expanded_models"):
+            models |= view.get_expanded_models()
+        pk = kwargs.get(view.lookup_url_kwarg or view.lookup_field)
+        rows = []
+        if pk is not None:
+            models.discard(model)
+            rows.append((model, pk))
+        view._version_keys = get_version_keys(models, rows)
+    return view._version_keys
+
+
+def get_view_version(view, kwargs):
+    """Return the version of what a viewset method renders, once per request."""
+    if getattr(view, "_version", None) is None:
+        view._version = max(get_versions(get_view_version_keys(view, kwargs)).values())
+    return view._version
+
+
+def conditional(method):
+    """
+    Decorator answering conditional GETs on a viewset method.
+
+    ETag and Last-Modified come from get_view_version(), plus the user and
+    the version of their row on overlaid pages (see get_overlay()), which
+    overlays bump when the state of the user changes. A match returns
+    304 before the view, its cache and its queries run, so it goes above
+    ``cache_response``.
+    """
+
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        version = get_view_version(self, kwargs)
+        pk = kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        user = None
+        overlay = get_overlay(self, request)
+        if overlay is not None:
+            user = request.user.pk
+            version = max(version, get_version(rows=[(get_user_model(), user)]))
+        view = condition(
+            etag_func=lambda *a, **k: get_etag(request, version, pk, user),
+            last_modified_func=lambda *a, **k: datetime.fromtimestamp(
+                version, tz=timezone.utc
+            ),
+        )(lambda request, *a, **k: method(self, request, *a, **k))
+        return view(request, *args, **kwargs)
+
+    return wrapper
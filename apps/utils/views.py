@@ -0,0 +1,234 @@
+"""Views for Utils App."""
+
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time, timezone
+from urllib.parse import urlsplit
+
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import close_old_connections
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import Resolver404, resolve
+from django.utils import translation
+from django.utils.dateparse import parse_date
+from django.utils.translation import gettext as _
+from rest_framework import status
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_spectacular.utils import extend_schema_view
+
+from .caching import get_cached_response
+from .planners import plan_queryset
+from .renderers import dumps
+from .schemas import batch_schemas, export_schemas
+
+logger = logging.getLogger(__name__)
+
+# Headers of the batch request not passed on to its sub-requests.
+SUB_REQUEST_IGNORED_META = {
+    "CONTENT_LENGTH",
+    "CONTENT_TYPE",
+    "HTTP_ACCEPT_ENCODING",
+    "HTTP_IF_MATCH",
+    "HTTP_IF_MODIFIED_SINCE",
+    "HTTP_IF_NONE_MATCH",
+}
+# Worker threads of BatchView, shared by every batch request. Threads are
+# started on demand and reused; like request threads, they keep their
+# database connection up to CONN_MAX_AGE and their cache clients.
+batch_executor = ThreadPoolExecutor(8, thread_name_prefix="batch")
+
+
+@extend_schema_view(**export_schemas)
+class NDJSONExportView(APIView):
+    """
+    Base view streaming a whole model as newline-delimited JSON.
+
+    Rows are read through ``iterator(chunk_size=...)`` (a server-side
+    cursor on PostgreSQL) and written as soon as they are serialized, so
+    memory stays flat whatever the size of the table.
+    """
+
+    permission_classes = [IsAuthenticated]
+    model = None
+    serializer_class = None
+    chunk_size = 2000
+    buffer_size = 64 * 1024
+
+    def get_queryset(self):
+        return self.model.objects.order_by("pk")
+
+    def get(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        since = request.query_params.get("since")
+        if since is not None:
+            try:
+                since = parse_date(since)
+            except ValueError:
+                since = None
+            if since is None:
+                return Response(
+                    {"detail": _("The 'since' parameter must be a YYYY-MM-DD date.")},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            # Midnight UTC, aware so a DateTimeField updated_at gets no naive
+            # datetime; a DateField one reads the same date back.
+            since = datetime.combine(since, time.min, tzinfo=timezone.utc)
+            queryset = queryset.filter(updated_at__gte=since)
+
+        # CompressionMiddleware encodes the stream as the client accepts.
+        return StreamingHttpResponse(
+            self.get_chunks(queryset, deleted=since is not None),
+            content_type="application/x-ndjson",
+        )
+
+    def get_lines(self, queryset, deleted=False):
+        """Yield one JSON document per row."""
+        if deleted:
+            pks = queryset.filter(available=False).values_list("pk", flat=True)
+            for pk in pks.iterator(chunk_size=self.chunk_size):
+                yield dumps({"id": pk, "deleted": True})
+
+        serializer = self.serializer_class(context={"request": self.request})
+        queryset = plan_queryset(queryset.filter(available=True), self.serializer_class)
+        for instance in queryset.iterator(chunk_size=self.chunk_size):
+            yield dumps(serializer.to_representation(instance))
+
+    def get_chunks(self, queryset, deleted=False):
+        """Yield the lines grouped in buffer_size byte chunks."""
+        buffer, size = [], 0
+        for line in self.get_lines(queryset, deleted):
+            data = line + b"\n"
+            buffer.append(data)
+            size += len(data)
+            if size >= self.buffer_size:
+                yield b"".join(buffer)
+                buffer, size = [], 0
+        if buffer:
+            yield b"".join(buffer)
+
+
+def get_sub_request(request, path):
+    """Return a JSON GET request for path with the headers of request."""
+    url = urlsplit(path)
+    environ = {
+        key: value
+        for key, value in request.META.items()
+        if key not in SUB_REQUEST_IGNORED_META
+    }
+    environ.update(
+        {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": url.path,
+            "QUERY_STRING": url.query,
+            "HTTP_ACCEPT": "application/json",
+            "wsgi.input": io.BytesIO(),
+            "wsgi.url_scheme": request.scheme,
+        }
+    )
+    sub_request = WSGIRequest(environ)
+    # Set by LocaleMiddleware, cache keys depend on it.
+    sub_request.LANGUAGE_CODE = getattr(request, "LANGUAGE_CODE", None)
+    return sub_request
+
+
+@extend_schema_view(**batch_schemas)
+class BatchView(APIView):
+    """
+    View running several GET requests of the API in one call.
+
+    ``POST {"paths": [...]}`` answers ``{"responses": [...]}`` with the
+    path, status and JSON body of each sub-request, in order. Sub-requests
+    go through the response cache and the URL resolver and run as the
+    user of the batch request, up to max_workers at a time in the threads
+    of batch_executor.
+
+    Endpoints:
+    - POST /api/v1/batch/
+    """
+
+    permission_classes = [AllowAny]
+    max_paths = 20
+    max_workers = 4
+
+    def post(self, request, *args, **kwargs):
+        paths = request.data.get("paths") if isinstance(request.data, dict) else None
+        if not isinstance(paths, list) or not paths:
+            return Response(
+                {"detail": _("Provide the paths to request in 'paths'.")},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(paths) > self.max_paths:
+            return Response(
+                {"detail": _("At most %(count)d paths are allowed.") % {"count": self.max_paths}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not all(isinstance(path, str) and path.startswith("/") for path in paths):
+            return Response(
+                {"detail": _("Paths must be relative to the site root.")},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        workers = min(self.max_workers, len(paths))
+        if workers > 1:
+            language = translation.get_language()
+            # One task per worker, each running every workers-th path.
+            futures = [
+                batch_executor.submit(self.run_in_thread, paths[index::workers], language)
+                for index in range(workers)
+            ]
+            results = [None] * len(paths)
+            for index, future in enumerate(futures):
+                results[index::workers] = future.result()
+        else:
+            results = [self.run(path) for path in paths]
+
+        # Bodies are embedded as they are, without decoding them again.
+        responses = b",".join(
+            b'{"path":%s,"status":%d,"body":%s}'
+            % (dumps(path), status_code, body or b"null")
+            for path, (status_code, body) in zip(paths, results)
+        )
+        return HttpResponse(
+            b'{"responses":[%s]}' % responses, content_type="application/json"
+        )
+
+    def run_in_thread(self, paths, language):
+        # What request_started and request_finished do for request threads.
+        close_old_connections()
+        try:
+            with translation.override(language):
+                return [self.run(path) for path in paths]
+        finally:
+            close_old_connections()
+
+    def run(self, path):
+        """Return (status, JSON body or None) of a GET of path."""
+        sub_request = get_sub_request(self.request, path)
+        response = get_cached_response(sub_request)
+        if response is None:
+            try:
+                match = resolve(sub_request.path_info)
+            except Resolver404:
+                return status.HTTP_404_NOT_FOUND, None
+            if getattr(match.func, "view_class", None) is type(self):
+                return status.HTTP_400_BAD_REQUEST, None
+            if self.request.user.is_authenticated:
+                # DRF uses them instead of authenticating again.
+                sub_request._force_auth_user = self.request.user
+                sub_request._force_auth_token = self.request.auth
+            try:
+                response = match.func(sub_request, *match.args, **match.kwargs)
+                if hasattr(response, "render"):
+                    response.render()
+            except Exception:
+                logger.exception("Batch sub-request to %s failed.", path)
+                return status.HTTP_500_INTERNAL_SERVER_ERROR, None
+
+        if response.streaming or not response.get("Content-Type", "").startswith(
+            "application/json"
+        ):
+            return response.status_code, None
+        return response.status_code, response.content or None
@@ -3,8 +3,12 @@
 import os
 from django.core.asgi import get_asgi_application
 
+from apps.utils.translations import preload_translations
 from config.environment import SETTINGS_MODULE
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", SETTINGS_MODULE)
 
 application = get_asgi_application()
+
+# Per worker, before it takes requests.
+preload_translations()
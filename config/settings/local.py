@@ -57,20 +57,55 @@ def make_key(key, key_prefix, version):
     return ":".join([key_prefix, str(version), key])
 
 
+REDIS_URLS = env.list("REDIS_URLS", default=["redis://fandomhub_redis:6379"])
+
 CACHES = {
     "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
-        "LOCATION": "redis://fandomhub_redis:6379",
+        "BACKEND": "apps.utils.backends.TwoTierCache",
+        "LOCATION": "redis",
         "OPTIONS": {
-            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "LOCAL_TIMEOUT": 60,
+            "MAX_ENTRIES": 10000,
+            "MAX_SIZE": 64 * 1024 * 1024,
         },
     },
+    "redis": {
+        "BACKEND": "apps.utils.backends.ShardedCache",
+        "LOCATION": [f"redis_{index}" for index in range(len(REDIS_URLS))],
+    },
+    **{
+        f"redis_{index}": {
+            "BACKEND": "apps.utils.backends.ResilientCache",
+            "LOCATION": f"redis_{index}_server",
+            "OPTIONS": {
+                "FAILURE_THRESHOLD": 5,
+                "RESET_TIMEOUT": 30,
+                "FALLBACK_MAX_ENTRIES": 1000,
+            },
+        }
+        for index in range(len(REDIS_URLS))
+    },
+    **{
+        f"redis_{index}_server": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": url,
+            "OPTIONS": {
+                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+                "SERIALIZER": "apps.utils.codecs.CacheSerializer",
+                "COMPRESS_MIN_LENGTH": 1024,
+                "SOCKET_CONNECT_TIMEOUT": 0.2,
+                "SOCKET_TIMEOUT": 0.2,
+            },
+        }
+        for index, url in enumerate(REDIS_URLS)
+    },
 }
 
 MIDDLEWARE = [
     "social_django.middleware.SocialAuthExceptionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "apps.utils.middlewares.CompressionMiddleware",
     # "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     # "django.middleware.cache.UpdateCacheMiddleware",
@@ -81,6 +116,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django.middleware.locale.LocaleMiddleware",
+    "apps.utils.middlewares.ResponseCacheMiddleware",
     # "apps.utils.middlewares.CensorshipMiddleware"
 ]
 
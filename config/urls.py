@@ -43,6 +43,8 @@ urlpatterns = [
     path("", include("apps.profiles.routers")),
     path("", include("apps.playlists.routers")),
     path("", include("apps.news.routers")),
+    path("", include("apps.search.routers")),
+    path("", include("apps.utils.routers")),
 ]
 
 